@@ -7,3 +7,7 @@ class ApiConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        """Подключает сигналы приложения."""
+        from api import signals  # noqa: F401
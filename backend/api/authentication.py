@@ -0,0 +1,111 @@
+"""Аутентификация по JWT без обращения к БД.
+
+В токены при выдаче записываются id и основные поля пользователя
+(JWT_USER_CLAIMS), и объект пользователя собирается прямо из них.
+Остальные поля модели остаются отложенными и загружаются из БД
+только при обращении к ним (см. load_user).
+
+Отозванные токены хранятся в общем кэше до истечения их срока:
+отдельные токены - по jti (выход), все токены пользователя - по
+времени отзыва. Токены пользователя отзываются при любом изменении
+полей из TOKEN_USER_FIELDS (api.signals): блокировке, смене пароля,
+прав или полей из claims, поэтому is_active в claims всегда True.
+Проверка стоит одного запроса к кэшу.
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.constants import JWT_USER_CLAIMS
+
+User = get_user_model()
+
+REVOKED_TOKEN_KEY = 'jwt:revoked:{}'
+REVOKED_USER_KEY = 'jwt:revoked:user:{}'
+ISSUED_AT_CLAIM = 'iat'
+
+
+def issue_token(user):
+    """Возвращает refresh-токен пользователя с его полями в claims."""
+    token = RefreshToken.for_user(user)
+    token[ISSUED_AT_CLAIM] = int(time.time())
+    for field in JWT_USER_CLAIMS:
+        token[field] = getattr(user, field)
+    return token
+
+
+def revoke_token(token):
+    """Отзывает токен до истечения его срока действия."""
+    timeout = token['exp'] - int(time.time())
+    if timeout > 0:
+        cache.set(
+            REVOKED_TOKEN_KEY.format(token[api_settings.JTI_CLAIM]),
+            True, timeout
+        )
+
+
+def revoke_user_tokens(user_id):
+    """Отзывает все выданные до текущего момента токены пользователя."""
+    cache.set(
+        REVOKED_USER_KEY.format(user_id), int(time.time()),
+        int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    )
+
+
+def is_revoked(token):
+    """Проверяет, отозван ли токен сам по себе или вместе с остальными."""
+    token_key = REVOKED_TOKEN_KEY.format(token[api_settings.JTI_CLAIM])
+    user_key = REVOKED_USER_KEY.format(token[api_settings.USER_ID_CLAIM])
+    revoked = cache.get_many((token_key, user_key))
+    return token_key in revoked or (
+        user_key in revoked
+        and token.get(ISSUED_AT_CLAIM, 0) < revoked[user_key]
+    )
+
+
+def user_from_token(token):
+    """Собирает пользователя из claims токена без запроса к БД."""
+    claims = {
+        'id': token[api_settings.USER_ID_CLAIM],
+        'is_active': True,
+        **{field: token.get(field) for field in JWT_USER_CLAIMS},
+    }
+    field_names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in claims
+    ]
+    return User.from_db(
+        router.db_for_read(User), field_names,
+        [claims[name] for name in field_names]
+    )
+
+
+def load_user(user):
+    """Загружает одним запросом поля пользователя, не попавшие в токен."""
+    deferred = user.get_deferred_fields()
+    if deferred:
+        user.refresh_from_db(fields=deferred)
+    return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Аутентификация по заголовку Authorization: Bearer <access-токен>."""
+
+    def get_validated_token(self, raw_token):
+        """Проверяет подпись, срок действия и отзыв токена."""
+        token = super().get_validated_token(raw_token)
+        if is_revoked(token):
+            raise InvalidToken('Токен отозван.')
+        return token
+
+    def get_user(self, validated_token):
+        """Возвращает пользователя из claims токена."""
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('В токене нет идентификатора пользователя.')
+        return user_from_token(validated_token)
@@ -0,0 +1,316 @@
+"""Набор замеров производительности эндпоинтов API.
+
+Запросы выполняются в том же процессе через тестовый клиент Django
+(со всеми middleware) к текущей БД, заполненной, например, командой
+generate_fake_data. Для каждого сценария измеряются распределение
+задержек, число SQL-запросов и пик выделенной памяти (tracemalloc,
+отдельным проходом, чтобы трассировка не искажала задержки).
+Изменяющие данные запросы выполняются в транзакции, которая
+откатывается после каждого запроса.
+"""
+import base64
+import io
+import statistics
+import time
+import tracemalloc
+from urllib.parse import quote
+
+from django.db import connection, transaction
+from django.db.models import Count, Value
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from api.constants import BENCHMARK_METRICS
+from api.serializers.recipes import RecipeListSerializer
+from api.serializers.users import (
+    UserWithRecipesSerializer, prefetch_top_recipes
+)
+from api.views.recipes import RecipeViewSet
+from recipes.models import Ingredient, Recipe, User
+
+
+def percentile(values, percent):
+    """Возвращает перцентиль отсортированного списка."""
+    index = round(percent / 100 * (len(values) - 1))
+    return values[min(index, len(values) - 1)]
+
+
+def get_context():
+    """Выбирает из БД данные для сценариев.
+
+    Берется самый активный автор (по избранному и списку покупок),
+    чтобы фильтры и выгрузки работали на непустых данных.
+    """
+    users = User.objects.filter(is_active=True).annotate(
+        activity=Count('favorite', distinct=True)
+        + Count('shoppingcart', distinct=True)
+    ).order_by('-activity', 'id')
+    user = users.filter(recipes_count__gt=0).first() or users.first()
+    recipe = Recipe.objects.order_by('-favorites_count', 'id').first()
+    ingredients = list(
+        Ingredient.objects.order_by('id').values_list('id', 'name')[:3]
+    )
+    if user is None or recipe is None or not ingredients:
+        return None
+    token, _ = Token.objects.get_or_create(user=user)
+    own_recipe = Recipe.objects.filter(author=user).order_by('id').first()
+    return {
+        'user': user,
+        'token': token.key,
+        'recipe_id': recipe.id,
+        'author_id': recipe.author_id,
+        'own_recipe_id': own_recipe.id if own_recipe else None,
+        'ingredients': ingredients,
+        'word': quote(recipe.name.split()[0].lower()),
+        'prefix': quote(ingredients[0][1][:2]),
+    }
+
+
+def image_data():
+    """Возвращает небольшое изображение в виде data URI."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), 'orange').save(buffer, 'PNG')
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f'data:image/png;base64,{encoded}'
+
+
+def recipe_payload(context):
+    """Возвращает тело запроса на создание или изменение рецепта."""
+    return {
+        'name': 'Рецепт для замера',
+        'text': 'Описание рецепта для замера.',
+        'cooking_time': 10,
+        'image': image_data(),
+        'ingredients': [
+            {'id': pk, 'amount': 10} for pk, _ in context['ingredients']
+        ],
+    }
+
+
+def get_scenarios(context):
+    """Возвращает сценарии: (имя, авторизован ли, метод, путь, тело)."""
+    recipe_id = context['recipe_id']
+    scenarios = [
+        ('recipes-list:anonymous', False, 'get', '/api/recipes/', None),
+        ('recipes-list', True, 'get', '/api/recipes/', None),
+        (
+            'recipes-list:author', True, 'get',
+            f"/api/recipes/?author={context['author_id']}", None
+        ),
+        (
+            'recipes-list:name', True, 'get',
+            f"/api/recipes/?name={context['word']}", None
+        ),
+        (
+            'recipes-list:search', True, 'get',
+            f"/api/recipes/?search={context['word']}", None
+        ),
+        (
+            'recipes-list:is_favorited', True, 'get',
+            '/api/recipes/?is_favorited=1', None
+        ),
+        (
+            'recipes-list:is_in_shopping_cart', True, 'get',
+            '/api/recipes/?is_in_shopping_cart=1', None
+        ),
+        (
+            'recipes-detail:anonymous', False, 'get',
+            f'/api/recipes/{recipe_id}/', None
+        ),
+        ('recipes-detail', True, 'get', f'/api/recipes/{recipe_id}/', None),
+        (
+            'download-shopping-cart', True, 'get',
+            '/api/recipes/download_shopping_cart/', None
+        ),
+        ('subscriptions', True, 'get', '/api/users/subscriptions/', None),
+        (
+            'ingredients-search', False, 'get',
+            f"/api/ingredients/?name={context['prefix']}", None
+        ),
+        ('recipes-create', True, 'post', '/api/recipes/',
+         recipe_payload(context)),
+    ]
+    if context['own_recipe_id'] is not None:
+        scenarios.append((
+            'recipes-update', True, 'patch',
+            f"/api/recipes/{context['own_recipe_id']}/",
+            recipe_payload(context)
+        ))
+    return scenarios
+
+
+def send(client, method, path, body):
+    """Выполняет запрос и дочитывает ответ, возвращая код ответа."""
+    if method == 'get':
+        response = client.get(path)
+    else:
+        with transaction.atomic():
+            response = getattr(client, method)(
+                path, body, content_type='application/json'
+            )
+            transaction.set_rollback(True)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    else:
+        response.content
+    return response.status_code
+
+
+def measure(client, method, path, body, iterations, warmup):
+    """Замеряет сценарий и возвращает словарь с результатами."""
+    for _ in range(warmup):
+        send(client, method, path, body)
+
+    latencies = []
+    queries = []
+    statuses = set()
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            statuses.add(send(client, method, path, body))
+            latencies.append(time.perf_counter() - start)
+        queries.append(len(context.captured_queries))
+
+    allocations = []
+    tracemalloc.start()
+    try:
+        for _ in range(max(iterations // 10, 1)):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            send(client, method, path, body)
+            allocations.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'status': sorted(statuses),
+        'iterations': iterations,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+        'queries': max(queries),
+        'alloc_kb': round(statistics.median(allocations) / 1024, 1),
+    }
+
+
+def run(context, iterations, warmup, only=None):
+    """Выполняет сценарии и возвращает словарь имя -> результаты."""
+    anonymous = Client()
+    authorized = Client(HTTP_AUTHORIZATION=f"Token {context['token']}")
+    results = {}
+    for name, auth, method, path, body in get_scenarios(context):
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = measure(
+            authorized if auth else anonymous, method, path, body,
+            iterations, warmup
+        )
+        results[name]['path'] = f'{method.upper()} {path}'
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Сравнивает результаты с базовыми и возвращает список регрессий.
+
+    Задержки и память считаются регрессией при росте больше чем
+    на threshold (доля), число SQL-запросов - при любом росте.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric in BENCHMARK_METRICS:
+            old, new = baseline[name][metric], result[metric]
+            limit = old if metric == 'queries' else old * (1 + threshold)
+            if new > limit:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def get_parity_paths(context, limit):
+    """Возвращает пути ответов для сверки быстрого пути сериализации."""
+    return [
+        f'/api/recipes/?limit={limit}',
+        f'/api/recipes/?limit={limit}&is_favorited=1',
+        f'/api/recipes/?limit={limit}&omit=ingredients,text',
+        f"/api/recipes/{context['recipe_id']}/",
+        f'/api/users/?limit={limit}',
+        f'/api/users/subscriptions/?limit={limit}',
+        f'/api/users/subscriptions/?limit={limit}&recipes_limit=3',
+        '/api/users/me/',
+    ]
+
+
+def check_parity(context, limit):
+    """Сравнивает ответы с быстрым путем сериализации и без него.
+
+    Возвращает список (путь, совпадают ли ответы, позиция расхождения).
+    """
+    client = Client(HTTP_AUTHORIZATION=f"Token {context['token']}")
+    results = []
+    for path in get_parity_paths(context, limit):
+        contents = []
+        for fast in (False, True):
+            with override_settings(FAST_SERIALIZERS=fast):
+                contents.append(client.get(path).content)
+        slow, fast = contents
+        offset = next(
+            (i for i, (a, b) in enumerate(zip(slow, fast)) if a != b),
+            None if len(slow) == len(fast) else min(len(slow), len(fast))
+        )
+        results.append((path, offset is None, offset))
+    return results
+
+
+def get_serializer_pages(context, limit):
+    """Возвращает загруженные страницы объектов для замера сериализации."""
+    request = Request(RequestFactory().get('/api/recipes/'))
+    request.user = context['user']
+    view = RecipeViewSet(
+        request=request, action='list', format_kwarg=None, kwargs={}
+    )
+    recipes = list(view.get_queryset().order_by('-pub_date')[:limit])
+    authors = prefetch_top_recipes(list(
+        User.objects.annotate(is_subscribed=Value(True)).order_by(
+            '-recipes_count'
+        )[:limit]
+    ))
+    return request, [
+        ('recipes', RecipeListSerializer, recipes),
+        ('authors', UserWithRecipesSerializer, authors),
+    ]
+
+
+def time_serializers(context, limit, repeat):
+    """Замеряет сериализацию и рендеринг страниц без и с быстрым путем.
+
+    Возвращает список (имя, мс без быстрого пути, мс с ним,
+    совпадает ли JSON).
+    """
+    request, pages = get_serializer_pages(context, limit)
+    renderer = JSONRenderer()
+    results = []
+    for name, serializer_class, instances in pages:
+        timings = []
+        contents = []
+        for fast in (False, True):
+            with override_settings(FAST_SERIALIZERS=fast):
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    content = renderer.render(serializer_class(
+                        instances, many=True, context={'request': request}
+                    ).data)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+            timings.append(round(best * 1000, 3))
+            contents.append(content)
+        results.append((name, *timings, contents[0] == contents[1]))
+    return results
@@ -0,0 +1,151 @@
+"""Кэш ответов API рецептов для анонимных пользователей.
+
+Ключ кэша включает номер поколения: общий для списков рецептов
+и отдельный для каждого рецепта. При изменении рецепта, его
+ингредиентов или автора сигналы (api.signals) увеличивают нужные
+поколения, и старые записи перестают читаться, истекая по таймауту.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+from api.conditional import NO_VALIDATORS, not_modified
+from api.constants import (
+    RECIPES_CACHE_PARAMS, RECIPES_CACHE_IGNORED_PARAMS
+)
+
+LIST_GENERATION_KEY = 'recipes:generation:list'
+RECIPE_GENERATION_KEY = 'recipes:generation:recipe:{}'
+
+
+def get_cache():
+    """Возвращает бэкенд кэша для ответов API рецептов."""
+    return caches[settings.RECIPES_CACHE_ALIAS]
+
+
+def get_generation(key):
+    """Возвращает текущее поколение, создавая его при отсутствии.
+
+    Новое поколение начинается с текущего времени в микросекундах,
+    чтобы после вытеснения ключа из кэша не совпасть со старым.
+    """
+    cache = get_cache()
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns() // 1000)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generations(keys):
+    """Увеличивает поколения, делая устаревшими закэшированные ответы."""
+    cache = get_cache()
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Поколения еще нет - значит, и ответов с ним в кэше нет.
+            pass
+
+
+def invalidate_recipes(recipe_ids):
+    """Сбрасывает кэш списков и деталей рецептов после коммита."""
+    keys = [LIST_GENERATION_KEY] + [
+        RECIPE_GENERATION_KEY.format(recipe_id) for recipe_id in recipe_ids
+    ]
+    transaction.on_commit(lambda: bump_generations(keys))
+
+
+def normalize_params(query_params):
+    """Приводит параметры запроса к каноническому виду.
+
+    Возвращает None, если в запросе есть параметры, влияющие
+    на ответ, но не участвующие в ключе кэша.
+    """
+    params = []
+    for name in sorted(query_params):
+        if name in RECIPES_CACHE_IGNORED_PARAMS:
+            continue
+        if name not in RECIPES_CACHE_PARAMS:
+            return None
+        value = query_params.get(name).strip()
+        if not value or (name == 'page' and value == '1'):
+            continue
+        params.append((name, value))
+    return params
+
+
+def get_cache_key(request, generation_key, pk=None):
+    """Строит ключ кэша для запроса или None, если он не кэшируется."""
+    params = normalize_params(request.query_params)
+    if params is None:
+        return None
+    raw_key = '|'.join((
+        str(get_generation(generation_key)),
+        request.get_host(),
+        request.accepted_media_type,
+        str(pk),
+        urlencode(params),
+    ))
+    return 'recipes:conditional:' + hashlib.md5(raw_key.encode()).hexdigest()
+
+
+def cached_response(view, request, get_response, pk=None):
+    """Отдает ответ из кэша или кэширует отрендеренный ответ.
+
+    Кэшируются только успешные JSON-ответы анонимным пользователям,
+    вместе с заголовками ответа (в том числе Allow, Vary: Accept,
+    ETag и Last-Modified) и валидаторами отрендеренной страницы
+    (view.validators, api.conditional). Условный запрос к
+    закэшированному ответу получает 304 без обращения к БД.
+    """
+    if (
+        request.user.is_authenticated
+        or request.accepted_renderer.format != 'json'
+    ):
+        return get_response()
+    if pk is not None:
+        if not str(pk).isdigit():
+            return get_response()
+        pk = int(pk)
+
+    generation_key = (
+        LIST_GENERATION_KEY if pk is None
+        else RECIPE_GENERATION_KEY.format(pk)
+    )
+    key = get_cache_key(request, generation_key, pk)
+    if key is None:
+        return get_response()
+
+    cache = get_cache()
+    cached = cache.get(key)
+    if cached is None:
+        response = get_response()
+        if response.status_code != 200:
+            return response
+        content = request.accepted_renderer.render(
+            response.data,
+            request.accepted_media_type,
+            view.get_renderer_context()
+        )
+        headers = {**view.default_response_headers, **dict(response.items())}
+        headers.pop('Content-Type', None)
+        cached = (
+            content, headers, getattr(view, 'validators', NO_VALIDATORS)
+        )
+        cache.set(key, cached, settings.RECIPES_CACHE_TIMEOUT)
+    content, headers, validators = cached
+    response = not_modified(request, *validators)
+    if response is not None:
+        return response
+    response = HttpResponse(
+        content, content_type=request.accepted_media_type
+    )
+    for name, value in headers.items():
+        response[name] = value
+    return response
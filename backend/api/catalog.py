@@ -0,0 +1,117 @@
+"""Готовый ответ со всем каталогом ингредиентов.
+
+Каталог меняется редко, поэтому JSON со всеми ингредиентами
+рендерится один раз на версию каталога (recipes.search) и хранится
+в памяти воркера вместе со сжатыми gzip и brotli (если установлен
+пакет brotli) вариантами. Ответ отдается с сильным ETag по хэшу
+содержимого, одинаковым во всех воркерах, и на If-None-Match
+с тем же ETag возвращается 304 без тела.
+"""
+import gzip
+import hashlib
+import threading
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+from api.constants import INGREDIENTS_MAX_AGE
+from recipes.search import ingredient_index
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = 'application/json'
+
+
+class RenderedCatalog:
+    """Отрендеренный каталог ингредиентов в нескольких кодировках."""
+
+    def __init__(self, snapshot):
+        """Рендерит и сжимает каталог из снимка индекса."""
+        self.snapshot = snapshot
+        body = JSONRenderer().render(snapshot.entries)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {None: (body, f'"{digest}"')}
+        self.variants['gzip'] = (
+            gzip.compress(body, mtime=0), f'"{digest}-gzip"'
+        )
+        if brotli is not None:
+            self.variants['br'] = (brotli.compress(body), f'"{digest}-br"')
+        self.etags = {etag for _, etag in self.variants.values()}
+
+    def choose_encoding(self, request):
+        """Выбирает кодировку по заголовку Accept-Encoding.
+
+        Учитываются q-значения: кодировка с q=0 не выбирается, из
+        остальных берется с наибольшим q, а при равных - br. Маска *
+        задает q для не перечисленных явно кодировок.
+        """
+        accepted = {}
+        for value in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+            coding, *params = value.split(';')
+            quality = 1.0
+            for param in params:
+                name, _, number = param.partition('=')
+                if name.strip().lower() == 'q':
+                    try:
+                        quality = float(number)
+                    except ValueError:
+                        quality = 0.0
+            accepted[coding.strip().lower()] = quality
+        candidates = [
+            (accepted.get(encoding, accepted.get('*', 0.0)), encoding)
+            for encoding in ('br', 'gzip') if encoding in self.variants
+        ]
+        quality, encoding = max(
+            candidates, key=lambda item: item[0], default=(0.0, None)
+        )
+        return encoding if quality > 0 else None
+
+    def response(self, request):
+        """Возвращает ответ с каталогом или 304, если он не изменился."""
+        encoding = self.choose_encoding(request)
+        body, etag = self.variants[encoding]
+        # If-None-Match сравнивается слабо: префикс W/ не учитывается.
+        if_none_match = {
+            tag.removeprefix('W/') for tag in parse_etags(
+                request.META.get('HTTP_IF_NONE_MATCH', '')
+            )
+        }
+        if '*' in if_none_match or self.etags & if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type=JSON_MEDIA_TYPE)
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={INGREDIENTS_MAX_AGE}'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+class CatalogCache:
+    """Отрендеренный каталог для текущего снимка индекса ингредиентов."""
+
+    def __init__(self):
+        """Создает пустой кэш."""
+        self._rendered = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Возвращает каталог, перерисовывая его после смены версии."""
+        snapshot = ingredient_index.get_snapshot()
+        rendered = self._rendered
+        if rendered is not None and rendered.snapshot is snapshot:
+            return rendered
+        with self._lock:
+            rendered = self._rendered
+            if rendered is None or rendered.snapshot is not snapshot:
+                rendered = self._rendered = RenderedCatalog(snapshot)
+        return rendered
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,99 @@
+"""Условные GET-запросы к рецептам (ETag и Last-Modified).
+
+Валидаторы ответа считаются по колонкам версий, а не по телу:
+ETag - хэш id и даты изменения (updated_at) рецептов, флагов
+текущего пользователя (избранное, список покупок, подписка),
+состояния пагинации и параметров запроса. Last-Modified отдается
+только анонимам для отдельного рецепта: у списков его не сдвигает
+удаление рецепта, а у авторизованных - смена флагов.
+
+Если клиент прислал If-None-Match или If-Modified-Since,
+представление сначала выбирает одним запросом только колонки версий
+(без автора, ингредиентов и сериализации; для списка - вместе с числом
+рецептов, см. FoodgramPagination.paginate_versions) и при совпадении
+отвечает 304. Анонимам ответы отдаются из кэша (api.cache) вместе
+с валидаторами, и условный запрос к закэшированному ответу
+проверяется без обращения к БД.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# Колонки рецепта, нужные для валидаторов, пагинации и флагов.
+VERSION_FIELDS = ('id', 'updated_at', 'pub_date', 'author_id')
+FLAG_FIELDS = ('is_favorited', 'is_in_shopping_cart', 'author_is_subscribed')
+CONDITIONAL_HEADERS = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+NO_VALIDATORS = (None, None)
+
+
+def version_queryset(recipes):
+    """Сужает queryset рецептов до колонок версий."""
+    return recipes.select_related(None).prefetch_related(None).only(
+        *VERSION_FIELDS
+    )
+
+
+def get_version(recipe):
+    """Возвращает версию рецепта с флагами текущего пользователя."""
+    return (
+        recipe.pk, recipe.updated_at.isoformat(),
+        *(getattr(recipe, name, None) for name in FLAG_FIELDS),
+    )
+
+
+def make_etag(request, recipes, state=()):
+    """Строит сильный ETag для ответа с переданными рецептами."""
+    raw = repr((
+        request.get_host(), request.accepted_media_type,
+        request.get_full_path(), tuple(state),
+        [get_version(recipe) for recipe in recipes],
+    ))
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+
+def is_conditional(request):
+    """Проверяет, прислал ли клиент условные заголовки."""
+    return any(header in request.META for header in CONDITIONAL_HEADERS)
+
+
+def set_validators(response, etag, last_modified):
+    """Добавляет к ответу заголовки ETag и Last-Modified."""
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, etag, last_modified):
+    """Возвращает ответ 304, если валидаторы совпали, иначе None."""
+    if not etag:
+        return None
+    response = get_conditional_response(
+        request, etag=etag,
+        last_modified=(
+            int(last_modified.timestamp()) if last_modified else None
+        )
+    )
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
+
+
+def conditional_response(view, request, get_validators, get_response):
+    """Отвечает 304 по колонкам версий или отдает полный ответ.
+
+    get_validators выполняет легкий запрос и возвращает пару
+    (ETag, дата изменения). Полный ответ get_response должен
+    сохранить свои валидаторы в view.validators.
+    """
+    if is_conditional(request):
+        response = not_modified(request, *get_validators())
+        if response is not None:
+            return response
+    view.validators = NO_VALIDATORS
+    response = get_response()
+    if response.status_code == 200:
+        set_validators(response, *view.validators)
+    return response
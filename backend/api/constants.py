@@ -1,6 +1,70 @@
-"""Константы для пагинации."""
+"""Константы API."""
 from django.conf import settings
 
 PAGE_SIZE = getattr(settings, 'PAGE_SIZE', 6)
 PAGE_SIZE_PARAM = 'limit'
 MAX_PAGE_SIZE = 100
+CURSOR_PARAM = 'cursor'
+COUNT_PARAM = 'count'
+APPROXIMATE_COUNT = 'approx'
+# Параметры, меняющие сортировку списка: с курсором не сочетаются,
+# т.к. курсор хранит только значения полей cursor_ordering.
+CURSOR_EXCLUSIVE_PARAMS = ('search',)
+
+# Параметры, по которым кэшируются ответы API рецептов анонимам.
+# Фильтры избранного и списка покупок на анонимов не влияют.
+RECIPES_CACHE_PARAMS = (
+    'author', 'name', 'search', 'page', 'limit', 'fields', 'omit'
+)
+RECIPES_CACHE_IGNORED_PARAMS = ('is_favorited', 'is_in_shopping_cart')
+# Поля пользователя, изменение которых меняет ответы API рецептов.
+AUTHOR_PUBLIC_FIELDS = frozenset((
+    'email', 'username', 'first_name', 'last_name', 'avatar',
+    'avatar_variants'
+))
+
+# Размер порции при чтении списка покупок из БД
+SHOPPING_LIST_CHUNK_SIZE = 2000
+
+# Метрики, по которым набор замеров (api.benchmarks) ищет регрессии
+BENCHMARK_METRICS = ('p50_ms', 'p95_ms', 'queries', 'alloc_kb')
+BENCHMARK_THRESHOLD = 0.1
+
+# Поля пользователя, которые передаются в JWT и позволяют
+# аутентифицировать запрос без обращения к БД (api.authentication).
+JWT_USER_CLAIMS = (
+    'username', 'email', 'first_name', 'last_name', 'is_staff',
+    'is_superuser'
+)
+# Поля пользователя, при изменении которых выданные ему токены
+# отзываются (api.signals): claims в токене устаревают.
+TOKEN_USER_FIELDS = ('is_active', 'password', *JWT_USER_CLAIMS)
+
+# Параметры выбора полей ответа (api.fieldsets)
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+# Поля сериализаторов и колонки моделей, которые для них загружаются
+RECIPE_FIELD_COLUMNS = {
+    'name': ('name',),
+    'image': ('image',),
+    'image_variants': ('image_variants',),
+    'text': ('text',),
+    'cooking_time': ('cooking_time',),
+}
+USER_FIELD_COLUMNS = {
+    'email': ('email',),
+    'username': ('username',),
+    'first_name': ('first_name',),
+    'last_name': ('last_name',),
+    'avatar': ('avatar',),
+    'avatar_variants': ('avatar_variants',),
+    'recipes_count': ('recipes_count',),
+}
+
+# Время кэширования каталога ингредиентов клиентами (api.catalog)
+INGREDIENTS_MAX_AGE = 60
+
+# Параметр курсора ленты изменений (api.sync) и запас в секундах
+# на транзакции, зафиксированные после выдачи курсора
+SYNC_CURSOR_PARAM = 'since'
+SYNC_CURSOR_OVERLAP = 5
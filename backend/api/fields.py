@@ -1,12 +1,19 @@
 """Кастомные типы полей."""
 import base64
 import uuid
+from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
 from rest_framework import serializers
-from drf_extra_fields.fields import Base64ImageField
+from drf_extra_fields.fields import (
+    Base64ImageField as ExtraBase64ImageField
+)
 
+from recipes.images import validate_image
 
-__all__ = ['Base64ImageField']
+
+__all__ = ['Base64ImageField', 'ImageVariantsField']
 
 # NOTE: вместо него используется Base64ImageField из drf_extra_fields,
 # но в условиях было упомянуто,
@@ -26,3 +33,45 @@ class Base64InternalImageField(serializers.ImageField):
             filename = f'{uuid.uuid4()}.{ext}'
             data = ContentFile(base64.b64decode(imgstr), name=filename)
         return super().to_internal_value(data)
+
+
+class Base64ImageField(ExtraBase64ImageField):
+    """Поле изображения в base64 с проверкой размеров изображения.
+
+    Кроме строки base64 принимает файл, загруженный через
+    multipart/form-data или телом запроса (api.parsers).
+    """
+
+    def to_internal_value(self, data):
+        """Декодирует изображение и проверяет его размеры."""
+        if isinstance(data, UploadedFile):
+            image = serializers.ImageField.to_internal_value(self, data)
+        else:
+            image = super().to_internal_value(data)
+        try:
+            validate_image(image)
+        except ValidationError as error:
+            raise serializers.ValidationError(error.messages)
+        return image
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Поле со ссылками на уменьшенные варианты изображения.
+
+    Возвращает None, если варианты еще не построены.
+    """
+
+    def to_representation(self, variants):
+        """Преобразует пути вариантов в URL."""
+        if not variants:
+            return None
+        request = self.context.get('request')
+        urls = {}
+        for variant, formats in variants.items():
+            urls[variant] = {}
+            for extension, path in formats.items():
+                url = default_storage.url(path)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                urls[variant][extension] = url
+        return urls
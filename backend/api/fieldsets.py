@@ -0,0 +1,86 @@
+"""Выборочные поля ответа (?fields= и ?omit=).
+
+Клиент перечисляет через запятую поля, которые нужно вернуть
+(fields), или которые нужно пропустить (omit). Поле id возвращается
+всегда. Представление убирает лишние поля из сериализатора и не
+загружает для них данные: колонки откладываются через defer(),
+а связанные объекты и подзапросы не выбираются вовсе.
+"""
+from rest_framework.exceptions import ValidationError
+
+from api.constants import FIELDS_PARAM, OMIT_PARAM
+
+
+def split_param(query_params, name):
+    """Возвращает множество имен из параметра-списка через запятую."""
+    value = query_params.get(name)
+    if value is None:
+        return None
+    return {field.strip() for field in value.split(',') if field.strip()}
+
+
+def parse_fields(query_params, available):
+    """Возвращает множество запрошенных полей или None, если нужны все."""
+    fields = split_param(query_params, FIELDS_PARAM)
+    omit = split_param(query_params, OMIT_PARAM)
+    if fields is None and omit is None:
+        return None
+    errors = {}
+    for name, names in ((FIELDS_PARAM, fields), (OMIT_PARAM, omit)):
+        unknown = sorted((names or set()) - set(available))
+        if unknown:
+            errors[name] = f"Неизвестные поля: {', '.join(unknown)}."
+    if errors:
+        raise ValidationError(errors)
+    requested = set(available) if fields is None else fields | {'id'}
+    return requested - (omit or set()) | {'id'}
+
+
+class SparseFieldsMixin:
+    """Сериализатор, принимающий аргумент fields с набором полей."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """Убирает из сериализатора поля, которых нет в fields."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsViewMixin:
+    """Представление с выборочными полями ответа."""
+
+    def get_sparse_fields(self, serializer_class=None):
+        """Возвращает запрошенные поля сериализатора или None."""
+        serializer_class = serializer_class or self.get_serializer_class()
+        if not issubclass(serializer_class, SparseFieldsMixin):
+            return None
+        return parse_fields(
+            self.request.query_params, serializer_class.Meta.fields
+        )
+
+    def is_requested(self, name, serializer_class=None):
+        """Проверяет, нужно ли поле в ответе."""
+        fields = self.get_sparse_fields(serializer_class)
+        return fields is None or name in fields
+
+    def defer_omitted(self, queryset, columns, serializer_class=None):
+        """Откладывает загрузку колонок полей, не попавших в ответ.
+
+        columns - словарь: поле сериализатора -> колонки модели.
+        """
+        fields = self.get_sparse_fields(serializer_class)
+        if fields is None:
+            return queryset
+        deferred = [
+            column for name, names in columns.items()
+            if name not in fields for column in names
+        ]
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        """Передает сериализатору запрошенные поля."""
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
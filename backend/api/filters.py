@@ -1,6 +1,7 @@
 """Фильтры для рецептов и ингредиентов."""
 from django_filters import rest_framework as filters
 
+from recipes.fulltext import search_recipes
 from recipes.models import Recipe, Ingredient
 
 
@@ -25,12 +26,19 @@ class RecipeFilter(filters.FilterSet):
         method='filter_is_in_shopping_cart'
     )
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         """Метаданные фильтра."""
 
         model = Recipe
-        fields = ('author', 'is_favorited', 'is_in_shopping_cart', 'name')
+        fields = (
+            'author', 'is_favorited', 'is_in_shopping_cart', 'name', 'search'
+        )
+
+    def filter_search(self, recipes, name, value):
+        """Ищет по названию, описанию и ингредиентам с ранжированием."""
+        return search_recipes(recipes, value)
 
     def filter_is_favorited(self, recipes, name, value):
         """Фильтрует рецепты по наличию в избранном."""
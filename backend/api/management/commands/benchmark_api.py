@@ -0,0 +1,102 @@
+"""Скрипт для замера производительности эндпоинтов API."""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from api.benchmarks import compare, get_context, run
+from api.constants import BENCHMARK_THRESHOLD
+
+
+class Command(BaseCommand):
+    """Команда для замера задержек, числа SQL-запросов и памяти \
+        на эндпоинтах API и сравнения с сохраненными результатами."""
+
+    help = 'Замерить эндпоинты API и сравнить с базовыми результатами'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Число замеряемых запросов на сценарий',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Число прогревочных запросов на сценарий',
+        )
+        parser.add_argument(
+            '--only',
+            action='append',
+            help='Замерить только сценарии с этим префиксом имени',
+        )
+        parser.add_argument(
+            '--output',
+            help='Путь к JSON-файлу для сохранения результатов',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Путь к JSON-файлу с базовыми результатами',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=BENCHMARK_THRESHOLD,
+            help='Допустимый рост задержек и памяти (доля)',
+        )
+
+    def handle(self, *args, **options):
+        """Запуск замеров, вывод и сравнение результатов."""
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as error:
+                raise CommandError(
+                    f"Ошибка при чтении файла {options['compare']}: {error}"
+                )
+
+        context = get_context()
+        if context is None:
+            raise CommandError(
+                'Для замера нужны пользователи, рецепты и ингредиенты в БД, '
+                'выполните generate_fake_data.'
+            )
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            results = run(
+                context, options['iterations'], options['warmup'],
+                options['only']
+            )
+
+        columns = (
+            'status', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms',
+            'queries', 'alloc_kb'
+        )
+        self.stdout.write(f"{'scenario':<36}" + ''.join(
+            f'{column:>10}' for column in columns
+        ))
+        for name, result in results.items():
+            self.stdout.write(f'{name:<36}' + ''.join(
+                f"{','.join(map(str, result[column])):>10}"
+                if column == 'status' else f'{result[column]:>10}'
+                for column in columns
+            ))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+
+        if baseline is None:
+            self.stdout.write(self.style.SUCCESS('Замер завершен.'))
+            return
+        regressions = compare(results, baseline, options['threshold'])
+        for name, metric, old, new in regressions:
+            self.stdout.write(self.style.ERROR(
+                f'{name}: {metric} {old} -> {new}'
+            ))
+        if regressions:
+            raise CommandError(f'Найдено регрессий: {len(regressions)}.')
+        self.stdout.write(self.style.SUCCESS('Регрессий не найдено.'))
@@ -0,0 +1,223 @@
+"""Скрипт для нагрузочного сравнения WSGI- и ASGI-серверов."""
+import asyncio
+import json
+import time
+from urllib.parse import quote, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks import percentile
+from recipes.models import Ingredient, Recipe
+
+
+class Connection:
+    """Соединение HTTP/1.1 с keep-alive для отправки GET-запросов."""
+
+    def __init__(self, host, port, headers):
+        """Сохраняет адрес сервера и общие заголовки запросов."""
+        self.host = host
+        self.port = port
+        self.headers = ''.join(
+            f'{name}: {value}\r\n' for name, value in headers.items()
+        )
+        self.reader = self.writer = None
+
+    def close(self):
+        """Закрывает соединение."""
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def read_body(self, headers):
+        """Дочитывает тело ответа для повторного использования соединения."""
+        if headers.get('transfer-encoding') == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if not size:
+                    return
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        else:
+            await self.reader.read()
+            self.close()
+
+    async def get(self, path):
+        """Отправляет GET-запрос и возвращает код ответа."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        self.writer.write((
+            f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\n{self.headers}\r\n'
+        ).encode('latin-1'))
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Сервер закрыл соединение.')
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if self.reader is not None:
+            await self.read_body(headers)
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return int(status_line.split()[1])
+
+    async def request(self, path):
+        """Отправляет запрос, переподключаясь к закрытому соединению."""
+        reused = self.writer is not None
+        try:
+            return await self.get(path)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+            return await self.get(path)
+
+
+async def load(url, path, headers, requests, concurrency):
+    """Выполняет requests запросов в concurrency соединений."""
+    parts = urlsplit(url)
+    remaining = iter(range(requests))
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        connection = Connection(
+            parts.hostname, parts.port or 80, headers
+        )
+        try:
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    status = await connection.request(parts.path + path)
+                except (OSError, asyncio.IncompleteReadError):
+                    connection.close()
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if status >= 400:
+                    errors += 1
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+class Command(BaseCommand):
+    """Команда для замера RPS и задержек горячих эндпоинтов на чтение \
+        у нескольких запущенных серверов (например, gunicorn и uvicorn)."""
+
+    help = 'Сравнить RPS и задержки эндпоинтов на чтение у серверов'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--target',
+            action='append',
+            required=True,
+            help='Сервер в виде имя=URL, например asgi=http://127.0.0.1:8001',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=64,
+            help='Число одновременных соединений',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Число запросов к каждому эндпоинту',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=100,
+            help='Число прогревочных запросов',
+        )
+        parser.add_argument(
+            '--token',
+            help='Токен для замера от имени пользователя',
+        )
+        parser.add_argument(
+            '--output',
+            help='Путь к JSON-файлу с результатами',
+        )
+
+    def get_endpoints(self):
+        """Возвращает пути эндпоинтов на чтение с данными из БД."""
+        recipe_id = Recipe.objects.order_by('id').values_list(
+            'id', flat=True
+        ).first()
+        ingredient = Ingredient.objects.order_by('id').values_list(
+            'name', flat=True
+        ).first()
+        if recipe_id is None or ingredient is None:
+            raise CommandError('Для замера нужны рецепты и ингредиенты в БД.')
+        return {
+            'recipes-list': '/api/recipes/',
+            'recipes-detail': f'/api/recipes/{recipe_id}/',
+            'ingredients-search': (
+                f'/api/ingredients/?name={quote(ingredient[:2])}'
+            ),
+            'short-link': f'/recipes/{recipe_id}/',
+        }
+
+    def handle(self, *args, **options):
+        """Запуск замеров и вывод результатов."""
+        targets = []
+        for target in options['target']:
+            name, _, url = target.partition('=')
+            if not url:
+                raise CommandError(f'Ожидается имя=URL, получено {target}.')
+            targets.append((name, url.rstrip('/')))
+        headers = {'Accept': 'application/json'}
+        if options['token']:
+            headers['Authorization'] = f"Token {options['token']}"
+
+        results = []
+        for endpoint, path in self.get_endpoints().items():
+            for name, url in targets:
+                asyncio.run(load(
+                    url, path, headers, options['warmup'],
+                    options['concurrency']
+                ))
+                elapsed, latencies, errors = asyncio.run(load(
+                    url, path, headers, options['requests'],
+                    options['concurrency']
+                ))
+                if not latencies:
+                    raise CommandError(f'{name}: сервер не ответил.')
+                results.append({
+                    'endpoint': endpoint,
+                    'target': name,
+                    'rps': round(options['requests'] / elapsed, 1),
+                    'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+                    'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+                    'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+                    'max_ms': round(latencies[-1] * 1000, 2),
+                    'errors': errors,
+                })
+
+        columns = (
+            'endpoint', 'target', 'rps', 'p50_ms', 'p95_ms', 'p99_ms',
+            'max_ms', 'errors'
+        )
+        self.stdout.write(''.join(f'{column:>20}' for column in columns))
+        for result in results:
+            self.stdout.write(''.join(
+                f'{result[column]:>20}' for column in columns
+            ))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS('Замер завершен.'))
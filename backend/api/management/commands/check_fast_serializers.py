@@ -0,0 +1,64 @@
+"""Скрипт для проверки и замера быстрого пути сериализации."""
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from api.benchmarks import check_parity, get_context, time_serializers
+
+
+class Command(BaseCommand):
+    """Команда для сверки ответов API с быстрым путем сериализации \
+        и без него и для замера ускорения."""
+
+    help = 'Сверить ответы быстрого пути сериализации и замерить его'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=100,
+            help='Число объектов на странице',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Число повторов замера (берется лучший)',
+        )
+
+    def handle(self, *args, **options):
+        """Сверка ответов и вывод замеров."""
+        context = get_context()
+        if context is None:
+            raise CommandError(
+                'Для проверки нужны пользователи, рецепты и ингредиенты '
+                'в БД, выполните generate_fake_data. На пустой БД ответы '
+                'сверяет тест api.tests.test_fast_serializers.'
+            )
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            parity = check_parity(context, options['limit'])
+            timings = time_serializers(
+                context, options['limit'], options['repeat']
+            )
+
+        mismatches = 0
+        for path, equal, offset in parity:
+            if equal:
+                self.stdout.write(f'OK    {path}')
+            else:
+                mismatches += 1
+                self.stdout.write(self.style.ERROR(
+                    f'DIFF  {path} (с байта {offset})'
+                ))
+        self.stdout.write(
+            f"{'page':<10}{'drf_ms':>10}{'fast_ms':>10}{'speedup':>10}"
+        )
+        for name, slow, fast, equal in timings:
+            mismatches += not equal
+            self.stdout.write(
+                f'{name:<10}{slow:>10}{fast:>10}{slow / fast:>9.2f}x'
+                + ('' if equal else '  DIFF')
+            )
+        if mismatches:
+            raise CommandError(f'Найдено расхождений: {mismatches}.')
+        self.stdout.write(self.style.SUCCESS('Ответы совпадают.'))
@@ -1,12 +1,273 @@
 """Пагинация."""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.core.paginator import Paginator
+from django.db.models import BooleanField, Count, F, Func, Q, Value, Window
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from api.constants import (
+    PAGE_SIZE, PAGE_SIZE_PARAM, MAX_PAGE_SIZE, CURSOR_PARAM,
+    COUNT_PARAM, APPROXIMATE_COUNT, CURSOR_EXCLUSIVE_PARAMS
+)
+
+
+class RowComparison(Func):
+    """Сравнение строк значений в SQL: (a, b) < (c, d).
+
+    Принимает сначала выражения левой строки, затем правой.
+    Поддерживается PostgreSQL и SQLite 3.15+.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, left, right, operator):
+        """Сохраняет строки и оператор сравнения."""
+        super().__init__(*left, *right)
+        self.operator = operator
+
+    def as_sql(self, compiler, connection, **extra_context):
+        """Компилирует обе строки и соединяет их оператором."""
+        sqls, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+        size = len(sqls) // 2
+        return '({}) {} ({})'.format(
+            ', '.join(sqls[:size]), self.operator, ', '.join(sqls[size:])
+        ), params
+
+
+def approximate_count(queryset):
+    """Возвращает оценку числа строк queryset без COUNT(*).
+
+    На PostgreSQL берется оценка планировщика из EXPLAIN,
+    на остальных СУБД выполняется обычный COUNT.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination:
+    """Пагинация по курсору (keyset) без COUNT и OFFSET.
+
+    Курсор хранит значения полей сортировки последнего объекта
+    страницы, следующая страница выбирается сравнением строк
+    (pub_date, id) < (last_pub_date, last_id), которое использует
+    составной индекс (см. get_seek_filter). Поля сортировки берутся из атрибута
+    представления cursor_ordering. Поддерживается только переход
+    вперед: ссылка previous всегда пустая.
+    """
+
+    cursor_query_param = CURSOR_PARAM
+    count_query_param = COUNT_PARAM
+
+    def __init__(self, page_size, ordering):
+        """Сохраняет размер страницы и поля сортировки."""
+        self.page_size = page_size
+        self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request):
+        """Возвращает страницу объектов после переданного курсора."""
+        self.request = request
+        self.count = None
+        if request.query_params.get(self.count_query_param) \
+                == APPROXIMATE_COUNT:
+            self.count = approximate_count(queryset)
 
-from api.constants import PAGE_SIZE, PAGE_SIZE_PARAM, MAX_PAGE_SIZE
+        cursor = request.query_params.get(self.cursor_query_param)
+        queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(
+                self.get_seek_filter(queryset.model, self.decode(cursor))
+            )
+
+        page = list(queryset[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        self.page = page[:self.page_size]
+        return self.page
+
+    def get_seek_filter(self, model, values):
+        """Строит условие «строго после» для значений полей сортировки.
+
+        При одном направлении сортировки всех полей это сравнение
+        строк (pub_date, id) < (%s, %s), по которому СУБД идет
+        по составному индексу. При разных направлениях сравнение
+        строк неприменимо, и условие раскрывается в
+        a < x OR (a = x AND b > y).
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound('Неверный курсор.')
+        names = [field.lstrip('-') for field in self.ordering]
+        row = []
+        for name, value in zip(names, values):
+            field = model._meta.get_field(name)
+            try:
+                row.append(Value(field.to_python(value), output_field=field))
+            except ValidationError:
+                raise NotFound('Неверный курсор.')
+        descending = {field.startswith('-') for field in self.ordering}
+        if len(descending) == 1:
+            return RowComparison(
+                [F(name) for name in names], row,
+                '<' if descending.pop() else '>'
+            )
+        condition = Q()
+        equal = Q()
+        for field, name, value in zip(self.ordering, names, row):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value.value})
+            equal &= Q(**{name: value.value})
+        return condition
+
+    def encode(self, obj):
+        """Кодирует значения полей сортировки объекта в курсор."""
+        values = [
+            getattr(obj, field.lstrip('-')) for field in self.ordering
+        ]
+        data = json.dumps(
+            [
+                value.isoformat() if hasattr(value, 'isoformat') else value
+                for value in values
+            ],
+            separators=(',', ':')
+        )
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode(self, cursor):
+        """Декодирует курсор в список значений полей сортировки."""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound('Неверный курсор.')
+        if not isinstance(values, list):
+            raise NotFound('Неверный курсор.')
+        return values
+
+    def get_next_link(self):
+        """Возвращает ссылку на следующую страницу."""
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        """Формирует ответ со ссылкой на следующую страницу."""
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = None
+        response['results'] = data
+        return Response(response)
 
 
 class FoodgramPagination(PageNumberPagination):
-    """Настройки пагинации для проекта."""
+    """Настройки пагинации для проекта.
+
+    По умолчанию работает постранично (page/limit). Если в запросе
+    передан параметр cursor (в том числе пустой) и представление
+    задает cursor_ordering, используется KeysetPagination.
+    """
 
     page_size = PAGE_SIZE
     page_size_query_param = PAGE_SIZE_PARAM
     max_page_size = MAX_PAGE_SIZE
+    keyset = None
+    known_count = None
+
+    def django_paginator_class(self, object_list, per_page):
+        """Создает пагинатор, не пересчитывая уже известное число строк."""
+        paginator = Paginator(object_list, per_page)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+    def use_keyset(self, request, view):
+        """Проверяет, запрошена ли пагинация по курсору.
+
+        Параметры из CURSOR_EXCLUSIVE_PARAMS (поиск сортирует
+        по релевантности) с курсором не сочетаются: страницы
+        по курсору шли бы по дате, а не по релевантности.
+        """
+        if not getattr(view, 'cursor_ordering', None):
+            return False
+        if CURSOR_PARAM not in request.query_params:
+            return False
+        conflicts = [
+            param for param in CURSOR_EXCLUSIVE_PARAMS
+            if request.query_params.get(param)
+        ]
+        if conflicts:
+            raise exceptions.ValidationError({
+                CURSOR_PARAM: 'Курсор нельзя сочетать с параметрами: '
+                f'{", ".join(conflicts)}.'
+            })
+        return True
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выбирает режим пагинации и возвращает страницу."""
+        if self.use_keyset(request, view):
+            self.keyset = KeysetPagination(
+                self.get_page_size(request), view.cursor_ordering
+            )
+            return self.keyset.paginate_queryset(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_versions(self, queryset, request, view=None):
+        """Возвращает страницу и ее состояние одним запросом или None.
+
+        В постраничном режиме число строк считается в том же запросе
+        оконной функцией COUNT(*) OVER () и запоминается, чтобы
+        полный ответ на ту же страницу не выполнял COUNT повторно.
+        None возвращается, если номер страницы не число или страница
+        пуста: тогда валидаторы не считаются.
+        """
+        if self.use_keyset(request, view):
+            page = self.paginate_queryset(queryset, request, view)
+            return page, self.get_page_state()
+        page_size = self.get_page_size(request)
+        number = request.query_params.get(self.page_query_param, '1')
+        if not page_size or not number.isdigit() or int(number) < 1:
+            return None
+        start = (int(number) - 1) * page_size
+        page = list(queryset.annotate(
+            total_count=Window(Count('pk'))
+        )[start:start + page_size])
+        if not page:
+            return None
+        self.known_count = page[0].total_count
+        return page, (self.known_count,)
+
+    def get_page_state(self):
+        """Возвращает влияющие на ответ данные страницы, кроме объектов."""
+        if self.keyset is not None:
+            return (self.keyset.count, self.keyset.has_next)
+        return (self.page.paginator.count,)
+
+    def get_paginated_response(self, data):
+        """Формирует ответ в соответствии с режимом пагинации."""
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,34 @@
+"""Парсеры для загрузки изображений без base64."""
+import mimetypes
+import uuid
+
+from rest_framework.parsers import DataAndFiles, FileUploadParser
+
+
+class ImageUploadParser(FileUploadParser):
+    """Парсер тела запроса, целиком состоящего из изображения.
+
+    Тело запроса с Content-Type image/* пишется обработчиками загрузки
+    Django во временный файл по частям, без декодирования base64.
+    Файл попадает в request.data под именем из атрибута
+    image_field представления.
+    """
+
+    media_type = 'image/*'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Возвращает загруженный файл под именем поля изображения."""
+        data_and_files = super().parse(stream, media_type, parser_context)
+        field = getattr(parser_context['view'], 'image_field', 'file')
+        return DataAndFiles({}, {field: data_and_files.files['file']})
+
+    def get_filename(self, stream, media_type, parser_context):
+        """Берет имя из Content-Disposition или строит его по типу."""
+        filename = super().get_filename(stream, media_type, parser_context)
+        if filename:
+            return filename
+        content_type = parser_context['request'].content_type
+        extension = mimetypes.guess_extension(
+            content_type.split(';')[0].strip()
+        ) or ''
+        return f'{uuid.uuid4()}{extension}'
@@ -0,0 +1,34 @@
+"""Рендереры для выгрузки файлов."""
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class FileRenderer(BaseRenderer):
+    """Рендерер формата выгрузки.
+
+    Сам файл отдается потоково в обход рендерера, поэтому render
+    используется только для ответов с ошибками.
+    """
+
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Возвращает данные ответа с ошибкой в виде текста."""
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        return json.dumps(data, ensure_ascii=False).encode(self.charset)
+
+
+class PlainTextRenderer(FileRenderer):
+    """Рендерер для текстовых файлов."""
+
+    media_type = 'text/plain'
+    format = 'txt'
+
+
+class CSVRenderer(FileRenderer):
+    """Рендерер для CSV-файлов."""
+
+    media_type = 'text/csv'
+    format = 'csv'
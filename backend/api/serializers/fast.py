@@ -0,0 +1,105 @@
+"""Быстрый путь сериализации ответов на чтение.
+
+Стандартный Serializer.to_representation для каждого объекта
+и каждого поля заново вызывает get_attribute (обход source
+с проверками), обрабатывает SkipField и собирает OrderedDict.
+FastRepresentationMixin один раз на экземпляр сериализатора
+компилирует поля в список функций-геттеров (operator.attrgetter
+для простых полей, связанные методы для SerializerMethodField,
+быстрый путь вложенных сериализаторов) и строит обычный dict.
+
+Результат совпадает со стандартным: в необычных случаях
+(словарь вместо объекта, вызываемый атрибут, отсутствующий
+атрибут) геттер переходит на логику DRF. Быстрый путь
+отключается настройкой FAST_SERIALIZERS.
+"""
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+# Поля, значения которых из модели уже имеют нужный для JSON тип.
+PLAIN_FIELDS = (
+    serializers.ReadOnlyField, serializers.IntegerField,
+    serializers.CharField, serializers.EmailField,
+)
+SKIP = object()
+
+
+def represent(field, instance):
+    """Возвращает значение поля для объекта так же, как DRF."""
+    try:
+        attribute = field.get_attribute(instance)
+    except SkipField:
+        return SKIP
+    if isinstance(attribute, PKOnlyObject):
+        check_for_none = attribute.pk
+    else:
+        check_for_none = attribute
+    if check_for_none is None:
+        return None
+    return field.to_representation(attribute)
+
+
+def compile_field(field):
+    """Возвращает функцию, вычисляющую значение поля для объекта."""
+    if isinstance(field, serializers.SerializerMethodField):
+        return getattr(field.parent, field.method_name)
+    if field.source == '*':
+        return lambda instance: represent(field, instance)
+
+    get = attrgetter(field.source)
+    if isinstance(field, serializers.ListSerializer):
+        to_representation = field.child.to_representation
+
+        def convert(value):
+            if isinstance(value, models.Manager):
+                value = value.all()
+            return [to_representation(item) for item in value]
+    elif type(field) in PLAIN_FIELDS:
+        convert = None
+    else:
+        convert = field.to_representation
+
+    def getter(instance):
+        try:
+            value = get(instance)
+        except (AttributeError, ObjectDoesNotExist):
+            return represent(field, instance)
+        if value is None:
+            return None
+        if callable(value) and not isinstance(value, models.Manager):
+            return represent(field, instance)
+        return value if convert is None else convert(value)
+    return getter
+
+
+class FastRepresentationMixin:
+    """Сериализатор на чтение с компилируемым to_representation."""
+
+    @cached_property
+    def compiled_fields(self):
+        """Возвращает пары (имя поля, геттер) или None без быстрого пути."""
+        if not settings.FAST_SERIALIZERS:
+            return None
+        return [
+            (field.field_name, compile_field(field))
+            for field in self._readable_fields
+        ]
+
+    def to_representation(self, instance):
+        """Преобразует объект в словарь через скомпилированные геттеры."""
+        compiled_fields = self.compiled_fields
+        if compiled_fields is None:
+            return super().to_representation(instance)
+        data = {}
+        for name, getter in compiled_fields:
+            value = getter(instance)
+            if value is not SKIP:
+                data[name] = value
+        return data
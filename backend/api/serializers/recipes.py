@@ -1,13 +1,18 @@
 """Сериализаторы для API рецептов чтобы flake8 не ругался."""
 from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 
 from recipes.models import (
     Ingredient, Recipe, IngredientInRecipe, Favorite, ShoppingCart
 )
+from recipes import shopping_list
 from recipes.constants import MIN_COOKING_TIME
 from api.serializers.users import UserSerializer
-from api.fields import Base64ImageField
+from api.fields import Base64ImageField, ImageVariantsField
+from api.fieldsets import SparseFieldsMixin
+from api.serializers.fast import FastRepresentationMixin
+from recipes.tasks import save_variants
 
 
 class IngredientSerializer(serializers.ModelSerializer):
@@ -20,7 +25,9 @@ class IngredientSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'measurement_unit')
 
 
-class IngredientInRecipeSerializer(serializers.ModelSerializer):
+class IngredientInRecipeSerializer(
+    FastRepresentationMixin, serializers.ModelSerializer
+):
     """Сериализатор для связи ингредиента с рецептом."""
 
     id = serializers.ReadOnlyField(source='ingredient.id')
@@ -38,11 +45,13 @@ class IngredientInRecipeSerializer(serializers.ModelSerializer):
 
 
 class IngredientAmountSerializer(serializers.ModelSerializer):
-    """Сериализатор для ингредиентов с количеством при создании рецепта."""
+    """Сериализатор для ингредиентов с количеством при создании рецепта.
 
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all()
-    )
+    Существование ингредиентов проверяется одним запросом для всего
+    рецепта (RecipeCreateUpdateSerializer.validate_ingredients).
+    """
+
+    id = serializers.IntegerField()
     amount = serializers.IntegerField(min_value=MIN_COOKING_TIME)
 
     class Meta:
@@ -52,7 +61,9 @@ class IngredientAmountSerializer(serializers.ModelSerializer):
         fields = ('id', 'amount')
 
 
-class RecipeListSerializer(serializers.ModelSerializer):
+class RecipeListSerializer(
+    SparseFieldsMixin, FastRepresentationMixin, serializers.ModelSerializer
+):
     """Сериализатор для получения списка рецептов."""
 
     author = UserSerializer(read_only=True)
@@ -63,6 +74,7 @@ class RecipeListSerializer(serializers.ModelSerializer):
     )
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField()
 
     class Meta:
         """Метаданные сериализатора чтобы flake8 не ругался."""
@@ -70,12 +82,21 @@ class RecipeListSerializer(serializers.ModelSerializer):
         model = Recipe
         fields = (
             'id', 'author', 'ingredients', 'is_favorited',
-            'is_in_shopping_cart', 'name', 'image', 'text', 'cooking_time'
+            'is_in_shopping_cart', 'name', 'image', 'image_variants',
+            'text', 'cooking_time'
         )
         read_only_fields = fields
 
+    def to_representation(self, recipe):
+        """Передает автору флаг подписки, посчитанный в queryset."""
+        if hasattr(recipe, 'author_is_subscribed'):
+            recipe.author.is_subscribed = recipe.author_is_subscribed
+        return super().to_representation(recipe)
+
     def get_is_favorited(self, recipe):
         """Проверяет, добавлен ли рецепт в избранное."""
+        if hasattr(recipe, 'is_favorited'):
+            return recipe.is_favorited
         request = self.context.get('request')
         return request and request.user.is_authenticated and \
             Favorite.objects.filter(
@@ -84,6 +105,8 @@ class RecipeListSerializer(serializers.ModelSerializer):
 
     def get_is_in_shopping_cart(self, recipe):
         """Проверяет, добавлен ли рецепт в список покупок."""
+        if hasattr(recipe, 'is_in_shopping_cart'):
+            return recipe.is_in_shopping_cart
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
@@ -93,7 +116,11 @@ class RecipeListSerializer(serializers.ModelSerializer):
 
 
 class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
-    """Сериализатор для создания и обновления рецепта."""
+    """Сериализатор для создания и обновления рецепта.
+
+    В multipart/form-data изображение передается файлом,
+    а ингредиенты - полями ingredients[0]id, ingredients[0]amount и т.д.
+    """
 
     ingredients = IngredientAmountSerializer(many=True)
     image = Base64ImageField(required=True)
@@ -133,12 +160,20 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
                 'Необходимо указать хотя бы один ингредиент'
             )
 
-        ingredients_ids = [item['id'].id for item in ingredients]
+        ingredients_ids = [item['id'] for item in ingredients]
         if len(ingredients_ids) != len(set(ingredients_ids)):
             raise serializers.ValidationError(
                 'Ингредиенты не должны повторяться'
             )
 
+        found = Ingredient.objects.in_bulk(ingredients_ids)
+        missing = [pk for pk in ingredients_ids if pk not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f'Ингредиенты не найдены: {missing}'
+            )
+        for item in ingredients:
+            item['id'] = found[item['id']]
         return ingredients
 
     def create_ingredients(self, recipe, ingredients_data):
@@ -159,16 +194,65 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         recipe = super().create(validated_data)
 
         self.create_ingredients(recipe, ingredients_data)
+        recipe.refresh_search_document()
+        save_variants(recipe, 'image', 'image_variants')
         return recipe
 
     @transaction.atomic
     def update(self, instance, validated_data):
         """Обновляет рецепт с ингредиентами."""
         ingredients_data = validated_data.pop('ingredients')
-        instance.ingredients_in_recipes.all().delete()
+        shopping_list.apply_recipe(instance.id, -1)
+        # Старые строки удаляются одним запросом без сигналов по строкам:
+        # сохранение рецепта ниже само обновляет updated_at и кэш.
+        instance.ingredients_in_recipes.all()._raw_delete(instance._state.db)
         self.create_ingredients(instance, ingredients_data)
+        shopping_list.apply_recipe(instance.id, 1)
+
+        recipe = super().update(instance, validated_data)
+        recipe.refresh_search_document()
+        if 'image' in validated_data:
+            save_variants(recipe, 'image', 'image_variants')
+        return recipe
+
+    def to_representation(self, instance):
+        """Преобразует данные модели в формат ответа.
+
+        Ингредиенты загружаются одним запросом вместе с каталогом.
+        """
+        prefetch_related_objects([instance], Prefetch(
+            'ingredients_in_recipes',
+            queryset=IngredientInRecipe.objects.select_related('ingredient')
+        ))
+        return RecipeListSerializer(
+            instance, context=self.context
+        ).data
+
+
+class RecipeImageSerializer(serializers.ModelSerializer):
+    """Сериализатор для замены изображения рецепта."""
 
-        return super().update(instance, validated_data)
+    image = Base64ImageField(required=True)
+
+    class Meta:
+        """Метаданные сериализатора чтобы flake8 не ругался."""
+
+        model = Recipe
+        fields = ('image',)
+
+    def validate_image(self, image):
+        """Проверяет, что изображение не пустое."""
+        if not image:
+            raise serializers.ValidationError(
+                'Изображение не может быть пустым.'
+            )
+        return image
+
+    def update(self, recipe, validated_data):
+        """Сохраняет изображение и строит его уменьшенные варианты."""
+        recipe = super().update(recipe, validated_data)
+        save_variants(recipe, 'image', 'image_variants')
+        return recipe
 
     def to_representation(self, instance):
         """Преобразует данные модели в формат ответа."""
@@ -180,9 +264,11 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 class RecipeShortInfoSerializer(serializers.ModelSerializer):
     """Сериализатор для краткой информации о рецепте."""
 
+    image_variants = ImageVariantsField()
+
     class Meta:
         """Метаданные сериализатора чтобы flake8 не ругался."""
 
         model = Recipe
-        fields = ('id', 'name', 'image', 'cooking_time')
+        fields = ('id', 'name', 'image', 'image_variants', 'cooking_time')
         read_only_fields = fields
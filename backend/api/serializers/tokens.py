@@ -0,0 +1,76 @@
+"""Сериализаторы для выдачи, обновления и отзыва JWT."""
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+
+from api.authentication import issue_token, is_revoked, revoke_token
+
+User = get_user_model()
+
+
+def get_refresh_token(raw_token):
+    """Возвращает действующий и не отозванный refresh-токен."""
+    token = RefreshToken(raw_token)
+    if is_revoked(token):
+        raise TokenError('Токен отозван.')
+    return token
+
+
+class TokenCreateSerializer(TokenObtainPairSerializer):
+    """Сериализатор для получения пары токенов по email и паролю."""
+
+    @classmethod
+    def get_token(cls, user):
+        """Возвращает refresh-токен с полями пользователя."""
+        return issue_token(user)
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    """Сериализатор для обмена refresh-токена на новую пару токенов.
+
+    Поля пользователя в claims обновляются из БД, старый
+    refresh-токен отзывается.
+    """
+
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        """Проверяет токен и пользователя и выдает новую пару токенов."""
+        token = get_refresh_token(attrs['refresh'])
+        user = User.objects.filter(
+            id=token[api_settings.USER_ID_CLAIM], is_active=True
+        ).first()
+        if user is None:
+            raise TokenError('Пользователь не найден или неактивен.')
+        revoke_token(token)
+        refresh = issue_token(user)
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        }
+
+
+class TokenVerifySerializer(serializers.Serializer):
+    """Сериализатор для проверки токена."""
+
+    token = serializers.CharField()
+
+    def validate(self, attrs):
+        """Проверяет подпись, срок действия и отзыв токена."""
+        if is_revoked(UntypedToken(attrs['token'])):
+            raise TokenError('Токен отозван.')
+        return {}
+
+
+class TokenLogoutSerializer(serializers.Serializer):
+    """Сериализатор для отзыва refresh-токена при выходе."""
+
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        """Проверяет и отзывает refresh-токен."""
+        revoke_token(get_refresh_token(attrs['refresh']))
+        return {}
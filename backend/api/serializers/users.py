@@ -1,20 +1,29 @@
 """Сериализаторы для работы с пользователями чтобы flake8 не ругался."""
 from django.contrib.auth import get_user_model
+from django.db.models import F, Prefetch, Window, prefetch_related_objects
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
 from rest_framework import serializers
 from djoser.serializers import (
     UserSerializer as DjoserUserSerializer
 )
 
 from recipes.models import Recipe, Subscription
-from api.fields import Base64ImageField
+from api.fields import Base64ImageField, ImageVariantsField
+from api.fieldsets import SparseFieldsMixin
+from api.serializers.fast import FastRepresentationMixin
+from recipes.tasks import save_variants
 
 User = get_user_model()
 
 
-class UserSerializer(DjoserUserSerializer):
+class UserSerializer(
+    SparseFieldsMixin, FastRepresentationMixin, DjoserUserSerializer
+):
     """Сериализатор для модели пользователя чтобы flake8 не ругался."""
 
     is_subscribed = serializers.SerializerMethodField()
+    avatar_variants = ImageVariantsField()
 
     class Meta(DjoserUserSerializer.Meta):
         """Мне нечего сказать но flake8 ругается."""
@@ -28,11 +37,14 @@ class UserSerializer(DjoserUserSerializer):
             'last_name',
             'is_subscribed',
             'avatar',
+            'avatar_variants',
         )
         read_only_fields = fields
 
     def get_is_subscribed(self, author):
         """Проверка, подписан ли текущий пользователь на автора."""
+        if hasattr(author, 'is_subscribed'):
+            return author.is_subscribed
         request = self.context.get('request')
         return request and request.user.is_authenticated and \
             Subscription.objects.filter(
@@ -59,15 +71,25 @@ class SetAvatarSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def update(self, user, validated_data):
+        """Сохраняет аватар и строит его уменьшенные варианты."""
+        user = super().update(user, validated_data)
+        save_variants(user, 'avatar', 'avatar_variants')
+        return user
 
-class RecipeShortInfoSerializer(serializers.ModelSerializer):
+
+class RecipeShortInfoSerializer(
+    FastRepresentationMixin, serializers.ModelSerializer
+):
     """Сериализатор для краткой информации о рецепте."""
 
+    image_variants = ImageVariantsField()
+
     class Meta:
         """Метаданные сериализатора."""
 
         model = Recipe
-        fields = ('id', 'name', 'image', 'cooking_time')
+        fields = ('id', 'name', 'image', 'image_variants', 'cooking_time')
         read_only_fields = fields
 
 
@@ -75,7 +97,6 @@ class UserWithRecipesSerializer(UserSerializer):
     """Сериализатор для пользователя с рецептами."""
 
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.IntegerField(source='recipes.count')
 
     class Meta(UserSerializer.Meta):
         """Метаданные сериализатора."""
@@ -87,9 +108,56 @@ class UserWithRecipesSerializer(UserSerializer):
         read_only_fields = fields
 
     def get_recipes(self, author):
-        """Возвращает список рецептов пользователя."""
-        request = self.context.get('request')
-        recipes_limit = request.query_params.get('recipes_limit', 10**10)
-        recipes = author.recipes.all()[:int(recipes_limit)]
+        """Возвращает список рецептов пользователя.
+
+        Использует рецепты, заранее выбранные prefetch_top_recipes,
+        и делает отдельный запрос, только если их нет.
+        """
+        recipes = getattr(author, 'top_recipes', None)
+        if recipes is None:
+            recipes_limit = get_recipes_limit(self.context.get('request'))
+            recipes = author.recipes.all()[:recipes_limit]
 
         return RecipeShortInfoSerializer(recipes, many=True).data
+
+
+def get_recipes_limit(request):
+    """Возвращает значение recipes_limit из запроса или None."""
+    if request is None:
+        return None
+    try:
+        recipes_limit = int(request.query_params['recipes_limit'])
+    except (KeyError, ValueError):
+        return None
+    return max(recipes_limit, 0)
+
+
+def prefetch_top_recipes(authors, recipes_limit=None):
+    """Загружает первые recipes_limit рецептов всех авторов одним запросом.
+
+    Рецепты нумеруются ROW_NUMBER() OVER (PARTITION BY author)
+    в порядке сортировки модели и сохраняются в author.top_recipes.
+    """
+    if not authors:
+        # Пустой author__in не компилируется в SQL (EmptyResultSet).
+        return authors
+    recipes = Recipe.objects.only(
+        'id', 'author', 'name', 'image', 'image_variants', 'cooking_time'
+    )
+    if recipes_limit is not None:
+        ranked = Recipe.objects.filter(author__in=authors).annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=F('author_id'),
+                order_by=[F('pub_date').desc(), F('name').asc()],
+            )
+        ).values('id', 'row_number')
+        sql, params = ranked.query.sql_with_params()
+        recipes = recipes.filter(pk__in=RawSQL(
+            f'SELECT id FROM ({sql}) ranked WHERE row_number <= %s',
+            (*params, recipes_limit)
+        ))
+    prefetch_related_objects(
+        authors, Prefetch('recipes', queryset=recipes, to_attr='top_recipes')
+    )
+    return authors
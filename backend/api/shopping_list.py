@@ -0,0 +1,105 @@
+"""Потоковая выгрузка списка покупок в форматах txt, csv и json.
+
+Ингредиенты и рецепты читаются из БД порциями через iterator(),
+а документ отдается построчно генератором, поэтому потребление
+памяти и время до первого байта не зависят от размера корзины.
+"""
+import csv
+import json
+from datetime import datetime
+
+from api.constants import SHOPPING_LIST_CHUNK_SIZE
+from recipes.models import Recipe, ShoppingListItem
+
+
+def get_ingredients(user):
+    """Возвращает итератор по суммарным количествам ингредиентов.
+
+    Суммы читаются из агрегата ShoppingListItem по индексу
+    (user, ingredient) без группировки по корзине.
+    """
+    return ShoppingListItem.objects.filter(user=user).values(
+        'ingredient__name',
+        'ingredient__measurement_unit',
+        'total_amount'
+    ).order_by('ingredient__name').iterator(
+        chunk_size=SHOPPING_LIST_CHUNK_SIZE
+    )
+
+
+def get_recipes(user):
+    """Возвращает итератор по рецептам в списке покупок."""
+    return Recipe.objects.filter(
+        shoppingcart__user=user
+    ).values_list('name', 'author__username').order_by('name').iterator(
+        chunk_size=SHOPPING_LIST_CHUNK_SIZE
+    )
+
+
+def render_txt(user):
+    """Построчно формирует список покупок в виде текста."""
+    current_date = datetime.now().strftime('%d.%m.%Y %H:%M')
+    yield f'Список покупок для {user.username}\n'
+    yield f'Дата составления: {current_date}\n'
+    yield '\nПродукты:\n'
+    for i, item in enumerate(get_ingredients(user), start=1):
+        yield (
+            f"{i}. {item['ingredient__name'].capitalize()} "
+            f"({item['ingredient__measurement_unit']}) - "
+            f"{item['total_amount']}\n"
+        )
+    yield '\nРецепты:\n'
+    for i, (name, author) in enumerate(get_recipes(user), start=1):
+        yield f'{i}. {name} (Автор: {author})\n'
+
+
+class Echo:
+    """Псевдобуфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        """Возвращает строку вместо записи в буфер."""
+        return value
+
+
+def render_csv(user):
+    """Построчно формирует список продуктов в формате CSV."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(('name', 'measurement_unit', 'amount'))
+    for item in get_ingredients(user):
+        yield writer.writerow((
+            item['ingredient__name'],
+            item['ingredient__measurement_unit'],
+            item['total_amount'],
+        ))
+
+
+def render_json(user):
+    """Построчно формирует список покупок в формате JSON."""
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False)
+
+    yield '{"user": %s, "date": %s, "ingredients": [' % (
+        dumps(user.username), dumps(datetime.now().isoformat())
+    )
+    for i, item in enumerate(get_ingredients(user)):
+        yield (', ' if i else '') + dumps({
+            'name': item['ingredient__name'],
+            'measurement_unit': item['ingredient__measurement_unit'],
+            'amount': item['total_amount'],
+        })
+    yield '], "recipes": ['
+    for i, (name, author) in enumerate(get_recipes(user)):
+        yield (', ' if i else '') + dumps({'name': name, 'author': author})
+    yield ']}'
+
+
+RENDERERS = {
+    'txt': render_txt,
+    'csv': render_csv,
+    'json': render_json,
+}
+
+
+def render_shopping_list(user, file_format):
+    """Возвращает генератор списка покупок в заданном формате."""
+    return RENDERERS[file_format](user)
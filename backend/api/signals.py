@@ -0,0 +1,87 @@
+"""Сигналы для сброса кэша ответов API и отзыва токенов."""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from api.authentication import revoke_user_tokens
+from api.cache import invalidate_recipes
+from api.constants import AUTHOR_PUBLIC_FIELDS, TOKEN_USER_FIELDS
+from recipes.models import Ingredient, IngredientInRecipe, Recipe
+
+User = get_user_model()
+
+
+@receiver((post_save, post_delete), sender=Recipe)
+def invalidate_recipe_cache(sender, instance, **kwargs):
+    """Сбрасывает кэш при изменении или удалении рецепта."""
+    invalidate_recipes([instance.pk])
+
+
+@receiver((post_save, post_delete), sender=IngredientInRecipe)
+def invalidate_recipe_ingredients_cache(sender, instance, **kwargs):
+    """Сбрасывает кэш и версию рецепта при изменении его ингредиентов.
+
+    Версия (updated_at) здесь обновляется только при сохранении
+    строки. Удаления отмечаются набором: IngredientInRecipe.delete
+    и его QuerySet.delete, а каскад с ингредиентом -
+    touch_ingredient_recipes; каскад с рецептом версию не трогает.
+    """
+    if kwargs['signal'] is post_save:
+        Recipe.objects.filter(pk=instance.recipe_id).touch()
+    invalidate_recipes([instance.recipe_id])
+
+
+@receiver(pre_delete, sender=Ingredient)
+def touch_ingredient_recipes(sender, instance, **kwargs):
+    """Отмечает измененными рецепты удаляемого ингредиента.
+
+    Кэш этих рецептов сбрасывают сигналы удаляемых вместе с ним строк.
+    """
+    Recipe.objects.filter(ingredients=instance).touch()
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_cache(sender, instance, update_fields=None, **kwargs):
+    """Сбрасывает кэш и версии рецептов автора при изменении профиля.
+
+    Сохранения, не затрагивающие выводимые в API поля
+    (например, обновление last_login при входе), игнорируются.
+    """
+    if update_fields and not AUTHOR_PUBLIC_FIELDS & set(update_fields):
+        return
+    recipe_ids = list(instance.recipes.values_list('id', flat=True))
+    if recipe_ids:
+        instance.recipes.touch()
+        invalidate_recipes(recipe_ids)
+
+
+@receiver(pre_save, sender=User)
+def check_token_fields(sender, instance, update_fields=None, **kwargs):
+    """Отмечает, изменились ли поля пользователя, попадающие в токен.
+
+    Старые значения читаются из БД одним запросом и только если
+    сохраняются поля из TOKEN_USER_FIELDS.
+    """
+    fields = set(TOKEN_USER_FIELDS)
+    if update_fields is not None:
+        fields &= set(update_fields)
+    instance._token_fields_changed = False
+    if instance._state.adding or not fields:
+        return
+    old = User.objects.filter(pk=instance.pk).values(*fields).first()
+    instance._token_fields_changed = old is not None and any(
+        getattr(instance, field) != value for field, value in old.items()
+    )
+
+
+@receiver(post_save, sender=User)
+def revoke_changed_user_tokens(sender, instance, **kwargs):
+    """Отзывает токены пользователя, если устарели их claims.
+
+    Срабатывает при блокировке, смене пароля или прав и изменении
+    публичных полей - в том числе из админки и manage.py.
+    """
+    if getattr(instance, '_token_fields_changed', False):
+        revoke_user_tokens(instance.pk)
@@ -0,0 +1,242 @@
+"""Лента изменений избранного и списка покупок для синхронизации.
+
+Клиент хранит копию своих списков и передает курсор из предыдущего
+ответа. В ответ попадают только рецепты из списков, измененные
+(updated_at) или добавленные в список после курсора, id удаленных
+рецептов и изменения состава списков (по записям Tombstone).
+Без курсора отдается полный снимок (reset), а курсор старше срока
+хранения записей об удалении отклоняется ответом 410: клиент должен
+сбросить копию и запросить снимок заново.
+
+Лента отдается страницами по limit записей. Сначала идут рецепты
+по (updated_at, id), затем записи об удалении по (deleted_at, id);
+следующая страница выбирается сравнением строк (как в
+KeysetPagination), поэтому стоит одного запроса по индексу.
+Пока в ответе есть next, клиент запрашивает его; на последней
+странице next пуст, а cursor - курсор для следующей синхронизации.
+
+Курсор синхронизации - момент начала первого запроса минус
+SYNC_CURSOR_OVERLAP: изменения транзакций, начатых раньше,
+но зафиксированных позже, не теряются, а повторно присланные
+рецепты клиент просто перезаписывает.
+"""
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db.models import Exists, F, OuterRef, Q, Value
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from api.constants import SYNC_CURSOR_OVERLAP
+from api.pagination import RowComparison
+from recipes.constants import TOMBSTONE_RETENTION_DAYS
+from recipes.models import Favorite, ShoppingCart, Tombstone
+
+# (ключ ответа, модель списка)
+LISTS = (
+    ('favorites', Favorite),
+    ('shopping_cart', ShoppingCart),
+)
+RECIPES_PHASE = 'recipes'
+REMOVED_PHASE = 'removed'
+
+
+class ResyncRequired(APIException):
+    """Курсор старше срока хранения записей об удалении."""
+
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        'Курсор устарел, нужна полная синхронизация: '
+        'повторите запрос без курсора.'
+    )
+    default_code = 'resync_required'
+
+
+def encode_cursor(state):
+    """Кодирует состояние ленты в курсор."""
+    data = json.dumps(state, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def sync_cursor(until):
+    """Возвращает курсор для следующей синхронизации."""
+    since = until - timedelta(seconds=SYNC_CURSOR_OVERLAP)
+    return encode_cursor({'since': since.isoformat()})
+
+
+def parse_moment(value):
+    """Разбирает момент из курсора."""
+    moment = parse_datetime(value) if isinstance(value, str) else None
+    if moment is None or timezone.is_naive(moment):
+        raise NotFound('Неверный курсор.')
+    return moment
+
+
+def decode_cursor(cursor, now):
+    """Возвращает состояние ленты из курсора.
+
+    Пустой курсор начинает полный снимок; курсоры прежнего формата
+    (момент в ISO 8601) принимаются как начало синхронизации.
+    """
+    if not cursor:
+        return {
+            'since': None, 'until': now, 'phase': RECIPES_PHASE,
+            'after': None,
+        }
+    try:
+        data = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise NotFound('Неверный курсор.')
+    try:
+        state = json.loads(data)
+    except ValueError:
+        state = {'since': data}
+    if not isinstance(state, dict):
+        raise NotFound('Неверный курсор.')
+    since = state.get('since')
+    if since is not None:
+        since = parse_moment(since)
+        if since < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            raise ResyncRequired()
+    phase = state.get('phase', RECIPES_PHASE)
+    if phase not in (RECIPES_PHASE, REMOVED_PHASE):
+        raise NotFound('Неверный курсор.')
+    return {
+        'since': since,
+        'until': parse_moment(state['until']) if 'until' in state else now,
+        'phase': phase,
+        'after': state.get('after'),
+    }
+
+
+def seek(queryset, ordering, after):
+    """Упорядочивает queryset и оставляет строки после значений after."""
+    queryset = queryset.order_by(*ordering)
+    if after is None:
+        return queryset
+    if not isinstance(after, list) or len(after) != len(ordering):
+        raise NotFound('Неверный курсор.')
+    row = []
+    for name, value in zip(ordering, after):
+        field = queryset.model._meta.get_field(name)
+        try:
+            row.append(Value(field.to_python(value), output_field=field))
+        except ValidationError:
+            raise NotFound('Неверный курсор.')
+    return queryset.filter(RowComparison(
+        [F(name) for name in ordering], row, '>'
+    ))
+
+
+def next_state(state, phase, last):
+    """Возвращает состояние для страницы после объекта last."""
+    return {
+        'since': state['since'] and state['since'].isoformat(),
+        'until': state['until'].isoformat(),
+        'phase': phase,
+        'after': last and [last[0].isoformat(), last[1]],
+    }
+
+
+def get_recipes_page(recipes, user, state, limit):
+    """Возвращает страницу рецептов из списков и следующее состояние.
+
+    recipes - queryset рецептов для сериализации (с флагами).
+    """
+    since = state['since']
+    memberships = [
+        model.objects.filter(user=user, recipe=OuterRef('pk'))
+        for _, model in LISTS
+    ]
+    changed = Q(
+        *(Exists(members) for members in memberships), _connector=Q.OR
+    )
+    if since is not None:
+        changed &= Q(
+            Q(updated_at__gt=since),
+            *(
+                Exists(members.filter(created_at__gt=since))
+                for members in memberships
+            ),
+            _connector=Q.OR
+        )
+    ordering = ('updated_at', 'id')
+    rows = list(
+        seek(recipes.filter(changed), ordering, state['after'])[:limit + 1]
+    )
+    page = {'recipes': rows[:limit], 'deleted': []}
+    ids = [recipe.pk for recipe in page['recipes']]
+    for name, model in LISTS:
+        added = model.objects.filter(user=user, recipe_id__in=ids)
+        if since is not None:
+            added = added.filter(created_at__gt=since)
+        page[name] = {
+            'added': sorted(added.values_list('recipe_id', flat=True)),
+            'removed': [],
+        }
+    if len(rows) > limit:
+        last = page['recipes'][-1]
+        return page, next_state(
+            state, RECIPES_PHASE, (last.updated_at, last.pk)
+        )
+    if since is None:
+        return page, None
+    return page, next_state(state, REMOVED_PHASE, None)
+
+
+def get_removed_page(user, state, limit):
+    """Возвращает страницу удалений из списков и следующее состояние."""
+    since = state['since']
+    kinds = {model._meta.model_name: name for name, model in LISTS}
+    tombstones = list(seek(
+        Tombstone.objects.filter(
+            user=user, kind__in=kinds, deleted_at__gt=since
+        ).only('id', 'kind', 'recipe_id', 'deleted_at'),
+        ('deleted_at', 'id'), state['after']
+    )[:limit + 1])
+    page = {'recipes': [], 'deleted': []}
+    removed_ids = set()
+    for name, model in LISTS:
+        removed = {
+            tombstone.recipe_id for tombstone in tombstones[:limit]
+            if kinds[tombstone.kind] == name
+        }
+        # Рецепт могли убрать и снова добавить.
+        removed -= set(model.objects.filter(
+            user=user, recipe_id__in=removed
+        ).values_list('recipe_id', flat=True))
+        removed_ids |= removed
+        page[name] = {'added': [], 'removed': sorted(removed)}
+    if removed_ids:
+        page['deleted'] = sorted(set(Tombstone.objects.filter(
+            kind='recipe', recipe_id__in=removed_ids, deleted_at__gt=since
+        ).values_list('recipe_id', flat=True)))
+    if len(tombstones) > limit:
+        last = tombstones[limit - 1]
+        return page, next_state(
+            state, REMOVED_PHASE, (last.deleted_at, last.pk)
+        )
+    return page, None
+
+
+def get_changes(recipes, user, state, limit):
+    """Возвращает страницу изменений списков пользователя.
+
+    На последней странице next пуст, а cursor - курсор следующей
+    синхронизации; на остальных наоборот.
+    """
+    if state['phase'] == RECIPES_PHASE:
+        page, state_after = get_recipes_page(recipes, user, state, limit)
+    else:
+        page, state_after = get_removed_page(user, state, limit)
+    return {
+        'reset': state['since'] is None,
+        **page,
+        'next': state_after and encode_cursor(state_after),
+        'cursor': None if state_after else sync_cursor(state['until']),
+    }
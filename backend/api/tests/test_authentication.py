@@ -0,0 +1,34 @@
+"""Тесты отзыва JWT при изменении пользователя."""
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from api.authentication import ISSUED_AT_CLAIM, is_revoked, issue_token
+from recipes.tests.factories import create_user
+
+
+class TokenRevocationTest(TestCase):
+    """Тесты отзыва токенов сигналами модели пользователя."""
+
+    def setUp(self):
+        """Создает пользователя и выдает ему токен."""
+        cache.clear()
+        self.user = create_user('reader')
+        self.token = issue_token(self.user)
+        # Отзыв действует на токены, выданные раньше его секунды.
+        self.token[ISSUED_AT_CLAIM] -= 1
+
+    def test_claims_change_revokes_tokens(self):
+        """Блокировка и смена прав отзывают токены."""
+        for field, value in (('is_active', False), ('is_staff', True)):
+            cache.clear()
+            setattr(self.user, field, value)
+            self.user.save()
+            self.assertTrue(is_revoked(self.token), field)
+
+    def test_other_fields_keep_tokens(self):
+        """Обновление last_login не отзывает токены."""
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=['last_login'])
+        self.user.save()
+        self.assertFalse(is_revoked(self.token))
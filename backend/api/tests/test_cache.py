@@ -0,0 +1,39 @@
+"""Тесты кэша ответов API рецептов."""
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+
+from recipes.tests.factories import create_recipe, create_user
+
+
+class CachedResponseTest(TestCase):
+    """Тесты ответов из кэша для анонимных пользователей."""
+
+    def setUp(self):
+        """Очищает кэш и создает рецепт."""
+        caches[settings.RECIPES_CACHE_ALIAS].clear()
+        self.recipe = create_recipe(create_user('author'))
+
+    def test_cached_headers_match(self):
+        """Ответ из кэша отдается с теми же заголовками и телом."""
+        for path in ('/api/recipes/', f'/api/recipes/{self.recipe.id}/'):
+            missed, hit = (self.client.get(path) for _ in range(2))
+            self.assertEqual(hit.content, missed.content)
+            for header in ('Allow', 'Vary', 'Content-Type', 'ETag'):
+                self.assertEqual(hit.get(header), missed.get(header), header)
+
+    def test_conditional_hit_without_queries(self):
+        """Условный запрос к ответу из кэша получает 304 без запросов."""
+        for path in ('/api/recipes/', f'/api/recipes/{self.recipe.id}/'):
+            cached = self.client.get(path)
+            with self.assertNumQueries(0):
+                response = self.client.get(
+                    path, HTTP_IF_NONE_MATCH=cached['ETag']
+                )
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], cached['ETag'])
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                path, HTTP_IF_MODIFIED_SINCE=cached['Last-Modified']
+            )
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,29 @@
+"""Тесты готового ответа с каталогом ингредиентов."""
+from django.test import TestCase
+
+from recipes.tests.factories import create_ingredient
+
+
+class CatalogEncodingTest(TestCase):
+    """Тесты выбора кодировки каталога."""
+
+    def setUp(self):
+        """Создает ингредиент каталога."""
+        create_ingredient('соль')
+
+    def get_encoding(self, accept_encoding):
+        """Возвращает Content-Encoding ответа с каталогом."""
+        response = self.client.get(
+            '/api/ingredients/', HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.get('Content-Encoding')
+
+    def test_gzip(self):
+        """Gzip выбирается, если клиент его принимает."""
+        self.assertEqual(self.get_encoding('gzip, deflate'), 'gzip')
+
+    def test_zero_quality_refused(self):
+        """Кодировка с q=0 не выбирается."""
+        self.assertIsNone(self.get_encoding('gzip;q=0, identity'))
+        self.assertIsNone(self.get_encoding('*;q=0'))
@@ -0,0 +1,93 @@
+"""Тесты условных запросов к рецептам (ETag и Last-Modified)."""
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from recipes.models import IngredientInRecipe
+from recipes.tests.factories import (
+    create_ingredient, create_recipe, create_user
+)
+
+
+class ConditionalRecipesTest(TestCase):
+    """Тесты смены версии рецептов при изменении ингредиентов."""
+
+    def setUp(self):
+        """Создает рецепт с ингредиентом."""
+        caches[settings.RECIPES_CACHE_ALIAS].clear()
+        self.salt = create_ingredient('соль')
+        self.recipe = create_recipe(
+            create_user('author'), ingredients=[(self.salt, 5)]
+        )
+        self.paths = ('/api/recipes/', f'/api/recipes/{self.recipe.id}/')
+
+    def get_etags(self):
+        """Возвращает ETag списка и деталей рецепта."""
+        return [self.client.get(path)['ETag'] for path in self.paths]
+
+    def assert_etags_changed(self, etags):
+        """Проверяет, что старые ETag больше не дают 304."""
+        for path, etag in zip(self.paths, etags):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200, path)
+
+    def test_not_modified(self):
+        """Без изменений ответ на If-None-Match - 304."""
+        for path, etag in zip(self.paths, self.get_etags()):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, path)
+
+    def test_ingredient_row_created(self):
+        """Добавление строки ингредиента в обход API меняет ETag."""
+        etags = self.get_etags()
+        with self.captureOnCommitCallbacks(execute=True):
+            IngredientInRecipe.objects.create(
+                recipe=self.recipe, ingredient=create_ingredient('перец'),
+                amount=1
+            )
+        self.assert_etags_changed(etags)
+
+    def test_ingredient_rows_deleted(self):
+        """Удаление строк ингредиентов набором меняет ETag."""
+        etags = self.get_etags()
+        with self.captureOnCommitCallbacks(execute=True):
+            IngredientInRecipe.objects.filter(recipe=self.recipe).delete()
+        self.assert_etags_changed(etags)
+
+    def test_ingredient_deleted(self):
+        """Каскадное удаление строк с ингредиентом меняет ETag."""
+        etags = self.get_etags()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.salt.delete()
+        self.assert_etags_changed(etags)
+
+
+class ConditionalListQueriesTest(TestCase):
+    """Тесты числа запросов условного запроса к списку рецептов."""
+
+    def setUp(self):
+        """Создает рецепты и авторизует читателя."""
+        author = create_user('author')
+        for number in range(3):
+            create_recipe(author, f'Суп {number}')
+        self.client = APIClient()
+        self.client.force_authenticate(create_user('reader'))
+        self.path = '/api/recipes/?limit=2&page=2'
+        self.etag = self.client.get(self.path)['ETag']
+
+    def test_not_modified_single_query(self):
+        """Ответ 304 стоит одного запроса к колонкам версий."""
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.path, HTTP_IF_NONE_MATCH=self.etag
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_stale_etag_counts_once(self):
+        """При несовпавшем ETag COUNT не выполняется повторно."""
+        with self.assertNumQueries(3):
+            response = self.client.get(self.path, HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response.json()['count'], 3)
@@ -0,0 +1,39 @@
+"""Тесты совпадения ответов быстрого пути сериализации."""
+from django.test import TestCase
+
+from api.benchmarks import check_parity, get_context
+from recipes.models import Favorite, ShoppingCart, Subscription
+from recipes.tests.factories import (
+    create_ingredient, create_recipe, create_user
+)
+
+
+class FastSerializersParityTest(TestCase):
+    """Сверка ответов API с быстрым путем сериализации и без него."""
+
+    def setUp(self):
+        """Создает авторов, рецепты, подписки, избранное и корзину."""
+        users = [create_user(name) for name in ('reader', 'author')]
+        ingredients = [
+            create_ingredient(name) for name in ('мука', 'сахар', 'соль')
+        ]
+        for number, user in enumerate(users * 2):
+            recipe = create_recipe(
+                user, f'Пирог {number}', text='Испечь.',
+                cooking_time=number + 10, image=f'recipes/{number}.png',
+                ingredients=[
+                    (ingredient, amount)
+                    for amount, ingredient in enumerate(ingredients, 1)
+                ]
+            )
+            Favorite.objects.create(user=users[0], recipe=recipe)
+            if number % 2:
+                ShoppingCart.objects.create(user=users[0], recipe=recipe)
+        Subscription.objects.create(user=users[0], author=users[1])
+
+    def test_responses_match(self):
+        """Ответы совпадают побайтно на всех сверяемых путях."""
+        context = get_context()
+        self.assertIsNotNone(context)
+        for path, equal, offset in check_parity(context, limit=10):
+            self.assertTrue(equal, f'{path}: расхождение с байта {offset}')
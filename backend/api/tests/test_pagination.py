@@ -0,0 +1,45 @@
+"""Тесты пагинации по курсору."""
+from django.test import TestCase
+from django.utils import timezone
+
+from recipes.models import Recipe
+from recipes.tests.factories import create_recipe, create_user
+
+
+class KeysetPaginationTest(TestCase):
+    """Тесты обхода списка рецептов по курсору."""
+
+    def setUp(self):
+        """Создает рецепты, часть которых опубликована одновременно."""
+        author = create_user('author')
+        recipes = [
+            create_recipe(author, f'Суп {number}') for number in range(7)
+        ]
+        Recipe.objects.filter(
+            id__lte=recipes[4].id
+        ).update(pub_date=timezone.now())
+
+    def test_pages_cover_recipes_once(self):
+        """Страницы по курсору проходят все рецепты по порядку."""
+        ids = []
+        url = '/api/recipes/?limit=2&cursor='
+        while url:
+            page = self.client.get(url).json()
+            ids.extend(recipe['id'] for recipe in page['results'])
+            url = page['next']
+        self.assertEqual(ids, list(Recipe.objects.order_by(
+            '-pub_date', '-id'
+        ).values_list('id', flat=True)))
+
+    def test_invalid_cursor(self):
+        """Курсор с неверными значениями дает 404."""
+        response = self.client.get('/api/recipes/?cursor=WyJ4IiwxXQ==')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_search(self):
+        """Курсор вместе с поиском по релевантности отклоняется."""
+        response = self.client.get('/api/recipes/?search=суп&cursor=')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.json())
+        response = self.client.get('/api/recipes/?search=суп')
+        self.assertEqual(response.status_code, 200)
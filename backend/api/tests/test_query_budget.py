@@ -0,0 +1,69 @@
+"""Тесты бюджета SQL-запросов на запрос к API."""
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from foodgram.middleware import QueryBudgetExceeded
+from recipes.tests.factories import (
+    create_ingredient, create_recipe, create_user, image_data_url
+)
+
+
+class QueryBudgetTest(TestCase):
+    """Тесты строгого режима QueryBudgetMiddleware."""
+
+    def setUp(self):
+        """Создает рецепт, каталог ингредиентов и автора."""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.author = create_user('author')
+        self.ingredients = [
+            create_ingredient(f'ингредиент {number}') for number in range(10)
+        ]
+        self.recipe = create_recipe(self.author)
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def test_strict_in_tests(self):
+        """Под manage.py test строгий режим включен."""
+        self.assertTrue(settings.SQL_BUDGET_STRICT)
+
+    @override_settings(SQL_BUDGETS={'GET recipes-list': 0})
+    def test_over_budget_raises(self):
+        """Превышение бюджета запросом к API поднимает исключение."""
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/api/recipes/')
+
+    def test_write_within_budget(self):
+        """Создание и изменение рецепта не зависят от числа ингредиентов."""
+        data = {
+            'name': 'Суп', 'text': 'Сварить.', 'cooking_time': 10,
+            'image': image_data_url(),
+            'ingredients': [
+                {'id': ingredient.id, 'amount': 1}
+                for ingredient in self.ingredients
+            ],
+        }
+        response = self.client.post('/api/recipes/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['ingredients']), 10)
+        response = self.client.patch(
+            f'/api/recipes/{self.recipe.id}/', data, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_ingredient(self):
+        """Несуществующий ингредиент отклоняется при проверке."""
+        response = self.client.post('/api/recipes/', {
+            'name': 'Суп', 'text': 'Сварить.', 'cooking_time': 10,
+            'image': image_data_url(),
+            'ingredients': [{'id': 0, 'amount': 1}],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ingredients', response.json())
@@ -0,0 +1,29 @@
+"""Тесты списка подписок."""
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.serializers.users import prefetch_top_recipes
+from recipes.tests.factories import create_user
+
+
+class SubscriptionsTest(TestCase):
+    """Тесты эндпоинта подписок пользователя."""
+
+    def setUp(self):
+        """Создает пользователя без подписок."""
+        self.user = create_user('reader')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_empty_subscriptions_with_recipes_limit(self):
+        """Пустая страница подписок с recipes_limit не падает."""
+        response = self.client.get(
+            '/api/users/subscriptions/?recipes_limit=3'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+
+    def test_prefetch_top_recipes_without_authors(self):
+        """Загрузка рецептов для пустого списка авторов ничего не делает."""
+        with self.assertNumQueries(0):
+            self.assertEqual(prefetch_top_recipes([], 3), [])
@@ -0,0 +1,123 @@
+"""Тесты ленты изменений избранного и списка покупок."""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.sync import encode_cursor
+from recipes.constants import TOMBSTONE_RETENTION_DAYS
+from recipes.models import Favorite, Recipe, ShoppingCart, Tombstone
+from recipes.tests.factories import create_recipe, create_user
+
+
+class ChangesTest(TestCase):
+    """Тесты эндпоинта /api/recipes/changes/."""
+
+    def setUp(self):
+        """Создает автора, читателя и рецепт в его списках."""
+        self.author = create_user('author')
+        self.reader = create_user('reader')
+        self.recipe = create_recipe(self.author)
+        Favorite.objects.create(user=self.reader, recipe=self.recipe)
+        ShoppingCart.objects.create(user=self.reader, recipe=self.recipe)
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def get_page(self, cursor='', limit=10):
+        """Запрашивает страницу изменений после курсора."""
+        response = self.client.get(
+            '/api/recipes/changes/', {'since': cursor, 'limit': limit}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def get_changes(self, cursor='', limit=10):
+        """Собирает все страницы изменений после курсора в одну."""
+        page = self.get_page(cursor, limit)
+        changes = page
+        while page['next']:
+            self.assertIsNone(page['cursor'])
+            page = self.get_page(page['next'], limit)
+            changes['recipes'] += page['recipes']
+            changes['deleted'] += page['deleted']
+            for name in ('favorites', 'shopping_cart'):
+                for key in ('added', 'removed'):
+                    changes[name][key] += page[name][key]
+        changes['cursor'] = page['cursor']
+        self.assertIsNotNone(changes['cursor'])
+        return changes
+
+    def test_snapshot(self):
+        """Без курсора отдается полный снимок списков."""
+        changes = self.get_changes()
+        self.assertTrue(changes['reset'])
+        self.assertEqual(
+            [recipe['id'] for recipe in changes['recipes']], [self.recipe.id]
+        )
+        self.assertEqual(changes['favorites']['added'], [self.recipe.id])
+
+    def test_recipe_deletion(self):
+        """Удаление рецепта попадает в ленту как удаление и убыль списков."""
+        cursor = self.get_changes()['cursor']
+        recipe_id = self.recipe.id
+        self.recipe.delete()
+        self.assertEqual(Tombstone.objects.count(), 3)
+        changes = self.get_changes(cursor)
+        self.assertEqual(changes['recipes'], [])
+        self.assertEqual(changes['deleted'], [recipe_id])
+        self.assertEqual(changes['favorites']['removed'], [recipe_id])
+        self.assertEqual(changes['shopping_cart']['removed'], [recipe_id])
+
+    def test_unfavorite(self):
+        """Удаление из избранного через API записывается в ленту."""
+        cursor = self.get_changes()['cursor']
+        response = self.client.delete(
+            f'/api/recipes/{self.recipe.id}/favorite/'
+        )
+        self.assertEqual(response.status_code, 204)
+        changes = self.get_changes(cursor)
+        self.assertEqual(changes['favorites']['removed'], [self.recipe.id])
+        self.assertEqual(changes['deleted'], [])
+
+    def test_pages(self):
+        """Лента отдается страницами по limit без пропусков и повторов."""
+        recipes = [self.recipe] + [
+            create_recipe(self.author, name=f'Рецепт {number}')
+            for number in range(4)
+        ]
+        Favorite.objects.bulk_create(
+            Favorite(user=self.reader, recipe=recipe)
+            for recipe in recipes[1:]
+        )
+        first = self.get_page(limit=2)
+        self.assertEqual(len(first['recipes']), 2)
+        self.assertIsNotNone(first['next'])
+        self.assertIsNone(first['cursor'])
+        changes = self.get_changes(limit=2)
+        ids = sorted(recipe.id for recipe in recipes)
+        self.assertEqual(
+            sorted(recipe['id'] for recipe in changes['recipes']), ids
+        )
+        self.assertEqual(sorted(changes['favorites']['added']), ids)
+        deleted = ids[1:3]
+        Recipe.objects.filter(pk__in=deleted).delete()
+        changes = self.get_changes(changes['cursor'], limit=1)
+        self.assertEqual(sorted(changes['deleted']), deleted)
+        self.assertEqual(sorted(changes['favorites']['removed']), deleted)
+
+    def test_expired_cursor(self):
+        """Курсор старше срока хранения удалений требует полного снимка."""
+        moment = timezone.now() - timedelta(days=TOMBSTONE_RETENTION_DAYS + 1)
+        response = self.client.get(
+            '/api/recipes/changes/',
+            {'since': encode_cursor({'since': moment.isoformat()})}
+        )
+        self.assertEqual(response.status_code, 410)
+
+    def test_invalid_cursor(self):
+        """Неверный курсор отклоняется."""
+        response = self.client.get(
+            '/api/recipes/changes/', {'since': 'не-курсор'}
+        )
+        self.assertEqual(response.status_code, 404)
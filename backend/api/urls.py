@@ -1,7 +1,12 @@
 """URLs для API."""
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from api.views.asynchronous import async_urls
+from api.views.tokens import (
+    TokenCreateView, TokenLogoutView, TokenRefreshView, TokenVerifyView
+)
 from api.views.users import UserViewSet
 from api.views.recipes import (
     IngredientViewSet, RecipeViewSet
@@ -12,7 +17,27 @@ router.register('users', UserViewSet, basename='users')
 router.register('ingredients', IngredientViewSet, basename='ingredients')
 router.register('recipes', RecipeViewSet, basename='recipes')
 
+router_urls = router.urls
+if settings.ASYNC_VIEWS:
+    router_urls = async_urls(router_urls, settings.ASYNC_VIEW_NAMES)
+
 urlpatterns = [
-    path('', include(router.urls)),
+    path('', include(router_urls)),
     path('auth/', include('djoser.urls.authtoken')),
 ]
+if settings.JWT_AUTH:
+    urlpatterns += [
+        path(
+            'auth/jwt/create/', TokenCreateView.as_view(), name='jwt-create'
+        ),
+        path(
+            'auth/jwt/refresh/', TokenRefreshView.as_view(),
+            name='jwt-refresh'
+        ),
+        path(
+            'auth/jwt/verify/', TokenVerifyView.as_view(), name='jwt-verify'
+        ),
+        path(
+            'auth/jwt/logout/', TokenLogoutView.as_view(), name='jwt-logout'
+        ),
+    ]
@@ -0,0 +1,47 @@
+"""Асинхронные обертки для представлений API, доступных на чтение.
+
+Используются при запуске через ASGI (настройка ASYNC_VIEWS): запросы
+на чтение выполняются в пуле потоков вместе с рендерингом ответа,
+не блокируя цикл событий, поэтому ответы совпадают с ответами
+синхронных представлений байт в байт.
+"""
+from asgiref.sync import sync_to_async
+from django.urls import URLPattern
+from rest_framework.permissions import SAFE_METHODS
+
+from foodgram.db import in_db_thread
+
+
+def async_view(view):
+    """Оборачивает синхронное представление DRF в асинхронное.
+
+    Безопасные методы выполняются в пуле потоков, а изменяющие
+    данные - в общем потоке синхронного кода, как обычно в Django.
+    """
+    def read(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    read = in_db_thread(read)
+    write = sync_to_async(view)
+
+    async def wrapper(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await read(request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    wrapper.csrf_exempt = True
+    return wrapper
+
+
+def async_urls(patterns, names):
+    """Заменяет представления маршрутов с указанными именами на async."""
+    return [
+        URLPattern(
+            pattern.pattern, async_view(pattern.callback),
+            pattern.default_args, pattern.name
+        ) if pattern.name in names else pattern
+        for pattern in patterns
+    ]
@@ -1,24 +1,44 @@
 """Представления для API рецептов."""
-from django.db.models import Sum
-from django.http import FileResponse
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Value
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from django.urls import reverse
 
+from recipes import shopping_list
+from recipes.search import ingredient_index
+from recipes.tombstones import record_removals
 from recipes.models import (
-    Ingredient, Recipe, IngredientInRecipe, Favorite, ShoppingCart
+    Ingredient, Recipe, IngredientInRecipe, Favorite, ShoppingCart,
+    Subscription
 )
 from api.serializers.recipes import (
     IngredientSerializer, RecipeListSerializer,
-    RecipeCreateUpdateSerializer, RecipeShortInfoSerializer
+    RecipeCreateUpdateSerializer, RecipeShortInfoSerializer,
+    RecipeImageSerializer
 )
 from api.permissions import IsAuthorOrReadOnly
 from api.pagination import FoodgramPagination
 from api.filters import RecipeFilter, IngredientFilter
+from api.cache import cached_response
+from api.catalog import JSON_MEDIA_TYPE, catalog_cache
+from api.conditional import (
+    NO_VALIDATORS, conditional_response, make_etag, version_queryset
+)
+from api.constants import RECIPE_FIELD_COLUMNS, SYNC_CURSOR_PARAM
+from api.fieldsets import SparseFieldsViewMixin
+from api.parsers import ImageUploadParser
+from api.renderers import PlainTextRenderer, CSVRenderer
+from api.shopping_list import render_shopping_list
+from api.sync import decode_cursor, get_changes
 
 
 class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
@@ -31,8 +51,22 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_class = IngredientFilter
     pagination_class = None
 
+    def list(self, request, *args, **kwargs):
+        """Ищет ингредиенты по индексу в памяти без запросов к БД.
+
+        Сначала идут совпадения по началу названия, затем по подстроке,
+        а при их отсутствии - названия, похожие на запрос с опечатками.
+        Весь каталог в JSON отдается готовым ответом (api.catalog).
+        """
+        name = request.query_params.get('name')
+        if name:
+            return Response(ingredient_index.search(name))
+        if request.accepted_media_type == JSON_MEDIA_TYPE:
+            return catalog_cache.get().response(request)
+        return Response(ingredient_index.all())
+
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """Представление для работы с рецептами."""
 
     queryset = Recipe.objects.all()
@@ -40,6 +74,55 @@ class RecipeViewSet(viewsets.ModelViewSet):
     pagination_class = FoodgramPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
+    cursor_ordering = ('-pub_date', '-id')
+    image_field = 'image'
+
+    def get_queryset(self):
+        """Возвращает рецепты с автором, ингредиентами и флагами.
+
+        Флаги избранного, списка покупок и подписки на автора считаются
+        подзапросами Exists, поэтому страница любого размера
+        отдается за фиксированное число запросов. Поля, исключенные
+        параметрами fields и omit, не загружаются.
+        """
+        user = self.request.user
+        recipes = self.defer_omitted(
+            Recipe.objects.defer('search_document'), RECIPE_FIELD_COLUMNS
+        )
+        if self.is_requested('author'):
+            recipes = recipes.select_related('author')
+        if self.is_requested('ingredients'):
+            recipes = recipes.prefetch_related(
+                Prefetch(
+                    'ingredients_in_recipes',
+                    queryset=IngredientInRecipe.objects.select_related(
+                        'ingredient'
+                    )
+                )
+            )
+        if user.is_authenticated:
+            flags = {
+                'is_favorited': Exists(Favorite.objects.filter(
+                    user=user, recipe=OuterRef('pk')
+                )),
+                'is_in_shopping_cart': Exists(ShoppingCart.objects.filter(
+                    user=user, recipe=OuterRef('pk')
+                )),
+                'author_is_subscribed': Exists(Subscription.objects.filter(
+                    user=user, author=OuterRef('author')
+                )),
+            }
+        else:
+            flags = dict.fromkeys((
+                'is_favorited', 'is_in_shopping_cart',
+                'author_is_subscribed'
+            ), Value(False))
+        # Флаг подписки нужен только вложенному автору.
+        flag_fields = {'author_is_subscribed': 'author'}
+        return recipes.annotate(**{
+            name: flag for name, flag in flags.items()
+            if self.is_requested(flag_fields.get(name, name))
+        })
 
     def get_serializer_class(self):
         """Возвращает сериализатор в зависимости от действия."""
@@ -47,6 +130,81 @@ class RecipeViewSet(viewsets.ModelViewSet):
             return RecipeCreateUpdateSerializer
         return RecipeListSerializer
 
+    def list(self, request, *args, **kwargs):
+        """Возвращает список рецептов, для анонимов - из кэша."""
+        return cached_response(
+            self, request, lambda: conditional_response(
+                self, request, self.get_list_validators,
+                lambda: super(RecipeViewSet, self).list(
+                    request, *args, **kwargs
+                )
+            )
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """Возвращает рецепт, для анонимов - из кэша."""
+        return cached_response(
+            self, request, lambda: conditional_response(
+                self, request, self.get_detail_validators,
+                lambda: super(RecipeViewSet, self).retrieve(
+                    request, *args, **kwargs
+                )
+            ),
+            pk=kwargs[self.lookup_field]
+        )
+
+    def get_validators(self, recipes, state=()):
+        """Возвращает ETag и дату изменения ответа с рецептами.
+
+        Дата изменения отдается только анонимам для одного рецепта.
+        """
+        last_modified = None
+        if (
+            self.action == 'retrieve'
+            and not self.request.user.is_authenticated
+        ):
+            last_modified = recipes[0].updated_at
+        return make_etag(self.request, recipes, state), last_modified
+
+    def get_list_validators(self):
+        """Возвращает валидаторы страницы списка по колонкам версий.
+
+        Страница и число рецептов выбираются одним запросом; если
+        ETag не совпал, полный ответ использует уже посчитанное число.
+        """
+        result = self.paginator.paginate_versions(
+            version_queryset(self.filter_queryset(self.get_queryset())),
+            self.request, view=self
+        )
+        if result is None:
+            return NO_VALIDATORS
+        return self.get_validators(*result)
+
+    def get_detail_validators(self):
+        """Возвращает валидаторы рецепта по колонкам версий."""
+        pk = self.kwargs[self.lookup_field]
+        if not str(pk).isdigit():
+            return NO_VALIDATORS
+        recipe = version_queryset(self.get_queryset()).filter(pk=pk).first()
+        if recipe is None:
+            return NO_VALIDATORS
+        return self.get_validators([recipe])
+
+    def paginate_queryset(self, queryset):
+        """Возвращает страницу и запоминает ее валидаторы."""
+        page = super().paginate_queryset(queryset)
+        self.validators = self.get_validators(
+            page, self.paginator.get_page_state()
+        )
+        return page
+
+    def get_object(self):
+        """Возвращает рецепт и запоминает валидаторы для его просмотра."""
+        recipe = super().get_object()
+        if self.action == 'retrieve':
+            self.validators = self.get_validators([recipe])
+        return recipe
+
     def perform_create(self, serializer):
         """Создает рецепт с текущим пользователем в качестве автора."""
         serializer.save(author=self.request.user)
@@ -57,9 +215,12 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
         if request.method == 'POST':
             recipe = get_object_or_404(Recipe, id=pk)
-            relation, created = model.objects.get_or_create(
-                user=user, recipe=recipe
-            )
+            with transaction.atomic():
+                relation, created = model.objects.get_or_create(
+                    user=user, recipe=recipe
+                )
+                if created and model is ShoppingCart:
+                    shopping_list.add_recipe(user.id, recipe.id)
 
             if not created:
                 verbose_name = model._meta.verbose_name.lower()
@@ -74,9 +235,33 @@ class RecipeViewSet(viewsets.ModelViewSet):
             )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-        model.objects.filter(user=user, recipe_id=pk).delete()
+        with transaction.atomic():
+            relations = model.objects.filter(user=user, recipe_id=pk)
+            record_removals(relations)
+            deleted, _ = relations.delete()
+            if deleted and model is ShoppingCart:
+                shopping_list.remove_recipe(user.id, pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(
+        detail=True,
+        methods=['put'],
+        parser_classes=[ImageUploadParser, MultiPartParser, JSONParser]
+    )
+    def image(self, request, pk=None):
+        """Заменяет изображение рецепта.
+
+        Изображение передается телом запроса (Content-Type image/*),
+        полем image в multipart/form-data или строкой base64 в JSON.
+        """
+        recipe = self.get_object()
+        serializer = RecipeImageSerializer(
+            recipe, data=request.data, context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
     @action(
         detail=True,
         methods=['get'],
@@ -115,48 +300,45 @@ class RecipeViewSet(viewsets.ModelViewSet):
     @action(
         detail=False,
         methods=['get'],
-        permission_classes=[IsAuthenticated]
+        permission_classes=[IsAuthenticated],
+        renderer_classes=[PlainTextRenderer, CSVRenderer, JSONRenderer]
     )
     def download_shopping_cart(self, request):
-        """Скачивает список покупок в формате TXT."""
-        from datetime import datetime
+        """Скачивает список покупок в формате TXT, CSV или JSON.
 
-        user = request.user
-        ingredients = IngredientInRecipe.objects.filter(
-            recipe__shoppingcart__user=user
-        ).values(
-            'ingredient__name',
-            'ingredient__measurement_unit'
-        ).annotate(total_amount=Sum('amount')).order_by('ingredient__name')
-
-        recipes = Recipe.objects.filter(
-            shoppingcart__user=user
-        ).select_related('author').order_by('name')
-
-        current_date = datetime.now().strftime('%d.%m.%Y %H:%M')
-
-        shopping_list = '\n'.join([
-            f'Список покупок для {user.username}',
-            f'Дата составления: {current_date}',
-            '',
-            'Продукты:',
-            *[
-                f"{i}. {item['ingredient__name'].capitalize()} "
-                f"({item['ingredient__measurement_unit']}) - "
-                f"{item['total_amount']}"
-                for i, item in enumerate(ingredients, start=1)
-            ],
-            '',
-            'Рецепты:',
-            *[
-                f'{i}. {recipe.name} (Автор: {recipe.author.username})'
-                for i, recipe in enumerate(recipes, start=1)
-            ],
-        ])
-
-        return FileResponse(
-            shopping_list,
-            as_attachment=True,
-            filename='shopping_list.txt',
-            content_type='text/plain'
+        Формат выбирается параметром format (txt по умолчанию)
+        или заголовком Accept, файл отдается потоково.
+        """
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            render_shopping_list(request.user, renderer.format),
+            content_type=f'{renderer.media_type}; charset=utf-8'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="shopping_list.{renderer.format}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[IsAuthenticated]
+    )
+    def changes(self, request):
+        """Возвращает страницу изменений избранного и списка покупок.
+
+        Курсоры next и cursor из ответа передаются параметром since
+        в следующий запрос, размер страницы - параметром limit;
+        подробности в api.sync.
+        """
+        changes = get_changes(
+            self.get_queryset(), request.user,
+            decode_cursor(
+                request.query_params.get(SYNC_CURSOR_PARAM), timezone.now()
+            ),
+            FoodgramPagination().get_page_size(request)
         )
+        changes['recipes'] = self.get_serializer(
+            changes['recipes'], many=True
+        ).data
+        return Response(changes)
@@ -0,0 +1,46 @@
+"""Представления для аутентификации по JWT.
+
+Повторяют пути djoser.urls.jwt (jwt/create, jwt/refresh, jwt/verify)
+и добавляют jwt/logout для отзыва токенов.
+"""
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenViewBase
+
+from api.authentication import StatelessJWTAuthentication, revoke_token
+from api.serializers.tokens import (
+    TokenCreateSerializer, TokenLogoutSerializer, TokenRefreshSerializer,
+    TokenVerifySerializer
+)
+
+
+class TokenCreateView(TokenViewBase):
+    """Выдает пару токенов по email и паролю."""
+
+    serializer_class = TokenCreateSerializer
+
+
+class TokenRefreshView(TokenViewBase):
+    """Обменивает refresh-токен на новую пару токенов."""
+
+    serializer_class = TokenRefreshSerializer
+
+
+class TokenVerifyView(TokenViewBase):
+    """Проверяет, что токен действителен и не отозван."""
+
+    serializer_class = TokenVerifySerializer
+
+
+class TokenLogoutView(TokenViewBase):
+    """Отзывает refresh-токен и access-токен текущего запроса."""
+
+    authentication_classes = (StatelessJWTAuthentication,)
+    serializer_class = TokenLogoutSerializer
+
+    def post(self, request, *args, **kwargs):
+        """Отзывает токены и возвращает пустой ответ."""
+        super().post(request, *args, **kwargs)
+        if request.auth is not None:
+            revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
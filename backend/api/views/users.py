@@ -1,28 +1,70 @@
 """Представления для работы с пользователями."""
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, Value
 from django.shortcuts import get_object_or_404
 from djoser.views import UserViewSet as DjoserUserViewSet
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from api.authentication import load_user
+from api.constants import USER_FIELD_COLUMNS
+from api.fieldsets import SparseFieldsViewMixin
 from api.serializers.users import (
     UserSerializer, SetAvatarSerializer,
-    UserWithRecipesSerializer
+    UserWithRecipesSerializer, get_recipes_limit, prefetch_top_recipes
 )
 from api.pagination import FoodgramPagination
+from api.parsers import ImageUploadParser
 from recipes.models import Subscription
+from recipes.tasks import delete_user
 
 User = get_user_model()
 
 
-class UserViewSet(DjoserUserViewSet):
+class UserViewSet(SparseFieldsViewMixin, DjoserUserViewSet):
     """Представление для работы с пользователями."""
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
     pagination_class = FoodgramPagination
+    cursor_ordering = ('username', 'id')
+    image_field = 'avatar'
+
+    def get_queryset(self):
+        """Возвращает пользователей с флагом подписки текущего пользователя.
+
+        Поля, исключенные параметрами fields и omit, не загружаются.
+        """
+        users = self.defer_omitted(super().get_queryset(), USER_FIELD_COLUMNS)
+        user = self.request.user
+        if not self.is_requested('is_subscribed'):
+            return users
+        if not user.is_authenticated:
+            return users.annotate(is_subscribed=Value(False))
+        return users.annotate(is_subscribed=Exists(
+            Subscription.objects.filter(user=user, author=OuterRef('pk'))
+        ))
+
+    def perform_destroy(self, user):
+        """Деактивирует пользователя и удаляет его в фоновой задаче.
+
+        Каскадное удаление рецептов, подписок и списков покупок
+        выполняет воркер очереди, а не обработчик запроса.
+        """
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        delete_user.delay(user.id)
+
+    def get_instance(self):
+        """Возвращает текущего пользователя со всеми полями.
+
+        При аутентификации по JWT часть полей пользователя
+        не загружена - они читаются из БД одним запросом.
+        """
+        return load_user(self.request.user)
 
     @action(
         detail=False,
@@ -37,10 +79,15 @@ class UserViewSet(DjoserUserViewSet):
         detail=False,
         methods=['put', 'delete'],
         permission_classes=[IsAuthenticated],
+        parser_classes=[JSONParser, MultiPartParser, ImageUploadParser],
         url_path='me/avatar'
     )
     def avatar(self, request):
-        """Обновляет или удаляет аватар пользователя."""
+        """Обновляет или удаляет аватар пользователя.
+
+        Аватар передается строкой base64 в JSON, полем avatar
+        в multipart/form-data или телом запроса (Content-Type image/*).
+        """
         if request.method == 'PUT':
             if 'avatar' not in request.data:
                 return Response(
@@ -64,8 +111,8 @@ class UserViewSet(DjoserUserViewSet):
             )
         if request.method == 'DELETE':
             if request.user.avatar:
-                request.user.avatar.delete()
                 request.user.avatar = None
+                request.user.avatar_variants = {}
                 request.user.save()
             return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -103,6 +150,8 @@ class UserViewSet(DjoserUserViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        author.is_subscribed = True
+        prefetch_top_recipes([author], get_recipes_limit(request))
         serializer = UserWithRecipesSerializer(
             author, context={'request': request}
         )
@@ -115,13 +164,22 @@ class UserViewSet(DjoserUserViewSet):
     )
     def subscriptions(self, request):
         """Возвращает подписки текущего пользователя."""
-        subscriptions = User.objects.filter(
-            subscriptions_from_authors__user=request.user
+        serializer_class = UserWithRecipesSerializer
+        subscriptions = self.defer_omitted(
+            User.objects.filter(
+                subscriptions_from_authors__user=request.user
+            ).annotate(is_subscribed=Value(True)),
+            USER_FIELD_COLUMNS, serializer_class
         )
         paginated_queryset = self.paginate_queryset(subscriptions)
+        if self.is_requested('recipes', serializer_class):
+            prefetch_top_recipes(
+                paginated_queryset, get_recipes_limit(request)
+            )
 
-        serializer = UserWithRecipesSerializer(
-            paginated_queryset, many=True, context={'request': request}
+        serializer = serializer_class(
+            paginated_queryset, many=True, context={'request': request},
+            fields=self.get_sparse_fields(serializer_class)
         )
 
         return self.get_paginated_response(serializer.data)
@@ -0,0 +1,21 @@
+"""Вызов синхронного кода с ORM из асинхронных представлений."""
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def in_db_thread(func):
+    """Возвращает корутину, выполняющую func в пуле потоков.
+
+    В Django 3.2 нет асинхронного ORM, а sync_to_async по умолчанию
+    выполняет весь синхронный код ASGI-воркера по очереди в одном
+    общем потоке. Здесь запросы разных клиентов идут параллельно
+    в потоках пула, каждый со своим соединением с БД, которое после
+    вызова закрывается или сохраняется по правилам CONN_MAX_AGE,
+    как в конце обычного запроса.
+    """
+    def call(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(call, thread_sensitive=False)
@@ -0,0 +1,166 @@
+"""Middleware проекта foodgram."""
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('foodgram.sql')
+
+current_stats = ContextVar('query_stats', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Запрос к API выполнил больше SQL-запросов, чем разрешено."""
+
+
+class QueryStats:
+    """Счетчик SQL-запросов, выполненных за время обработки запроса."""
+
+    def __init__(self):
+        """Создает пустой счетчик."""
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Выполняет SQL-запрос, замеряя время выполнения."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        """Возвращает повторявшиеся запросы и число их выполнений."""
+        return {
+            sql: times for sql, times in self.statements.items() if times > 1
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    """Передает SQL-запрос счетчику текущего HTTP-запроса, если он есть."""
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def track_queries(connection, **kwargs):
+    """Подключает подсчет запросов к соединению с БД.
+
+    Счетчик берется из контекстной переменной, поэтому запросы
+    считаются в любом потоке, куда передан контекст HTTP-запроса,
+    в том числе в потоках sync_to_async асинхронных представлений.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(track_queries)
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы каждого запроса и сверяет их с бюджетом.
+
+    Число запросов и их суммарное время отдаются в заголовках
+    X-DB-Queries и X-DB-Time (если включен SQL_BUDGET_HEADERS).
+    Превышение бюджета представления пишется в лог, а в строгом
+    режиме (SQL_BUDGET_STRICT) для запросов к API поднимается
+    QueryBudgetExceeded. Работает как в WSGI, так и в ASGI
+    без переключения асинхронных запросов в синхронный поток.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Сохраняет следующий обработчик цепочки."""
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        """Обрабатывает запрос, подсчитывая SQL-запросы."""
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        track_queries(connection)
+        stats = QueryStats()
+        token = current_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.process_response(request, response, stats)
+
+    async def __acall__(self, request):
+        """Обрабатывает запрос в асинхронной цепочке middleware."""
+        stats = QueryStats()
+        token = current_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.process_response(request, response, stats)
+
+    def process_response(self, request, response, stats):
+        """Добавляет заголовки со статистикой и проверяет бюджет."""
+        if getattr(settings, 'SQL_BUDGET_HEADERS', False):
+            response['X-DB-Queries'] = str(stats.count)
+            response['X-DB-Time'] = f'{stats.duration * 1000:.2f}ms'
+            response['X-DB-Duplicates'] = str(
+                sum(stats.duplicates.values())
+            )
+
+        self.check_budget(request, stats)
+        return response
+
+    def get_budget(self, request):
+        """Возвращает имя представления и его бюджет запросов.
+
+        Бюджет ищется сначала по ключу '<METHOD> <view_name>',
+        затем по view_name, иначе берется SQL_BUDGET_DEFAULT.
+        """
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        budgets = getattr(settings, 'SQL_BUDGETS', {})
+        budget = budgets.get(
+            f'{request.method} {view_name}',
+            budgets.get(
+                view_name, getattr(settings, 'SQL_BUDGET_DEFAULT', None)
+            )
+        )
+        return view_name, budget
+
+    def check_budget(self, request, stats):
+        """Логирует превышение бюджета и падает в строгом режиме."""
+        view_name, budget = self.get_budget(request)
+        if budget is None or stats.count <= budget:
+            return
+
+        duplicates = stats.duplicates
+        message = (
+            f'{request.method} {request.path} ({view_name}): '
+            f'{stats.count} SQL-запросов при бюджете {budget}, '
+            f'{stats.duration * 1000:.2f}ms, '
+            f'повторов: {sum(duplicates.values())}'
+        )
+        if duplicates:
+            sql, times = max(duplicates.items(), key=lambda item: item[1])
+            message += f'; чаще всего ({times} раз): {sql}'
+        logger.warning(message)
+
+        if (
+            getattr(settings, 'SQL_BUDGET_STRICT', False)
+            and request.path.startswith(
+                getattr(settings, 'SQL_BUDGET_STRICT_PREFIX', '/api/')
+            )
+        ):
+            raise QueryBudgetExceeded(message)
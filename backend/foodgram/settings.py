@@ -10,8 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from datetime import timedelta
 from pathlib import Path
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -46,12 +48,14 @@ INSTALLED_APPS = [
     'djoser',
     'api',
     'recipes',
+    'tasks',
     'django_filters',
     'corsheaders',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'foodgram.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware
     'django.middleware.common.CommonMiddleware',
@@ -112,6 +116,31 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Бэкенд задается через CACHE_BACKEND/CACHE_LOCATION. LocMemCache живет
+# внутри одного процесса, поэтому при нескольких воркерах нужен общий
+# бэкенд (файловый, memcached, redis).
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache' if DEBUG
+            else 'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION',
+            'foodgram' if DEBUG else '/tmp/foodgram_cache'
+        ),
+    }
+}
+
+# Кэш ответов API рецептов для анонимных пользователей (api.cache)
+RECIPES_CACHE_ALIAS = 'default'
+RECIPES_CACHE_TIMEOUT = int(os.getenv('RECIPES_CACHE_TIMEOUT', 300))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -163,6 +192,11 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+DEFAULT_FILE_STORAGE = 'foodgram.storage.ContentAddressedStorage'
+# Загрузки больше этого размера пишутся во временный файл, а не в память.
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(
+    os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', 256 * 1024)
+)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -171,6 +205,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'recipes.User'
 
+# Аутентификация по подписанным JWT (api.authentication) без обращения
+# к БД на каждый запрос. Токены DRF при этом продолжают работать.
+JWT_AUTH = os.getenv('JWT_AUTH', 'False') == 'True'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
@@ -181,6 +219,24 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'api.pagination.FoodgramPagination',
     'PAGE_SIZE': 10,
 }
+if JWT_AUTH:
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'].insert(
+        0, 'api.authentication.StatelessJWTAuthentication'
+    )
+
+# Быстрый путь сериализации ответов на чтение (api.serializers.fast)
+FAST_SERIALIZERS = os.getenv('FAST_SERIALIZERS', 'True') == 'True'
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(
+        minutes=int(os.getenv('JWT_ACCESS_MINUTES', 5))
+    ),
+    'REFRESH_TOKEN_LIFETIME': timedelta(
+        days=int(os.getenv('JWT_REFRESH_DAYS', 7))
+    ),
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'SIGNING_KEY': SECRET_KEY,
+}
 
 DJOSER = {
     'LOGIN_FIELD': 'email',
@@ -210,3 +266,36 @@ DJOSER = {
     },
     'HIDE_USERS': False,
 }
+
+# Бюджет SQL-запросов на один HTTP-запрос
+# (foodgram.middleware.QueryBudgetMiddleware).
+# Ключ - '<METHOD> <view_name>' или view_name из resolver_match,
+# значение - допустимое число запросов с учетом аутентификации по токену.
+SQL_BUDGET_HEADERS = os.getenv('SQL_BUDGET_HEADERS', str(DEBUG)) == 'True'
+# В тестах (manage.py test) превышение бюджета роняет запрос.
+TESTING = sys.argv[1:2] == ['test']
+SQL_BUDGET_STRICT = os.getenv('SQL_BUDGET_STRICT', str(TESTING)) == 'True'
+SQL_BUDGET_STRICT_PREFIX = '/api/'
+SQL_BUDGET_DEFAULT = 20
+SQL_BUDGETS = {
+    'GET recipes-list': 5,
+    'GET recipes-detail': 4,
+    'GET ingredients-list': 2,
+    'GET ingredients-detail': 2,
+    'GET users-list': 4,
+    'GET users-subscriptions': 5,
+    'POST users-subscribe': 10,
+}
+
+# Очередь фоновых задач (приложение tasks). При TASKS_EAGER задачи
+# выполняются в процессе веб-сервера сразу после коммита, без воркеров.
+TASKS_EAGER = os.getenv('TASKS_EAGER', str(DEBUG)) == 'True'
+
+# Асинхронные представления на чтение (api.views.asynchronous).
+# Включаются по умолчанию при запуске через foodgram.asgi.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+ASYNC_VIEW_NAMES = (
+    'recipes-list',
+    'recipes-detail',
+    'ingredients-list',
+)
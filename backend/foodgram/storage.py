@@ -0,0 +1,44 @@
+"""Хранилище медиафайлов проекта foodgram."""
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+from recipes.constants import HASH_CHUNK_SIZE
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Файловое хранилище с именами файлов по хешу содержимого.
+
+    Файл сохраняется как <каталог>/<2 символа хеша>/<sha256>.<расширение>,
+    одинаковое содержимое записывается один раз. Содержимое файла
+    по имени никогда не меняется, поэтому медиа можно отдавать
+    с бессрочными заголовками кэширования. Файлы без ссылок
+    удаляет команда collect_media_garbage.
+    """
+
+    def save(self, name, content, max_length=None):
+        """Сохраняет файл под именем из хеша, если его еще нет."""
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            return super().save(name, content, max_length)
+
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        content.seek(0)
+
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        hexdigest = digest.hexdigest()
+        name = os.path.join(
+            directory, hexdigest[:2], f'{hexdigest}{extension}'
+        ).replace('\\', '/')
+        if self.exists(name):
+            # Свежая дата изменения защищает файл, снова получивший
+            # ссылку, от collect_media_garbage (параметр --min-age).
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length)
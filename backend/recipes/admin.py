@@ -4,12 +4,16 @@ from django.contrib.admin import SimpleListFilter
 from django.utils.safestring import mark_safe
 from django.db.models import Min, Max
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db import transaction
 
 from recipes.models import (
     Ingredient, Recipe, IngredientInRecipe, Favorite, ShoppingCart,
     User, Subscription
 )
 from recipes.constants import MIN_INGREDIENTS_IN_RECIPE, EXTRA_INGREDIENT_FORMS
+from recipes.shopping_list import apply_carts, apply_recipe
+from recipes.tasks import save_variants
+from recipes.tombstones import record_removals
 
 
 class IngredientInRecipeInline(admin.TabularInline):
@@ -210,6 +214,12 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        """Сохраняет пользователя и пересобирает варианты нового аватара."""
+        super().save_model(request, obj, form, change)
+        if 'avatar' in form.changed_data:
+            save_variants(obj, 'avatar', 'avatar_variants')
+
     @admin.display(description='ФИО')
     def get_full_name_display(self, user):
         """Возвращает полное имя пользователя."""
@@ -223,20 +233,20 @@ class UserAdmin(BaseUserAdmin):
             return f'<img src="{user.avatar.url}" width="50" height="50" />'
         return 'Нет аватара'
 
-    @admin.display(description='Рецептов')
+    @admin.display(description='Рецептов', ordering='recipes_count')
     def get_recipes_count(self, user):
         """Возвращает количество рецептов пользователя."""
-        return user.recipes.count()
+        return user.recipes_count
 
-    @admin.display(description='Подписок')
+    @admin.display(description='Подписок', ordering='subscriptions_count')
     def get_subscriptions_count(self, user):
         """Возвращает количество подписок пользователя."""
-        return user.subscriptions.count()
+        return user.subscriptions_count
 
-    @admin.display(description='Подписчиков')
+    @admin.display(description='Подписчиков', ordering='subscribers_count')
     def get_subscribers_count(self, user):
         """Возвращает количество подписчиков пользователя."""
-        return user.subscriptions_from_authors.count()
+        return user.subscribers_count
 
 
 @admin.register(Ingredient)
@@ -266,10 +276,18 @@ class RecipeAdmin(admin.ModelAdmin):
     inlines = (IngredientInRecipeInline,)
     readonly_fields = ('favorites_count', 'get_ingredients', 'get_image')
 
-    @admin.display(description='В избранном')
-    def favorites_count(self, recipe):
-        """Возвращает количество добавлений рецепта в избранное."""
-        return recipe.favorite.count()
+    def save_model(self, request, obj, form, change):
+        """Сохраняет рецепт и пересобирает варианты нового изображения."""
+        super().save_model(request, obj, form, change)
+        if 'image' in form.changed_data:
+            save_variants(obj, 'image', 'image_variants')
+
+    def save_related(self, request, form, formsets, change):
+        """Сохраняет ингредиенты и обновляет производные данные рецепта."""
+        apply_recipe(form.instance.pk, -1)
+        super().save_related(request, form, formsets, change)
+        apply_recipe(form.instance.pk, 1)
+        form.instance.refresh_search_document()
 
     @admin.display(description='Ингредиенты')
     @mark_safe
@@ -299,6 +317,30 @@ class UserRecipeRelationAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'recipe__name')
     list_filter = ('user',)
 
+    def save_model(self, request, obj, form, change):
+        """Сохраняет связь, обновляя агрегат списка покупок."""
+        with transaction.atomic():
+            if change and self.model is ShoppingCart:
+                apply_carts(self.model.objects.filter(pk=obj.pk), -1)
+            super().save_model(request, obj, form, change)
+            if self.model is ShoppingCart:
+                apply_carts(self.model.objects.filter(pk=obj.pk), 1)
+
+    def delete_model(self, request, obj):
+        """Удаляет связь, запоминая удаление для ленты изменений."""
+        self.delete_queryset(request, self.model.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        """Удаляет связи, запоминая удаление для ленты изменений.
+
+        Из списков покупок ингредиенты вычитаются до удаления.
+        """
+        with transaction.atomic():
+            record_removals(queryset)
+            if self.model is ShoppingCart:
+                apply_carts(queryset, -1)
+            queryset.delete()
+
 
 @admin.register(Subscription)
 class SubscriptionAdmin(admin.ModelAdmin):
@@ -0,0 +1,201 @@
+"""Синхронизация каталога ингредиентов с файлом CSV или JSON.
+
+Ингредиент определяется парой (название, единица измерения), как
+в ограничении уникальности модели: новые пары добавляются,
+совпадающие пропускаются, а с флагом prune удаляются ингредиенты,
+которых нет в файле и которые не используются в рецептах
+и списках покупок. Единица существующего ингредиента никогда
+не меняется - иначе изменился бы смысл количеств в рецептах:
+смена единицы в файле добавляет новый ингредиент, а старый
+удаляется при prune, если не используется. Файл читается
+потоково; на PostgreSQL строки загружаются через COPY во временную
+таблицу и сравниваются с каталогом на стороне СУБД.
+"""
+import csv
+import io
+import json
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+
+from recipes.constants import CATALOG_READ_SIZE, CATALOG_BATCH_SIZE
+from recipes.models import Ingredient, IngredientInRecipe, ShoppingListItem
+
+STAGING_TABLE = 'ingredient_sync'
+
+
+def iter_csv(file):
+    """Возвращает итератор по парам (название, единица) из CSV."""
+    for row in csv.reader(file):
+        if len(row) == 2:
+            yield row[0].strip(), row[1].strip()
+
+
+def iter_json(file):
+    """Возвращает итератор по парам из JSON-массива, читая его порциями.
+
+    Пустой файл считается пустым каталогом.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    while True:
+        chunk = file.read(CATALOG_READ_SIZE)
+        buffer = buffer[position:] + chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position == len(buffer):
+                break
+            if not started:
+                if buffer[position] != '[':
+                    raise ValueError('Ожидается JSON-массив ингредиентов.')
+                started = True
+                position += 1
+                continue
+            if buffer[position] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if not chunk:
+                    raise
+                break
+            yield item['name'].strip(), item['measurement_unit'].strip()
+        if not chunk:
+            if started:
+                raise ValueError('JSON-массив ингредиентов не закрыт.')
+            return
+
+
+READERS = {
+    'csv': iter_csv,
+    'json': iter_json,
+}
+
+
+class RowsReader(io.TextIOBase):
+    """Файлоподобный объект, отдающий строки CSV для COPY."""
+
+    def __init__(self, rows):
+        """Сохраняет итератор по кортежам значений строк."""
+        self.rows = rows
+        self.buffer = ''
+
+    def readable(self):
+        """Сообщает, что объект доступен для чтения."""
+        return True
+
+    def read(self, size=-1):
+        """Возвращает очередную порцию CSV."""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        while size < 0 or len(self.buffer) < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            writer.writerow(row)
+            self.buffer += output.getvalue()
+            output.seek(0)
+            output.truncate()
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def unused_ingredients():
+    """Возвращает ингредиенты, не используемые в рецептах."""
+    return Ingredient.objects.filter(
+        ~Exists(IngredientInRecipe.objects.filter(
+            ingredient=OuterRef('pk')
+        )),
+        ~Exists(ShoppingListItem.objects.filter(ingredient=OuterRef('pk'))),
+    )
+
+
+def sync_python(rows, prune):
+    """Сравнивает каталог с файлом в Python (SQLite и др.)."""
+    catalog = dict.fromkeys(rows)
+    existing = {
+        (name, unit): pk for pk, name, unit in
+        Ingredient.objects.values_list('id', 'name', 'measurement_unit')
+    }
+    new = [
+        Ingredient(name=name, measurement_unit=unit)
+        for name, unit in catalog if (name, unit) not in existing
+    ]
+    Ingredient.objects.bulk_create(new, batch_size=CATALOG_BATCH_SIZE)
+    stats = {'total': len(catalog), 'inserted': len(new), 'deleted': 0}
+
+    if prune:
+        obsolete = [pk for key, pk in existing.items() if key not in catalog]
+        stats['deleted'], _ = unused_ingredients().filter(
+            pk__in=obsolete
+        ).delete()
+    return stats
+
+
+def sync_postgresql(rows, prune):
+    """Сравнивает каталог с файлом через COPY во временную таблицу."""
+    table = Ingredient._meta.db_table
+    usage = IngredientInRecipe._meta.db_table
+    shopping = ShoppingListItem._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE {STAGING_TABLE} '
+            '(name text, measurement_unit text) ON COMMIT DROP'
+        )
+        cursor.copy_expert(
+            f'COPY {STAGING_TABLE} (name, measurement_unit) '
+            'FROM STDIN WITH (FORMAT csv)',
+            RowsReader(rows)
+        )
+        cursor.execute(
+            f'DELETE FROM {STAGING_TABLE} s USING {STAGING_TABLE} d '
+            'WHERE s.name = d.name '
+            'AND s.measurement_unit = d.measurement_unit AND s.ctid < d.ctid'
+        )
+        cursor.execute(f'SELECT count(*) FROM {STAGING_TABLE}')
+        stats = {'total': cursor.fetchone()[0], 'deleted': 0}
+
+        cursor.execute(
+            f'INSERT INTO {table} (name, measurement_unit) '
+            f'SELECT s.name, s.measurement_unit FROM {STAGING_TABLE} s '
+            f'WHERE NOT EXISTS (SELECT 1 FROM {table} i '
+            'WHERE i.name = s.name '
+            'AND i.measurement_unit = s.measurement_unit) '
+            'ON CONFLICT DO NOTHING'
+        )
+        stats['inserted'] = cursor.rowcount
+        if prune:
+            cursor.execute(
+                f'DELETE FROM {table} i WHERE NOT EXISTS ('
+                f'SELECT 1 FROM {STAGING_TABLE} s WHERE s.name = i.name '
+                'AND s.measurement_unit = i.measurement_unit) '
+                f'AND NOT EXISTS (SELECT 1 FROM {usage} u '
+                'WHERE u.ingredient_id = i.id) '
+                f'AND NOT EXISTS (SELECT 1 FROM {shopping} l '
+                'WHERE l.ingredient_id = i.id)'
+            )
+            stats['deleted'] = cursor.rowcount
+    return stats
+
+
+def sync_catalog(file, file_format, prune=False, dry_run=False):
+    """Синхронизирует каталог с файлом и возвращает статистику.
+
+    Статистика содержит total, inserted, deleted и skipped.
+    """
+    rows = READERS[file_format](file)
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            stats = sync_postgresql(rows, prune)
+        else:
+            stats = sync_python(rows, prune)
+        if dry_run:
+            transaction.set_rollback(True)
+    stats['skipped'] = stats['total'] - stats['inserted']
+    return stats
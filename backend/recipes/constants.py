@@ -17,3 +17,61 @@ FIRST_NAME_MAX_LENGTH = 150
 LAST_NAME_MAX_LENGTH = 150
 
 USERNAME_REGEX = r'^[\w.@+-]+$'
+
+# Константы поискового индекса ингредиентов
+TRIGRAM_SIZE = 3
+INGREDIENT_FUZZY_THRESHOLD = 0.5
+INGREDIENT_FUZZY_LIMIT = 20
+
+# Константы полнотекстового поиска рецептов
+SEARCH_CONFIG = 'russian'
+MAX_SEARCH_WORDS = 10
+SEARCH_DOCUMENT_BATCH_SIZE = 1000
+
+# Константы обработки изображений
+MAX_IMAGE_SIDE = 8000
+MAX_IMAGE_PIXELS = 40_000_000
+IMAGE_QUALITY = 80
+# (вариант, размер стороны в px, обрезать ли до квадрата)
+IMAGE_VARIANTS = (
+    ('thumbnail', 160, True),
+    ('card', 480, False),
+    ('full', 1280, False),
+)
+# (расширение файла, формат Pillow)
+IMAGE_FORMATS = (
+    ('webp', 'WEBP'),
+    ('jpeg', 'JPEG'),
+)
+
+# Константы хранилища медиафайлов
+HASH_CHUNK_SIZE = 64 * 1024
+MEDIA_DIRECTORIES = ('recipes', 'users')
+MEDIA_GARBAGE_MIN_AGE = 60 * 60
+
+# Константы переноса рецептов в JSONL (recipes.transfer)
+TRANSFER_CHUNK_SIZE = 2000
+TRANSFER_BATCH_SIZE = 1000
+
+# Константы синхронизации каталога ингредиентов (recipes.catalog)
+CATALOG_READ_SIZE = 64 * 1024
+CATALOG_BATCH_SIZE = 1000
+
+# Срок хранения записей об удалении для ленты изменений (api.sync)
+TOMBSTONE_RETENTION_DAYS = 30
+
+# Константы генератора тестовых данных (recipes.fake_data)
+FAKE_DATA_BATCH_SIZE = 10000
+FAKE_DATA_PASSWORD = 'fake-password'
+FAKE_DATA_DAYS = 365
+FAKE_DATA_WORDS = (
+    'домашний', 'быстрый', 'пряный', 'сырный', 'летний', 'зимний',
+    'острый', 'сладкий', 'овощной', 'мясной', 'рыбный', 'ореховый',
+    'суп', 'салат', 'пирог', 'рагу', 'омлет', 'соус', 'десерт', 'плов',
+)
+FAKE_DATA_FIRST_NAMES = (
+    'Анна', 'Иван', 'Мария', 'Петр', 'Елена', 'Олег', 'Ольга', 'Денис',
+)
+FAKE_DATA_LAST_NAMES = (
+    'Иванова', 'Смирнов', 'Кузнецова', 'Попов', 'Соколова', 'Лебедев',
+)
@@ -0,0 +1,55 @@
+"""Денормализованные счетчики пользователей и рецептов.
+
+Счетчики меняются атомарно выражениями F() из сигналов
+(recipes.signals), а reconcile пересчитывает их с нуля
+и исправляет расхождения, например после bulk_create.
+"""
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from recipes.models import Favorite, Recipe, Subscription, User
+
+# Счетчик: (модель, поле счетчика, модель-источник, FK источника на модель)
+COUNTERS = (
+    (User, 'recipes_count', Recipe, 'author'),
+    (User, 'subscriptions_count', Subscription, 'user'),
+    (User, 'subscribers_count', Subscription, 'author'),
+    (Recipe, 'favorites_count', Favorite, 'recipe'),
+)
+
+
+def change_counter(model, pk, field, delta):
+    """Атомарно изменяет счетчик объекта, не опуская его ниже нуля."""
+    model.objects.filter(pk=pk).update(
+        **{field: Greatest(F(field) + delta, Value(0))}
+    )
+
+
+def count_subquery(source, fk):
+    """Возвращает подзапрос числа строк source для внешнего объекта."""
+    return Coalesce(
+        Subquery(
+            source.objects.filter(**{fk: OuterRef('pk')}).order_by().values(
+                fk
+            ).annotate(total=Count('pk')).values('total')
+        ),
+        Value(0)
+    )
+
+
+def reconcile(fix=True):
+    """Находит и (если fix) исправляет расхождения счетчиков.
+
+    Возвращает словарь 'Модель.поле' -> число объектов с расхождением.
+    """
+    drift = {}
+    for model, field, source, fk in COUNTERS:
+        stale = model.objects.annotate(
+            actual=count_subquery(source, fk)
+        ).filter(~Q(**{field: F('actual')}))
+        drift[f'{model.__name__}.{field}'] = stale.count()
+        if fix and drift[f'{model.__name__}.{field}']:
+            model.objects.filter(
+                pk__in=stale.values('pk')
+            ).update(**{field: count_subquery(source, fk)})
+    return drift
@@ -0,0 +1,262 @@
+"""Генерация больших синтетических наборов данных для нагрузочных тестов.
+
+Популярность рецептов, авторов и ингредиентов распределена по закону
+Ципфа, а активность пользователей - по Парето, поэтому небольшая доля
+объектов получает большую часть связей. Генерация детерминирована
+зерном seed. Строки пишутся пачками: на PostgreSQL через COPY,
+на остальных СУБД - через executemany, минуя модели и сигналы;
+счетчики и списки покупок после вставки пересчитываются целиком.
+"""
+import io
+import itertools
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+from PIL import Image
+from rest_framework.authtoken.models import Token
+
+from recipes.catalog import RowsReader
+from recipes.constants import (
+    FAKE_DATA_BATCH_SIZE, FAKE_DATA_PASSWORD, FAKE_DATA_DAYS,
+    FAKE_DATA_WORDS, FAKE_DATA_FIRST_NAMES, FAKE_DATA_LAST_NAMES
+)
+from recipes.fulltext import index_recipes
+from recipes.models import (
+    Favorite, Ingredient, IngredientInRecipe, Recipe, ShoppingCart,
+    Subscription, User
+)
+
+
+def zipf_weights(size, exponent):
+    """Возвращает накопленные веса рангов 1..size по закону Ципфа."""
+    return list(itertools.accumulate(
+        1 / rank ** exponent for rank in range(1, size + 1)
+    ))
+
+
+def insert_rows(model, columns, rows, batch_size=FAKE_DATA_BATCH_SIZE):
+    """Вставляет строки в таблицу модели и возвращает их число."""
+    table = model._meta.db_table
+    names = ', '.join(columns)
+    count = 0
+
+    def counted():
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.copy_expert(
+                f'COPY {table} ({names}) FROM STDIN WITH (FORMAT csv)',
+                RowsReader(counted())
+            )
+            return count
+        placeholders = ', '.join(['%s'] * len(columns))
+        sql = f'INSERT INTO {table} ({names}) VALUES ({placeholders})'
+        counted_rows = counted()
+        while True:
+            batch = list(itertools.islice(counted_rows, batch_size))
+            if not batch:
+                return count
+            cursor.executemany(sql, batch)
+
+
+class FakeDataGenerator:
+    """Генератор пользователей, рецептов и связей между ними."""
+
+    def __init__(self, seed, zipf_exponent, activity_alpha,
+                 ingredients_range):
+        """Создает генератор с заданным зерном и параметрами распределений."""
+        self.random = random.Random(seed)
+        self.ingredients_range = ingredients_range
+        self.zipf_exponent = zipf_exponent
+        self.activity_alpha = activity_alpha
+        self.now = timezone.now()
+        self.user_ids = []
+        self.recipe_ids = []
+        self.tokens = []
+
+    def activity(self, average, limit):
+        """Возвращает число связей пользователя со средним average."""
+        alpha = self.activity_alpha
+        mean = alpha / (alpha - 1)
+        value = average * self.random.paretovariate(alpha) / mean
+        return min(int(value), limit)
+
+    def popular(self, ids):
+        """Возвращает функцию выбора k различных id с весами Ципфа.
+
+        Ранги популярности перемешаны, чтобы не зависеть от порядка id.
+        """
+        ranked = list(ids)
+        self.random.shuffle(ranked)
+        weights = zipf_weights(len(ranked), self.zipf_exponent)
+
+        def choose(k, exclude=None):
+            chosen = set()
+            attempts = 0
+            while len(chosen) < k and attempts < k * 10:
+                for position in self.random.choices(
+                    range(len(ranked)), cum_weights=weights, k=k
+                ):
+                    if ranked[position] != exclude:
+                        chosen.add(ranked[position])
+                attempts += k
+            return list(chosen)[:k]
+        return choose
+
+    def next_id(self, model):
+        """Возвращает первый свободный id таблицы модели."""
+        return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+    def users(self, count, prefix):
+        """Создает пользователей с токенами и возвращает их число."""
+        start = self.next_id(User)
+        self.user_ids = list(range(start, start + count))
+        password = make_password(FAKE_DATA_PASSWORD)
+
+        def rows():
+            for user_id in self.user_ids:
+                yield (
+                    user_id, password, None, False, False, True, self.now,
+                    f'{prefix}{user_id}', f'{prefix}{user_id}@example.com',
+                    self.random.choice(FAKE_DATA_FIRST_NAMES),
+                    self.random.choice(FAKE_DATA_LAST_NAMES),
+                    None, '{}', 0, 0, 0,
+                )
+
+        insert_rows(User, (
+            'id', 'password', 'last_login', 'is_superuser', 'is_staff',
+            'is_active', 'date_joined', 'username', 'email', 'first_name',
+            'last_name', 'avatar', 'avatar_variants', 'recipes_count',
+            'subscriptions_count', 'subscribers_count',
+        ), rows())
+
+        def tokens():
+            for user_id in self.user_ids:
+                key = f'{self.random.getrandbits(160):040x}'
+                self.tokens.append((f'{prefix}{user_id}', key))
+                yield key, user_id, self.now
+
+        insert_rows(Token, ('key', 'user_id', 'created'), tokens())
+        return count
+
+    def placeholder_image(self):
+        """Сохраняет общее изображение-заглушку для рецептов."""
+        buffer = io.BytesIO()
+        Image.new('RGB', (64, 64), 'lightgray').save(buffer, 'PNG')
+        return default_storage.save(
+            'recipes/placeholder.png', ContentFile(buffer.getvalue())
+        )
+
+    def recipe(self, recipe_id, image, choose_author, choose_ingredients,
+               catalog):
+        """Возвращает строку рецепта, его ингредиенты и текст для поиска."""
+        name = ' '.join(self.random.sample(FAKE_DATA_WORDS, 3)).capitalize()
+        text = f'{name}. Рецепт номер {recipe_id}.'
+        ingredient_ids = choose_ingredients(
+            self.random.randint(*self.ingredients_range)
+        )
+        document = ' '.join(
+            (name, text, *(catalog[pk] for pk in ingredient_ids))
+        )
+        pub_date = self.now - timedelta(
+            seconds=self.random.randint(0, FAKE_DATA_DAYS * 24 * 60 * 60)
+        )
+        row = (
+            recipe_id, name, choose_author(1)[0], text, image, '{}',
+            self.random.randint(1, 180), pub_date, pub_date, 0, document,
+        )
+        links = [
+            (recipe_id, ingredient_id, self.random.randint(1, 500))
+            for ingredient_id in ingredient_ids
+        ]
+        return row, links, document
+
+    def recipes(self, count, batch_size=FAKE_DATA_BATCH_SIZE):
+        """Создает рецепты с ингредиентами и возвращает число связей."""
+        catalog = dict(Ingredient.objects.values_list('id', 'name'))
+        choose_ingredients = self.popular(catalog)
+        choose_author = self.popular(self.user_ids)
+        start = self.next_id(Recipe)
+        self.recipe_ids = list(range(start, start + count))
+        image = self.placeholder_image()
+        total_links = 0
+        for offset in range(0, count, batch_size):
+            rows, links, documents = [], [], []
+            for recipe_id in self.recipe_ids[offset:offset + batch_size]:
+                row, recipe_links, document = self.recipe(
+                    recipe_id, image, choose_author, choose_ingredients,
+                    catalog
+                )
+                rows.append(row)
+                links.extend(recipe_links)
+                documents.append((recipe_id, document))
+            insert_rows(Recipe, (
+                'id', 'name', 'author_id', 'text', 'image', 'image_variants',
+                'cooking_time', 'pub_date', 'updated_at', 'favorites_count',
+                'search_document',
+            ), rows, batch_size)
+            total_links += insert_rows(
+                IngredientInRecipe,
+                ('recipe_id', 'ingredient_id', 'amount'), links, batch_size
+            )
+            index_recipes(documents)
+        return total_links
+
+    def relations(self, model, columns, total, targets, skip_self=False,
+                  extra=()):
+        """Создает связи пользователей с целями и возвращает их число.
+
+        extra - значения остальных колонок, общие для всех связей.
+        """
+        choose = self.popular(targets)
+        average = total / max(len(self.user_ids), 1)
+
+        def rows():
+            for user_id in self.user_ids:
+                count = self.activity(average, len(targets) - 1)
+                exclude = user_id if skip_self else None
+                for target_id in choose(count, exclude):
+                    yield (user_id, target_id, *extra)
+
+        return insert_rows(model, columns, rows())
+
+    def favorites(self, total):
+        """Создает избранное."""
+        return self.relations(
+            Favorite, ('user_id', 'recipe_id', 'created_at'), total,
+            self.recipe_ids, extra=(self.now,)
+        )
+
+    def shopping_carts(self, total):
+        """Создает списки покупок."""
+        return self.relations(
+            ShoppingCart, ('user_id', 'recipe_id', 'created_at'), total,
+            self.recipe_ids, extra=(self.now,)
+        )
+
+    def subscriptions(self, total):
+        """Создает подписки на авторов."""
+        return self.relations(
+            Subscription, ('user_id', 'author_id'), total, self.user_ids,
+            skip_self=True
+        )
+
+    def reset_sequences(self):
+        """Сдвигает последовательности id после вставки с явными id."""
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [User, Recipe]
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
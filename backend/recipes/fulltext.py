@@ -0,0 +1,123 @@
+"""Полнотекстовый поиск рецептов.
+
+Текст для поиска (название, описание и названия ингредиентов)
+хранится в Recipe.search_document. Индекс зависит от СУБД:
+
+* PostgreSQL - генерируемая колонка search_vector (tsvector)
+  с GIN-индексом, ее поддерживает сама СУБД;
+* SQLite - таблица FTS5 recipes_recipe_fts, которую обновляет
+  index_recipe (триггеры не переживают пересоздание таблицы
+  при миграциях SQLite).
+
+Слова запроса ищутся как префиксы и должны встретиться все.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from recipes.constants import SEARCH_CONFIG, MAX_SEARCH_WORDS
+
+RECIPE_TABLE = 'recipes_recipe'
+FTS_TABLE = 'recipes_recipe_fts'
+WORD_RE = re.compile(r'\w+')
+
+
+def get_words(query):
+    """Разбивает поисковый запрос на слова."""
+    return WORD_RE.findall(query.lower())[:MAX_SEARCH_WORDS]
+
+
+def index_recipe(recipe_id, document, using='default'):
+    """Обновляет запись рецепта в индексе FTS5 (только для SQLite).
+
+    Если document равен None, рецепт удаляется из индекса.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [recipe_id]
+        )
+        if document is not None:
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, search_document) '
+                'VALUES (%s, %s)',
+                [recipe_id, document]
+            )
+
+
+def index_recipes(documents, using='default'):
+    """Добавляет в индекс FTS5 новые рецепты (только для SQLite).
+
+    documents - последовательность пар (id рецепта, текст для поиска).
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not documents:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, search_document) '
+            'VALUES (%s, %s)',
+            documents
+        )
+
+
+def search_recipes(recipes, query):
+    """Фильтрует рецепты по запросу и сортирует их по релевантности."""
+    words = get_words(query)
+    if not words:
+        return recipes.none()
+
+    vendor = connections[recipes.db].vendor
+    if vendor == 'postgresql':
+        tsquery = ' & '.join(f'{word}:*' for word in words)
+        match = RawSQL(
+            f'"{RECIPE_TABLE}"."search_vector" @@ to_tsquery(%s, %s)',
+            (SEARCH_CONFIG, tsquery), output_field=BooleanField()
+        )
+        rank = RawSQL(
+            f'ts_rank("{RECIPE_TABLE}"."search_vector", '
+            'to_tsquery(%s, %s))',
+            (SEARCH_CONFIG, tsquery), output_field=FloatField()
+        )
+    elif vendor == 'sqlite':
+        fts_query = ' '.join(f'"{word}"*' for word in words)
+        match = RawSQL(
+            f'"{RECIPE_TABLE}"."id" IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)',
+            (fts_query,), output_field=BooleanField()
+        )
+        rank = RawSQL(
+            f'(SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = "{RECIPE_TABLE}"."id")',
+            (fts_query,), output_field=FloatField()
+        )
+    else:
+        match = Q()
+        for word in words:
+            match &= Q(search_document__icontains=word)
+        rank = Value(0.0, output_field=FloatField())
+
+    return recipes.filter(match).annotate(search_rank=rank).order_by(
+        '-search_rank', *recipes.model._meta.ordering
+    )
+
+
+def reindex_recipes(documents, using='default'):
+    """Заменяет записи рецептов в индексе FTS5 (только для SQLite).
+
+    documents - последовательность пар (id рецепта, текст для поиска).
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not documents:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(recipe_id,) for recipe_id, _ in documents]
+        )
+    index_recipes(documents, using=using)
@@ -0,0 +1,95 @@
+"""Обработка загружаемых изображений.
+
+Проверяет размеры изображения до декодирования пикселей (защита
+от «бомб декомпрессии») и строит уменьшенные варианты в форматах
+WebP и JPEG, которые сохраняются в каталог оригинала.
+"""
+import io
+import os
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from recipes.constants import (
+    MAX_IMAGE_PIXELS, MAX_IMAGE_SIDE, IMAGE_VARIANTS, IMAGE_FORMATS,
+    IMAGE_QUALITY
+)
+
+
+def open_image(file):
+    """Открывает изображение, проверяя размеры по заголовку файла."""
+    file.seek(0)
+    try:
+        image = Image.open(file)
+    except (Image.DecompressionBombError, OSError):
+        raise ValidationError('Не удалось прочитать изображение.')
+    width, height = image.size
+    if width > MAX_IMAGE_SIDE or height > MAX_IMAGE_SIDE:
+        raise ValidationError(
+            f'Сторона изображения не должна превышать {MAX_IMAGE_SIDE} px.'
+        )
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ValidationError('Изображение слишком большое.')
+    return image
+
+
+def validate_image(file):
+    """Проверяет, что файл - корректное изображение допустимого размера."""
+    image = open_image(file)
+    try:
+        image.verify()
+    except Exception:
+        raise ValidationError('Файл изображения поврежден.')
+    finally:
+        file.seek(0)
+
+
+def to_rgb(image):
+    """Приводит изображение к RGB, заливая прозрачность белым."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def resize(image, size, crop):
+    """Уменьшает изображение до size (с обрезкой до квадрата, если crop)."""
+    if crop:
+        return ImageOps.fit(
+            image, (size, size), method=Image.Resampling.LANCZOS
+        )
+    image = image.copy()
+    image.thumbnail((size, size), Image.Resampling.LANCZOS)
+    return image
+
+
+def build_variants(field_file):
+    """Строит варианты изображения и возвращает пути к ним в хранилище.
+
+    Результат имеет вид {'thumbnail': {'webp': path, 'jpeg': path}, ...}.
+    """
+    with field_file.open('rb') as file:
+        image = open_image(file)
+        image = to_rgb(ImageOps.exif_transpose(image))
+
+    stem = os.path.join(
+        field_file.field.upload_to,
+        os.path.splitext(os.path.basename(field_file.name))[0]
+    )
+    variants = {}
+    for variant, size, crop in IMAGE_VARIANTS:
+        resized = resize(image, size, crop)
+        variants[variant] = {}
+        for extension, image_format in IMAGE_FORMATS:
+            buffer = io.BytesIO()
+            resized.save(
+                buffer, image_format, quality=IMAGE_QUALITY, optimize=True
+            )
+            variants[variant][extension] = field_file.storage.save(
+                f'{stem}_{variant}.{extension}',
+                ContentFile(buffer.getvalue())
+            )
+    return variants
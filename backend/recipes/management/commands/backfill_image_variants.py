@@ -0,0 +1,20 @@
+"""Скрипт для сборки вариантов уже загруженных изображений."""
+from django.core.management.base import BaseCommand
+
+from recipes.tasks import enqueue_missing_variants
+
+
+class Command(BaseCommand):
+    """Команда для постановки сборки вариантов изображений \
+        рецептов и аватаров, у которых их еще нет."""
+
+    help = 'Поставить сборку вариантов изображений без вариантов'
+
+    def handle(self, *args, **options):
+        """Постановка задач и вывод их числа по моделям."""
+        queued = enqueue_missing_variants()
+        for label, count in queued.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Поставлено задач: {sum(queued.values())}.'
+        ))
@@ -0,0 +1,83 @@
+"""Скрипт для удаления медиафайлов, на которые нет ссылок."""
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from recipes.constants import MEDIA_DIRECTORIES, MEDIA_GARBAGE_MIN_AGE
+from recipes.tasks import IMAGE_SOURCES
+
+
+def get_referenced_files():
+    """Возвращает множество путей файлов, на которые ссылаются объекты."""
+    referenced = set()
+    for model, image_field, variants_field in IMAGE_SOURCES:
+        for image, variants in model.objects.values_list(
+            image_field, variants_field
+        ).iterator():
+            if image:
+                referenced.add(image)
+            for formats in (variants or {}).values():
+                referenced.update(formats.values())
+    return referenced
+
+
+def walk(storage, directory):
+    """Рекурсивно перечисляет файлы каталога хранилища."""
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield f'{directory}/{name}'
+    for name in directories:
+        yield from walk(storage, f'{directory}/{name}')
+
+
+class Command(BaseCommand):
+    """Команда для удаления медиафайлов, которые не использует \
+        ни один рецепт или пользователь."""
+
+    help = 'Удалить медиафайлы без ссылок из рецептов и пользователей'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать файлы, которые будут удалены',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=MEDIA_GARBAGE_MIN_AGE,
+            help='Не трогать файлы моложе указанного числа секунд',
+        )
+
+    def handle(self, *args, **options):
+        """Поиск и удаление файлов без ссылок."""
+        threshold = time.time() - options['min_age']
+        paths = [
+            path
+            for directory in MEDIA_DIRECTORIES
+            if default_storage.exists(directory)
+            for path in walk(default_storage, directory)
+        ]
+        # Ссылки собираются после обхода хранилища, а возраст файла
+        # проверяется перед удалением: файл, переиспользованный
+        # во время сборки, либо уже есть в БД, либо получил свежую
+        # дату изменения при сохранении.
+        referenced = get_referenced_files()
+        removed = 0
+        for path in paths:
+            if path in referenced:
+                continue
+            modified = default_storage.get_modified_time(path)
+            if modified.timestamp() > threshold:
+                continue
+            self.stdout.write(path)
+            if not options['dry_run']:
+                default_storage.delete(path)
+            removed += 1
+
+        action = 'Найдено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(
+            self.style.SUCCESS(f'{action} файлов без ссылок: {removed}.')
+        )
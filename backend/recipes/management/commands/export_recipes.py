@@ -0,0 +1,57 @@
+"""Скрипт для выгрузки рецептов в JSONL."""
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+
+from recipes.constants import TRANSFER_CHUNK_SIZE
+from recipes.transfer import iter_recipes
+
+
+class Command(BaseCommand):
+    """Команда для потоковой выгрузки рецептов с авторами \
+        и ингредиентами в JSONL."""
+
+    help = 'Выгрузить рецепты в JSONL'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='Путь к JSONL файлу (по умолчанию - stdout)',
+        )
+        parser.add_argument(
+            '--after-id',
+            type=int,
+            default=0,
+            help='Выгрузить рецепты с id больше указанного',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=TRANSFER_CHUNK_SIZE,
+            help='Размер порции чтения из БД',
+        )
+
+    def handle(self, *args, **options):
+        """Построчная запись рецептов в файл."""
+        if options['output'] == '-':
+            file = sys.stdout
+        else:
+            file = open(options['output'], 'w', encoding='utf-8')
+        last_id = options['after_id']
+        count = 0
+        try:
+            for record in iter_recipes(last_id, options['chunk_size']):
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+                last_id = record['id']
+                count += 1
+        finally:
+            if file is not sys.stdout:
+                file.close()
+
+        self.stderr.write(
+            f'Выгружено рецептов: {count}, последний id: {last_id}.',
+            style_func=self.style.SUCCESS
+        )
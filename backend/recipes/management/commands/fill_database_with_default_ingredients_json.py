@@ -6,6 +6,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
 from recipes.models import Ingredient
+from recipes.search import bump_catalog_version
 
 
 class Command(BaseCommand):
@@ -41,6 +42,7 @@ class Command(BaseCommand):
                     [Ingredient(**item) for item in json.load(file)],
                     ignore_conflicts=True,
                 )
+            bump_catalog_version()
 
             self.stdout.write(
                 self.style.SUCCESS(
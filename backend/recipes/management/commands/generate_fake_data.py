@@ -0,0 +1,122 @@
+"""Скрипт для генерации синтетических данных для нагрузочных тестов."""
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.cache import invalidate_recipes
+from recipes import shopping_list
+from recipes.constants import FAKE_DATA_BATCH_SIZE, FAKE_DATA_PASSWORD
+from recipes.counters import reconcile
+from recipes.fake_data import FakeDataGenerator
+from recipes.models import Ingredient
+
+
+class Command(BaseCommand):
+    """Команда для заполнения БД пользователями, рецептами, избранным, \
+        списками покупок и подписками."""
+
+    help = 'Сгенерировать синтетические данные для нагрузочных тестов'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--users', type=int, default=1000,
+            help='Количество пользователей',
+        )
+        parser.add_argument(
+            '--recipes', type=int, default=10000,
+            help='Количество рецептов',
+        )
+        parser.add_argument(
+            '--min-ingredients', type=int, default=3,
+            help='Минимум ингредиентов в рецепте',
+        )
+        parser.add_argument(
+            '--max-ingredients', type=int, default=12,
+            help='Максимум ингредиентов в рецепте',
+        )
+        parser.add_argument(
+            '--favorites', type=int, default=50000,
+            help='Примерное количество записей в избранном',
+        )
+        parser.add_argument(
+            '--shopping-carts', type=int, default=10000,
+            help='Примерное количество рецептов в списках покупок',
+        )
+        parser.add_argument(
+            '--subscriptions', type=int, default=20000,
+            help='Примерное количество подписок',
+        )
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель закона Ципфа для популярности',
+        )
+        parser.add_argument(
+            '--activity-alpha', type=float, default=1.5,
+            help='Параметр распределения Парето для активности (> 1)',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора случайных чисел',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=FAKE_DATA_BATCH_SIZE,
+            help='Размер пачки при вставке',
+        )
+        parser.add_argument(
+            '--prefix', default='fake',
+            help='Префикс имен пользователей',
+        )
+        parser.add_argument(
+            '--tokens-file',
+            help='CSV файл для записи имен пользователей и их токенов',
+        )
+
+    def handle(self, *args, **options):
+        """Генерация данных и пересчет производных таблиц."""
+        if options['activity_alpha'] <= 1:
+            raise CommandError('Параметр --activity-alpha должен быть > 1.')
+        if not 0 < options['min_ingredients'] <= options['max_ingredients']:
+            raise CommandError('Неверный диапазон количества ингредиентов.')
+        if options['users'] < 2 or options['recipes'] < 1:
+            raise CommandError('Нужно хотя бы 2 пользователя и 1 рецепт.')
+        if not Ingredient.objects.exists():
+            raise CommandError(
+                'Каталог ингредиентов пуст, выполните sync_ingredients.'
+            )
+
+        generator = FakeDataGenerator(
+            options['seed'], options['zipf'], options['activity_alpha'],
+            (options['min_ingredients'], options['max_ingredients'])
+        )
+        batch_size = options['batch_size']
+        start = time.perf_counter()
+        with transaction.atomic():
+            users = generator.users(options['users'], options['prefix'])
+            links = generator.recipes(options['recipes'], batch_size)
+            favorites = generator.favorites(options['favorites'])
+            carts = generator.shopping_carts(options['shopping_carts'])
+            subscriptions = generator.subscriptions(options['subscriptions'])
+            generator.reset_sequences()
+            reconcile(fix=True)
+            shopping_list.rebuild()
+            invalidate_recipes([])
+        elapsed = time.perf_counter() - start
+
+        if options['tokens_file']:
+            with open(options['tokens_file'], 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(('username', 'token'))
+                writer.writerows(generator.tokens)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано пользователей: {users}, '
+            f'рецептов: {options["recipes"]} '
+            f'(ингредиентов в рецептах: {links}), '
+            f'избранного: {favorites}, '
+            f'рецептов в списках покупок: {carts}, '
+            f'подписок: {subscriptions} за {elapsed:.2f} с. '
+            f'Пароль пользователей: {FAKE_DATA_PASSWORD}'
+        ))
@@ -0,0 +1,97 @@
+"""Скрипт для загрузки рецептов из JSONL."""
+import json
+import os
+import sys
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import invalidate_recipes
+from recipes.constants import TRANSFER_BATCH_SIZE
+from recipes.search import bump_catalog_version
+from recipes.transfer import RecipeImporter
+
+
+def read_checkpoint(path):
+    """Возвращает число уже загруженных строк из файла контрольной точки."""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['line']
+
+
+def write_checkpoint(path, line):
+    """Атомарно сохраняет число загруженных строк."""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump({'line': line}, file)
+    os.replace(temporary, path)
+
+
+class Command(BaseCommand):
+    """Команда для пакетной загрузки рецептов из JSONL \
+        с возможностью продолжить с контрольной точки."""
+
+    help = 'Загрузить рецепты из JSONL'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--input',
+            default='-',
+            help='Путь к JSONL файлу (по умолчанию - stdin)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=TRANSFER_BATCH_SIZE,
+            help='Число рецептов в одной транзакции',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл контрольной точки для продолжения загрузки',
+        )
+
+    def handle(self, *args, **options):
+        """Загрузка файла пачками с сохранением контрольной точки."""
+        checkpoint = options['checkpoint']
+        line = read_checkpoint(checkpoint)
+        if options['input'] == '-':
+            file = sys.stdin
+        else:
+            file = open(options['input'], encoding='utf-8')
+
+        importer = RecipeImporter()
+        try:
+            lines = islice(file, line, None)
+            while True:
+                batch = list(islice(lines, options['batch_size']))
+                if not batch:
+                    break
+                try:
+                    records = [json.loads(row) for row in batch if row.strip()]
+                except ValueError as error:
+                    raise CommandError(
+                        f'Ошибка в строках {line + 1}-{line + len(batch)}: '
+                        f'{error}'
+                    )
+                importer.import_batch(records)
+                line += len(batch)
+                if checkpoint:
+                    write_checkpoint(checkpoint, line)
+                self.stdout.write(f'Обработано строк: {line}')
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+        stats = importer.stats
+        if stats['ingredients']:
+            bump_catalog_version()
+        if stats['recipes']:
+            invalidate_recipes([])
+        self.stdout.write(self.style.SUCCESS(
+            f"Загружено рецептов: {stats['recipes']}, "
+            f"пропущено: {stats['skipped']}, "
+            f"новых авторов: {stats['authors']}, "
+            f"новых ингредиентов: {stats['ingredients']}."
+        ))
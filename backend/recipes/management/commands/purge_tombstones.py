@@ -0,0 +1,39 @@
+"""Скрипт для удаления устаревших записей об удалении."""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from recipes.constants import TOMBSTONE_RETENTION_DAYS
+from recipes.models import Tombstone
+
+
+class Command(BaseCommand):
+    """Команда для удаления записей об удалении старше срока, \
+        после которого клиенты получают полный снимок."""
+
+    help = 'Удалить устаревшие записи об удалении рецептов'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=TOMBSTONE_RETENTION_DAYS,
+            help='Сколько дней хранить записи',
+        )
+
+    def handle(self, *args, **options):
+        """Удаление записей старше заданного срока."""
+        days = options['days']
+        # Курсоры моложе срока хранения должны видеть все удаления.
+        if days < TOMBSTONE_RETENTION_DAYS:
+            raise CommandError(
+                f'Срок не может быть меньше {TOMBSTONE_RETENTION_DAYS} дней.'
+            )
+        deleted, _ = Tombstone.objects.filter(
+            deleted_at__lt=timezone.now() - timedelta(days=days)
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено записей: {deleted}.'
+        ))
@@ -0,0 +1,43 @@
+"""Скрипт для проверки и пересборки агрегата списков покупок."""
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes import shopping_list
+
+
+class Command(BaseCommand):
+    """Команда для проверки и пересборки агрегата списков покупок \
+        по содержимому корзин."""
+
+    help = 'Проверить и пересобрать суммы ингредиентов в списках покупок'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить расхождения, не исправляя их',
+        )
+
+    def handle(self, *args, **options):
+        """Сравнение агрегата с пересчетом и пересборка."""
+        drift = shopping_list.find_drift()
+        for (user_id, ingredient_id), (actual, expected) in sorted(
+            drift.items()
+        ):
+            self.stdout.write(
+                f'user={user_id} ingredient={ingredient_id}: '
+                f'в агрегате {actual}, ожидается {expected}'
+            )
+        self.stdout.write(f'Найдено расхождений: {len(drift)}.')
+
+        if options['check']:
+            if drift:
+                raise CommandError('Агрегат списков покупок расходится.')
+            return
+
+        total = shopping_list.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Агрегат пересобран, строк: {total}.'
+            )
+        )
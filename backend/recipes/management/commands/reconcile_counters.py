@@ -0,0 +1,34 @@
+"""Скрипт для сверки денормализованных счетчиков."""
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.counters import reconcile
+
+
+class Command(BaseCommand):
+    """Команда для пересчета счетчиков рецептов, избранного \
+        и подписок."""
+
+    help = 'Сверить и исправить счетчики пользователей и рецептов'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить расхождения, не исправляя их',
+        )
+
+    def handle(self, *args, **options):
+        """Сверка счетчиков с реальным числом записей."""
+        drift = reconcile(fix=not options['check'])
+        for counter, stale in drift.items():
+            self.stdout.write(f'{counter}: расхождений {stale}')
+
+        total = sum(drift.values())
+        if options['check']:
+            if total:
+                raise CommandError('Счетчики расходятся с данными.')
+            return
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счетчиков: {total}.')
+        )
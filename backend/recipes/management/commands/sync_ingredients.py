@@ -0,0 +1,72 @@
+"""Скрипт для синхронизации каталога ингредиентов с файлом."""
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.catalog import READERS, sync_catalog
+from recipes.search import bump_catalog_version
+
+
+class Command(BaseCommand):
+    """Команда для добавления и удаления ингредиентов \
+        по файлу CSV или JSON."""
+
+    help = 'Синхронизировать каталог ингредиентов с CSV или JSON файлом'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--path',
+            default=os.path.join(
+                settings.BASE_DIR, '..', 'data', 'ingredients.csv'
+            ),
+            help='Путь к CSV или JSON файлу c ингредиентами',
+        )
+        parser.add_argument(
+            '--format',
+            choices=tuple(READERS),
+            help='Формат файла (по умолчанию - по расширению)',
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Удалить ингредиенты, которых нет в файле и в рецептах',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать изменения, не сохраняя их',
+        )
+
+    def handle(self, *args, **options):
+        """Сравнение файла с каталогом и применение изменений."""
+        path = options['path']
+        file_format = (
+            options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        )
+        if file_format not in READERS:
+            raise CommandError(f'Неизвестный формат файла {path}.')
+
+        start = time.perf_counter()
+        try:
+            with open(path, encoding='utf-8') as file:
+                stats = sync_catalog(
+                    file, file_format, options['prune'], options['dry_run']
+                )
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(f'Ошибка при чтении файла {path}: {error}')
+        elapsed = time.perf_counter() - start
+
+        changed = stats['inserted'] or stats['deleted']
+        if changed and not options['dry_run']:
+            bump_catalog_version()
+
+        label = 'Будет добавлено' if options['dry_run'] else 'Добавлено'
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {stats['inserted']}, "
+            f"без изменений: {stats['skipped']}, "
+            f"удалено: {stats['deleted']} "
+            f'за {elapsed:.2f} с.'
+        ))
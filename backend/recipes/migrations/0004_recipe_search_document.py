@@ -0,0 +1,72 @@
+# Generated by Django 3.2.23 on 2026-10-17 03:58
+
+from django.db import migrations, models
+
+POSTGRES_FORWARD = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "ALTER TABLE recipes_recipe ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('russian', search_document)) STORED",
+    'CREATE INDEX recipe_search_vector_idx ON recipes_recipe '
+    'USING GIN (search_vector)',
+    'CREATE INDEX recipe_name_trgm_idx ON recipes_recipe '
+    'USING GIN (UPPER(name) gin_trgm_ops)',
+)
+POSTGRES_BACKWARD = (
+    'DROP INDEX IF EXISTS recipe_name_trgm_idx',
+    'ALTER TABLE recipes_recipe DROP COLUMN IF EXISTS search_vector',
+)
+SQLITE_FORWARD = (
+    "CREATE VIRTUAL TABLE recipes_recipe_fts USING fts5("
+    "search_document, tokenize='unicode61 remove_diacritics 2')",
+)
+SQLITE_BACKWARD = (
+    'DROP TABLE IF EXISTS recipes_recipe_fts',
+)
+
+
+def fill_search_documents(apps, schema_editor):
+    """Заполняет текст для поиска и индекс для существующих рецептов."""
+    Recipe = apps.get_model('recipes', 'Recipe')
+    IngredientInRecipe = apps.get_model('recipes', 'IngredientInRecipe')
+    vendor = schema_editor.connection.vendor
+    for statement in {
+        'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD
+    }.get(vendor, ()):
+        schema_editor.execute(statement)
+
+    for recipe in Recipe.objects.only('id', 'name', 'text').iterator():
+        ingredient_names = IngredientInRecipe.objects.filter(
+            recipe_id=recipe.id
+        ).values_list('ingredient__name', flat=True)
+        document = ' '.join((recipe.name, recipe.text, *ingredient_names))
+        Recipe.objects.filter(id=recipe.id).update(search_document=document)
+        if vendor == 'sqlite':
+            schema_editor.execute(
+                'INSERT INTO recipes_recipe_fts (rowid, search_document) '
+                'VALUES (%s, %s)',
+                (recipe.id, document)
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    """Удаляет поисковые индексы."""
+    for statement in {
+        'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD
+    }.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_pub_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Текст для поиска'),
+        ),
+        migrations.RunPython(fill_search_documents, drop_search_index),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 3.2.23 on 2026-10-17 04:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+FILL_SHOPPING_LISTS = (
+    'INSERT INTO recipes_shoppinglistitem '
+    '(user_id, ingredient_id, total_amount) '
+    'SELECT cart.user_id, amounts.ingredient_id, SUM(amounts.amount) '
+    'FROM recipes_shoppingcart cart '
+    'JOIN recipes_ingredientinrecipe amounts '
+    'ON amounts.recipe_id = cart.recipe_id '
+    'GROUP BY cart.user_id, amounts.ingredient_id'
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_recipe_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShoppingListItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_amount', models.IntegerField(verbose_name='Количество')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shopping_list_items', to='recipes.ingredient', verbose_name='Ингредиент')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shopping_list_items', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Продукт в списке покупок',
+                'verbose_name_plural': 'Продукты в списках покупок',
+                'default_related_name': 'shopping_list_items',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='shoppinglistitem',
+            constraint=models.UniqueConstraint(fields=('user', 'ingredient'), name='unique_shopping_list_item'),
+        ),
+        migrations.RunSQL(FILL_SHOPPING_LISTS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 3.2.23 on 2026-10-17 04:01
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    """Заполняет счетчики по существующим данным."""
+    User = apps.get_model('recipes', 'User')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    Favorite = apps.get_model('recipes', 'Favorite')
+    Subscription = apps.get_model('recipes', 'Subscription')
+
+    def count(source, fk):
+        return Coalesce(
+            Subquery(
+                source.objects.filter(**{fk: OuterRef('pk')}).order_by()
+                .values(fk).annotate(total=Count('pk')).values('total')
+            ),
+            Value(0)
+        )
+
+    User.objects.update(
+        recipes_count=count(Recipe, 'author'),
+        subscriptions_count=count(Subscription, 'user'),
+        subscribers_count=count(Subscription, 'author'),
+    )
+    Recipe.objects.update(favorites_count=count(Favorite, 'recipe'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_shoppinglistitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В избранном'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='recipes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Рецептов'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='subscribers_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Подписчиков'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='subscriptions_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Подписок'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
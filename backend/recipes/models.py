@@ -1,15 +1,19 @@
 """Модели приложения recipes."""
+from collections import defaultdict
+
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
+from django.utils import timezone
 
 from recipes.constants import (
     MIN_COOKING_TIME, MIN_INGREDIENT_AMOUNT, MAX_NAME_LENGTH,
     COOKING_TIME_ERROR, INGREDIENT_AMOUNT_ERROR, USERNAME_MAX_LENGTH,
     EMAIL_MAX_LENGTH, FIRST_NAME_MAX_LENGTH,
-    LAST_NAME_MAX_LENGTH, USERNAME_REGEX
+    LAST_NAME_MAX_LENGTH, USERNAME_REGEX, SEARCH_DOCUMENT_BATCH_SIZE
 )
+from recipes.fulltext import index_recipe, reindex_recipes
 
 
 class User(AbstractUser):
@@ -42,6 +46,27 @@ class User(AbstractUser):
         null=True,
         blank=True,
     )
+    avatar_variants = models.JSONField(
+        'Варианты аватара',
+        default=dict,
+        blank=True,
+        editable=False,
+    )
+    recipes_count = models.PositiveIntegerField(
+        'Рецептов',
+        default=0,
+        editable=False,
+    )
+    subscriptions_count = models.PositiveIntegerField(
+        'Подписок',
+        default=0,
+        editable=False,
+    )
+    subscribers_count = models.PositiveIntegerField(
+        'Подписчиков',
+        default=0,
+        editable=False,
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ('username', 'first_name', 'last_name',)
@@ -90,6 +115,45 @@ class Ingredient(models.Model):
         return f'{self.name}, {self.measurement_unit}'
 
 
+class RecipeQuerySet(models.QuerySet):
+    """Набор рецептов."""
+
+    def touch(self):
+        """Отмечает рецепты измененными (для валидаторов ответов API)."""
+        return self.update(updated_at=timezone.now())
+
+    def refresh_search_documents(self):
+        """Пересобирает текст для поиска и отмечает рецепты измененными.
+
+        Число запросов не зависит от числа рецептов: названия
+        ингредиентов читаются одним запросом, а тексты обновляются
+        через bulk_update.
+        """
+        names = defaultdict(list)
+        for recipe_id, name in IngredientInRecipe.objects.filter(
+            recipe__in=self
+        ).order_by('ingredient__name').values_list(
+            'recipe_id', 'ingredient__name'
+        ):
+            names[recipe_id].append(name)
+        recipes = list(self.only('id', 'name', 'text'))
+        now = timezone.now()
+        for recipe in recipes:
+            recipe.search_document = ' '.join(
+                (recipe.name, recipe.text, *names[recipe.pk])
+            )
+            recipe.updated_at = now
+        self.model.objects.bulk_update(
+            recipes, ['search_document', 'updated_at'],
+            batch_size=SEARCH_DOCUMENT_BATCH_SIZE
+        )
+        reindex_recipes(
+            [(recipe.pk, recipe.search_document) for recipe in recipes],
+            using=self.db
+        )
+        return len(recipes)
+
+
 class Recipe(models.Model):
     """Модель рецепта."""
 
@@ -109,6 +173,12 @@ class Recipe(models.Model):
         'Изображение',
         upload_to='recipes/',
     )
+    image_variants = models.JSONField(
+        'Варианты изображения',
+        default=dict,
+        blank=True,
+        editable=False,
+    )
     cooking_time = models.PositiveIntegerField(
         'Время приготовления (в минутах)',
         validators=[
@@ -126,6 +196,24 @@ class Recipe(models.Model):
         'Дата публикации',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
+    favorites_count = models.PositiveIntegerField(
+        'В избранном',
+        default=0,
+        editable=False,
+    )
+    search_document = models.TextField(
+        'Текст для поиска',
+        blank=True,
+        default='',
+        editable=False,
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         """Метаданные модели рецепта."""
@@ -134,11 +222,40 @@ class Recipe(models.Model):
         verbose_name_plural = 'Рецепты'
         ordering = ('-pub_date', 'name')
         default_related_name = 'recipes'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='recipe_pub_date_id_idx'
+            ),
+        )
 
     def __str__(self):
         """Строковое представление модели рецепта."""
         return self.name
 
+    def refresh_search_document(self):
+        """Пересобирает текст для поиска и обновляет поисковый индекс."""
+        self.search_document = ' '.join((
+            self.name,
+            self.text,
+            *self.ingredients.values_list('name', flat=True),
+        ))
+        Recipe.objects.filter(pk=self.pk).update(
+            search_document=self.search_document
+        )
+        index_recipe(self.pk, self.search_document)
+
+
+class IngredientInRecipeQuerySet(models.QuerySet):
+    """Набор ингредиентов рецептов."""
+
+    def delete(self):
+        """Удаляет строки и отмечает их рецепты измененными."""
+        Recipe.objects.filter(
+            pk__in=self.values('recipe_id')
+        ).order_by().touch()
+        return super().delete()
+
 
 class IngredientInRecipe(models.Model):
     """Модель для связи ингредиента с рецептом и указания количества."""
@@ -160,6 +277,8 @@ class IngredientInRecipe(models.Model):
         )]
     )
 
+    objects = IngredientInRecipeQuerySet.as_manager()
+
     class Meta:
         """Метаданные модели ингредиента в рецепте."""
 
@@ -173,6 +292,11 @@ class IngredientInRecipe(models.Model):
             ),
         )
 
+    def delete(self, *args, **kwargs):
+        """Удаляет строку и отмечает рецепт измененным."""
+        Recipe.objects.filter(pk=self.recipe_id).touch()
+        return super().delete(*args, **kwargs)
+
     def __str__(self):
         """Строковое представление модели ингредиента в рецепте."""
         return (f'{self.ingredient.name} '
@@ -192,6 +316,10 @@ class UserRecipeRelation(models.Model):
         on_delete=models.CASCADE,
         verbose_name='Рецепт',
     )
+    created_at = models.DateTimeField(
+        'Дата добавления',
+        auto_now_add=True,
+    )
 
     class Meta:
         """Метаданные абстрактного класса."""
@@ -232,6 +360,101 @@ class ShoppingCart(UserRecipeRelation):
         verbose_name_plural = 'Списки покупок'
 
 
+class Tombstone(models.Model):
+    """Запись об удалении рецепта или рецепта из списка пользователя.
+
+    Нужна ленте изменений (api.sync): удаленную строку иначе
+    не отличить от неизменившейся. Ссылки не ограничены в БД,
+    так как запись переживает удаленные объекты.
+    """
+
+    kind = models.CharField(
+        'Что удалено',
+        max_length=16,
+        choices=(
+            ('recipe', 'Рецепт'),
+            ('favorite', 'Избранное'),
+            ('shoppingcart', 'Список покупок'),
+        ),
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Пользователь',
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name='Рецепт',
+    )
+    deleted_at = models.DateTimeField(
+        'Дата удаления',
+        auto_now_add=True,
+        db_index=True,
+    )
+
+    class Meta:
+        """Метаданные модели записи об удалении."""
+
+        verbose_name = 'Запись об удалении'
+        verbose_name_plural = 'Записи об удалении'
+        indexes = (
+            models.Index(
+                fields=('user', 'kind', 'deleted_at'),
+                name='tombstone_user_kind_idx'
+            ),
+        )
+
+    def __str__(self):
+        """Строковое представление записи об удалении."""
+        return f'{self.get_kind_display()}: {self.recipe_id}'
+
+
+class ShoppingListItem(models.Model):
+    """Суммарное количество ингредиента в списке покупок пользователя.
+
+    Таблица поддерживается инкрементально (recipes.shopping_list)
+    при изменении списка покупок и ингредиентов рецептов.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        verbose_name='Ингредиент',
+    )
+    total_amount = models.IntegerField(
+        'Количество',
+    )
+
+    class Meta:
+        """Метаданные модели продукта в списке покупок."""
+
+        verbose_name = 'Продукт в списке покупок'
+        verbose_name_plural = 'Продукты в списках покупок'
+        default_related_name = 'shopping_list_items'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'ingredient'),
+                name='unique_shopping_list_item'
+            ),
+        )
+
+    def __str__(self):
+        """Строковое представление продукта в списке покупок."""
+        return f'{self.user}: {self.ingredient} - {self.total_amount}'
+
+
 class Subscription(models.Model):
     """Модель подписки пользователей на авторов."""
 
@@ -0,0 +1,183 @@
+"""Поисковый индекс каталога ингредиентов в памяти процесса.
+
+Индекс строится один раз на воркер и отвечает на запросы
+автодополнения без обращения к БД: сначала совпадения по началу
+названия (бинарный поиск по отсортированному массиву), затем
+вхождения подстроки (через индекс триграмм), а если точных
+совпадений нет - похожие названия с опечатками.
+
+Актуальность индекса определяется версией каталога в общем кэше:
+ее увеличивают сигналы Ingredient и команды загрузки ингредиентов,
+а индекс перестраивается при первом запросе после смены версии.
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+
+from recipes.constants import (
+    INGREDIENT_FUZZY_THRESHOLD, INGREDIENT_FUZZY_LIMIT, TRIGRAM_SIZE
+)
+from recipes.models import Ingredient
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = 'ingredients:catalog:version'
+
+
+def get_catalog_version():
+    """Возвращает текущую версию каталога ингредиентов."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns() // 1000)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Увеличивает версию каталога после коммита текущей транзакции."""
+    def bump():
+        try:
+            cache.incr(CATALOG_VERSION_KEY)
+        except ValueError:
+            cache.add(CATALOG_VERSION_KEY, time.time_ns() // 1000)
+    transaction.on_commit(bump)
+
+
+def normalize(text):
+    """Приводит строку к виду для сравнения без учета регистра и ё."""
+    return text.strip().casefold().replace('ё', 'е')
+
+
+def trigrams(text):
+    """Возвращает множество триграмм строки."""
+    return {
+        text[i:i + TRIGRAM_SIZE]
+        for i in range(len(text) - TRIGRAM_SIZE + 1)
+    }
+
+
+class IngredientSnapshot:
+    """Неизменяемый снимок каталога.
+
+    Хранит отсортированные ключи поиска и индекс триграмм.
+    """
+
+    def __init__(self, version, rows):
+        """Строит индексы по строкам (id, name, measurement_unit)."""
+        self.version = version
+        rows = sorted(rows, key=lambda row: (normalize(row[1]), row[2]))
+        self.entries = [
+            {'id': pk, 'name': name, 'measurement_unit': unit}
+            for pk, name, unit in rows
+        ]
+        self.keys = [normalize(name) for _, name, _ in rows]
+        self.postings = {}
+        for position, key in enumerate(self.keys):
+            for gram in trigrams(f'  {key} '):
+                self.postings.setdefault(gram, []).append(position)
+
+    def prefix_positions(self, query):
+        """Возвращает позиции названий, начинающихся с query."""
+        start = bisect.bisect_left(self.keys, query)
+        end = start
+        while end < len(self.keys) and self.keys[end].startswith(query):
+            end += 1
+        return range(start, end)
+
+    def infix_positions(self, query, exclude):
+        """Возвращает позиции названий, содержащих query не с начала."""
+        grams = trigrams(query)
+        if grams:
+            postings = sorted(
+                (self.postings.get(gram, ()) for gram in grams), key=len
+            )
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = range(len(self.keys))
+        return [
+            position for _, position in sorted(
+                (self.keys[position].find(query), position)
+                for position in candidates
+                if position not in exclude and query in self.keys[position]
+            )
+        ]
+
+    def fuzzy_positions(self, query):
+        """Возвращает позиции названий, похожих на query с опечатками."""
+        grams = trigrams(f'  {query}')
+        scores = Counter(
+            position
+            for gram in grams
+            for position in self.postings.get(gram, ())
+        )
+        threshold = INGREDIENT_FUZZY_THRESHOLD * len(grams)
+        return [
+            position for position, score in sorted(
+                scores.items(), key=lambda item: (-item[1], item[0])
+            )
+            if score >= threshold
+        ][:INGREDIENT_FUZZY_LIMIT]
+
+    def search(self, query):
+        """Ищет ингредиенты: по началу, по подстроке, затем с опечатками."""
+        query = normalize(query)
+        if not query:
+            return self.entries
+        positions = list(self.prefix_positions(query))
+        positions += self.infix_positions(query, set(positions))
+        if not positions:
+            positions = self.fuzzy_positions(query)
+        return [self.entries[position] for position in positions]
+
+
+class IngredientIndex:
+    """Индекс каталога ингредиентов, перестраиваемый при смене версии."""
+
+    def __init__(self):
+        """Создает пустой индекс."""
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def build(self):
+        """Загружает каталог из БД и атомарно подменяет снимок."""
+        version = get_catalog_version()
+        rows = Ingredient.objects.values_list(
+            'id', 'name', 'measurement_unit'
+        )
+        self._snapshot = IngredientSnapshot(version, list(rows))
+        return self._snapshot
+
+    def get_snapshot(self):
+        """Возвращает актуальный снимок, перестраивая его при надобности."""
+        version = get_catalog_version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = self.build()
+        return snapshot
+
+    def warm_up(self):
+        """Строит индекс при старте воркера, если БД уже доступна."""
+        try:
+            self.build()
+        except DatabaseError as error:
+            logger.warning('Индекс ингредиентов не построен: %s', error)
+
+    def search(self, query):
+        """Возвращает ингредиенты, подходящие под запрос."""
+        return self.get_snapshot().search(query)
+
+    def all(self):
+        """Возвращает весь каталог в порядке сортировки по названию."""
+        return self.get_snapshot().entries
+
+
+ingredient_index = IngredientIndex()
@@ -0,0 +1,146 @@
+"""Поддержка агрегата списков покупок (ShoppingListItem).
+
+Суммы ингредиентов меняются одним запросом INSERT ... SELECT
+с ON CONFLICT DO UPDATE (поддерживается PostgreSQL и SQLite),
+после вычитания удаляются строки с нулевым количеством.
+
+Строки ShoppingCart меняются через API и админку, которые обновляют
+агрегат явно (add_recipe, remove_recipe, apply_carts). Удаление
+рецепта обрабатывает сигнал pre_delete (apply_recipe), а агрегат
+удаляемого пользователя удаляется каскадом вместе с ним.
+"""
+from django.db import connection, transaction
+
+from recipes.models import IngredientInRecipe, ShoppingCart, ShoppingListItem
+
+ITEMS = ShoppingListItem._meta.db_table
+CART = ShoppingCart._meta.db_table
+AMOUNTS = IngredientInRecipe._meta.db_table
+
+UPSERT = (
+    f'INSERT INTO {ITEMS} (user_id, ingredient_id, total_amount) {{select}} '
+    'ON CONFLICT (user_id, ingredient_id) DO UPDATE SET '
+    f'total_amount = {ITEMS}.total_amount + excluded.total_amount'
+)
+SELECT_FOR_USER = (
+    f'SELECT %s, ingredient_id, %s * amount FROM {AMOUNTS} '
+    'WHERE recipe_id = %s'
+)
+SELECT_FOR_CARTS = (
+    f'SELECT cart.user_id, amounts.ingredient_id, %s * amounts.amount '
+    f'FROM {CART} cart JOIN {AMOUNTS} amounts '
+    'ON amounts.recipe_id = cart.recipe_id WHERE cart.recipe_id = %s'
+)
+CLEANUP_FOR_USER = (
+    f'DELETE FROM {ITEMS} WHERE total_amount <= 0 AND user_id = %s'
+)
+CLEANUP_FOR_CARTS = (
+    f'DELETE FROM {ITEMS} WHERE total_amount <= 0 AND user_id IN '
+    f'(SELECT user_id FROM {CART} WHERE recipe_id = %s)'
+)
+SELECT_TOTALS = (
+    'SELECT cart.user_id, amounts.ingredient_id, SUM(amounts.amount) '
+    f'FROM {CART} cart JOIN {AMOUNTS} amounts '
+    'ON amounts.recipe_id = cart.recipe_id '
+    'GROUP BY cart.user_id, amounts.ingredient_id'
+)
+
+
+def apply_recipe(recipe_id, sign, user_id=None):
+    """Добавляет (sign=1) или вычитает (sign=-1) ингредиенты рецепта.
+
+    Если user_id не задан, изменение применяется ко всем
+    пользователям, у которых рецепт лежит в списке покупок.
+    """
+    with connection.cursor() as cursor:
+        if user_id is None:
+            cursor.execute(
+                UPSERT.format(select=SELECT_FOR_CARTS), [sign, recipe_id]
+            )
+            if sign < 0:
+                cursor.execute(CLEANUP_FOR_CARTS, [recipe_id])
+        else:
+            cursor.execute(
+                UPSERT.format(select=SELECT_FOR_USER),
+                [user_id, sign, recipe_id]
+            )
+            if sign < 0:
+                cursor.execute(CLEANUP_FOR_USER, [user_id])
+
+
+def apply_carts(carts, sign):
+    """Добавляет или вычитает ингредиенты рецептов из строк carts.
+
+    carts - queryset ShoppingCart (например, удаляемых из админки),
+    изменение применяется одним запросом для всех строк.
+    """
+    sql, params = carts.order_by().values('id').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPSERT.format(select=(
+                'SELECT cart.user_id, amounts.ingredient_id, '
+                f'%s * amounts.amount FROM {CART} cart '
+                f'JOIN {AMOUNTS} amounts ON amounts.recipe_id = '
+                f'cart.recipe_id WHERE cart.id IN ({sql})'
+            )),
+            [sign, *params]
+        )
+        if sign < 0:
+            cursor.execute(
+                f'DELETE FROM {ITEMS} WHERE total_amount <= 0 AND user_id '
+                f'IN (SELECT cart.user_id FROM {CART} cart '
+                f'WHERE cart.id IN ({sql}))',
+                params
+            )
+
+
+def add_recipe(user_id, recipe_id):
+    """Добавляет ингредиенты рецепта в список покупок пользователя."""
+    apply_recipe(recipe_id, 1, user_id)
+
+
+def remove_recipe(user_id, recipe_id):
+    """Вычитает ингредиенты рецепта из списка покупок пользователя."""
+    apply_recipe(recipe_id, -1, user_id)
+
+
+def get_expected_totals():
+    """Считает суммы ингредиентов заново по спискам покупок."""
+    with connection.cursor() as cursor:
+        cursor.execute(SELECT_TOTALS)
+        return {
+            (user_id, ingredient_id): total
+            for user_id, ingredient_id, total in cursor.fetchall()
+        }
+
+
+def find_drift():
+    """Возвращает расхождения агрегата с пересчитанными суммами.
+
+    Словарь (user_id, ingredient_id) -> (в агрегате, ожидается).
+    """
+    expected = get_expected_totals()
+    actual = {
+        (user_id, ingredient_id): total
+        for user_id, ingredient_id, total in
+        ShoppingListItem.objects.values_list(
+            'user_id', 'ingredient_id', 'total_amount'
+        ).iterator()
+    }
+    return {
+        key: (actual.get(key), expected.get(key))
+        for key in expected.keys() | actual.keys()
+        if actual.get(key) != expected.get(key)
+    }
+
+
+@transaction.atomic
+def rebuild():
+    """Пересобирает агрегат списков покупок с нуля."""
+    ShoppingListItem.objects.all().delete()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {ITEMS} (user_id, ingredient_id, total_amount) '
+            f'{SELECT_TOTALS}'
+        )
+    return ShoppingListItem.objects.count()
@@ -0,0 +1,85 @@
+"""Сигналы приложения recipes."""
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from api.cache import invalidate_recipes
+from recipes.fulltext import index_recipe
+from recipes.counters import change_counter
+from recipes.models import Favorite, Ingredient, Recipe, Subscription, User
+from recipes.search import bump_catalog_version
+from recipes.shopping_list import apply_recipe
+from recipes.tombstones import record_recipe_removal
+
+
+@receiver((post_save, post_delete), sender=Ingredient)
+def update_catalog_version(sender, instance, **kwargs):
+    """Отмечает каталог ингредиентов как измененный."""
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Ingredient)
+def refresh_ingredient_recipes(sender, instance, created, **kwargs):
+    """Обновляет рецепты с измененным ингредиентом.
+
+    Поисковый текст и дата изменения пересобираются одним набором,
+    кэш ответов API для этих рецептов сбрасывается.
+    """
+    if created:
+        return
+    recipe_ids = list(Recipe.objects.filter(
+        ingredients=instance
+    ).values_list('id', flat=True))
+    if recipe_ids:
+        Recipe.objects.filter(pk__in=recipe_ids).refresh_search_documents()
+        invalidate_recipes(recipe_ids)
+
+
+@receiver(post_delete, sender=Recipe)
+def remove_recipe_from_index(sender, instance, using, **kwargs):
+    """Удаляет рецепт из поискового индекса."""
+    index_recipe(instance.pk, None, using=using)
+
+
+@receiver(pre_delete, sender=Recipe)
+def create_tombstones(sender, instance, **kwargs):
+    """Запоминает удаление рецепта и его связей для ленты изменений.
+
+    Удаление пользователя отдельно не записывается: его собственные
+    списки больше никто не синхронизирует, а удаление его рецептов
+    обрабатывается здесь же.
+    """
+    record_recipe_removal(instance.pk)
+
+
+@receiver(pre_delete, sender=Recipe)
+def remove_recipe_from_shopping_lists(sender, instance, **kwargs):
+    """Вычитает ингредиенты удаляемого рецепта из списков покупок."""
+    apply_recipe(instance.pk, -1)
+
+
+@receiver((post_save, post_delete), sender=Recipe)
+def update_recipes_count(sender, instance, created=False, **kwargs):
+    """Обновляет счетчик рецептов автора."""
+    if kwargs['signal'] is post_save and not created:
+        return
+    delta = 1 if created else -1
+    change_counter(User, instance.author_id, 'recipes_count', delta)
+
+
+@receiver((post_save, post_delete), sender=Favorite)
+def update_favorites_count(sender, instance, created=False, **kwargs):
+    """Обновляет счетчик добавлений рецепта в избранное."""
+    if kwargs['signal'] is post_save and not created:
+        return
+    delta = 1 if created else -1
+    change_counter(Recipe, instance.recipe_id, 'favorites_count', delta)
+
+
+@receiver((post_save, post_delete), sender=Subscription)
+def update_subscription_counts(sender, instance, created=False, **kwargs):
+    """Обновляет счетчики подписок и подписчиков."""
+    if kwargs['signal'] is post_save and not created:
+        return
+    delta = 1 if created else -1
+    change_counter(User, instance.user_id, 'subscriptions_count', delta)
+    change_counter(User, instance.author_id, 'subscribers_count', delta)
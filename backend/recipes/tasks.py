@@ -0,0 +1,85 @@
+"""Фоновые задачи приложения recipes."""
+from django.apps import apps
+
+from django.db.models import Q
+
+from recipes.images import build_variants
+from recipes.models import Recipe, User
+from tasks.queue import task
+
+# Модели с изображениями: (модель, поле изображения, поле вариантов)
+IMAGE_SOURCES = (
+    (Recipe, 'image', 'image_variants'),
+    (User, 'avatar', 'avatar_variants'),
+)
+
+
+def save_fields(instance, *fields):
+    """Сохраняет поля объекта вместе с его полями auto_now."""
+    instance.save(update_fields=[*fields, *(
+        field.name for field in instance._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+    )])
+
+
+@task
+def build_image_variants(
+    model_label, pk, image_field, variants_field, image_name
+):
+    """Строит варианты изображения, если оно не сменилось с постановки."""
+    instance = apps.get_model(model_label).objects.filter(pk=pk).first()
+    if instance is None:
+        return
+    field_file = getattr(instance, image_field)
+    if field_file.name != image_name:
+        return
+    setattr(instance, variants_field, build_variants(field_file))
+    save_fields(instance, variants_field)
+
+
+def save_variants(instance, image_field, variants_field):
+    """Сбрасывает варианты изображения и ставит задачу на их сборку.
+
+    Старые файлы не удаляются: в хранилище с адресацией по содержимому
+    они могут использоваться другими объектами, их удаляет
+    команда collect_media_garbage.
+    """
+    field_file = getattr(instance, image_field)
+    setattr(instance, variants_field, {})
+    save_fields(instance, variants_field)
+    if field_file:
+        build_image_variants.delay(
+            instance._meta.label, instance.pk, image_field, variants_field,
+            field_file.name
+        )
+
+
+def enqueue_missing_variants():
+    """Ставит сборку вариантов для изображений, у которых их нет.
+
+    Нужна для объектов, загруженных до появления вариантов или
+    импортированных без них. Возвращает число поставленных задач
+    по меткам моделей.
+    """
+    queued = {}
+    for model, image_field, variants_field in IMAGE_SOURCES:
+        missing = Q(**{variants_field: {}}) | Q(
+            **{f'{variants_field}__isnull': True}
+        )
+        rows = model.objects.exclude(**{image_field: ''}).filter(
+            missing
+        ).values_list('pk', image_field).iterator()
+        queued[model._meta.label] = 0
+        for pk, image_name in rows:
+            build_image_variants.delay(
+                model._meta.label, pk, image_field, variants_field,
+                image_name
+            )
+            queued[model._meta.label] += 1
+    return queued
+
+
+@task
+def delete_user(user_id):
+    """Удаляет пользователя вместе с рецептами и подписками."""
+    User.objects.filter(pk=user_id).delete()
@@ -0,0 +1,54 @@
+"""Общие фабрики данных для тестов приложений."""
+import base64
+import io
+
+from PIL import Image
+
+from recipes.models import Ingredient, IngredientInRecipe, Recipe, User
+
+PASSWORD = 'password'
+
+
+def create_user(username, **fields):
+    """Создает пользователя с заполненными обязательными полями."""
+    return User.objects.create_user(**{
+        'username': username,
+        'email': f'{username}@example.com',
+        'password': PASSWORD,
+        'first_name': 'Имя',
+        'last_name': 'Фамилия',
+        **fields,
+    })
+
+
+def create_ingredient(name, measurement_unit='г'):
+    """Создает ингредиент каталога."""
+    return Ingredient.objects.create(
+        name=name, measurement_unit=measurement_unit
+    )
+
+
+def create_recipe(author, name='Суп', ingredients=(), **fields):
+    """Создает рецепт с ингредиентами из пар (ингредиент, количество)."""
+    recipe = Recipe.objects.create(**{
+        'author': author,
+        'name': name,
+        'text': 'Сварить.',
+        'cooking_time': 10,
+        'image': 'recipes/soup.png',
+        **fields,
+    })
+    for ingredient, amount in ingredients:
+        IngredientInRecipe.objects.create(
+            recipe=recipe, ingredient=ingredient, amount=amount
+        )
+    return recipe
+
+
+def image_data_url(size=(2, 2)):
+    """Возвращает PNG-изображение строкой data URL в base64."""
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'PNG')
+    return 'data:image/png;base64,' + base64.b64encode(
+        buffer.getvalue()
+    ).decode()
@@ -0,0 +1,44 @@
+"""Тесты синхронизации каталога ингредиентов."""
+import io
+
+from django.test import TestCase
+
+from recipes.catalog import sync_catalog
+from recipes.models import Ingredient
+from recipes.tests.factories import (
+    create_ingredient, create_recipe, create_user
+)
+
+
+class SyncCatalogTest(TestCase):
+    """Тесты sync_catalog."""
+
+    def sync(self, text, prune=False):
+        """Синхронизирует каталог с CSV из строки."""
+        return sync_catalog(io.StringIO(text), 'csv', prune=prune)
+
+    def test_unit_change_keeps_used_ingredient(self):
+        """Смена единицы не меняет ингредиент, используемый в рецепте."""
+        salt = create_ingredient('соль')
+        create_recipe(create_user('author'), ingredients=[(salt, 5)])
+        stats = self.sync('соль,кг\n', prune=True)
+        self.assertEqual((stats['inserted'], stats['deleted']), (1, 0))
+        salt.refresh_from_db()
+        self.assertEqual(salt.measurement_unit, 'г')
+        self.assertTrue(Ingredient.objects.filter(
+            name='соль', measurement_unit='кг'
+        ).exists())
+
+    def test_unit_change_prunes_unused_ingredient(self):
+        """Неиспользуемый ингредиент со старой единицей удаляется."""
+        create_ingredient('соль')
+        stats = self.sync('соль,кг\n', prune=True)
+        self.assertEqual((stats['inserted'], stats['deleted']), (1, 1))
+        units = Ingredient.objects.values_list('measurement_unit', flat=True)
+        self.assertEqual(list(units), ['кг'])
+
+    def test_several_units(self):
+        """Одно название с разными единицами дает разные ингредиенты."""
+        stats = self.sync('соль,г\nсоль,щепотка\nсоль,г\n')
+        self.assertEqual((stats['total'], stats['inserted']), (2, 2))
+        self.assertEqual(self.sync('соль,г\nсоль,щепотка\n')['skipped'], 2)
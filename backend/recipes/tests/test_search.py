@@ -0,0 +1,37 @@
+"""Тесты поискового текста рецептов."""
+from django.test import TestCase
+
+from recipes.models import Recipe
+from recipes.tests.factories import (
+    create_ingredient, create_recipe, create_user
+)
+
+
+class IngredientRenameTest(TestCase):
+    """Тесты обновления рецептов при переименовании ингредиента."""
+
+    def test_rename_refreshes_documents(self):
+        """Поисковый текст всех рецептов обновляется одним набором."""
+        author = create_user('author')
+        salt = create_ingredient('соль')
+        pepper = create_ingredient('перец')
+        recipes = [
+            create_recipe(
+                author, f'Суп {number}', ingredients=[(salt, 1), (pepper, 1)]
+            ) for number in range(5)
+        ]
+        updated_at = Recipe.objects.get(pk=recipes[0].pk).updated_at
+
+        salt.name = 'морская соль'
+        with self.assertNumQueries(7):
+            salt.save()
+        for recipe in Recipe.objects.filter(pk__in=[r.pk for r in recipes]):
+            self.assertEqual(
+                recipe.search_document,
+                f'{recipe.name} Сварить. морская соль перец'
+            )
+            self.assertGreater(recipe.updated_at, updated_at)
+        found = Recipe.objects.filter(
+            search_document__icontains='морская'
+        ).count()
+        self.assertEqual(found, 5)
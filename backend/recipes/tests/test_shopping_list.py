@@ -0,0 +1,45 @@
+"""Тесты агрегата списков покупок."""
+from django.test import TestCase
+
+from recipes import shopping_list
+from recipes.models import ShoppingCart
+from recipes.tests.factories import (
+    create_ingredient, create_recipe, create_user
+)
+
+
+class ShoppingListAdminTest(TestCase):
+    """Тесты изменения списков покупок через админку."""
+
+    def setUp(self):
+        """Создает администратора и два рецепта с ингредиентами."""
+        self.admin = create_user(
+            'admin', is_staff=True, is_superuser=True
+        )
+        salt = create_ingredient('соль')
+        self.recipes = [
+            create_recipe(self.admin, f'Суп {amount}', ingredients=[
+                (salt, amount)
+            ]) for amount in (5, 7)
+        ]
+        self.client.force_login(self.admin)
+
+    def test_add_change_delete(self):
+        """Агрегат совпадает с пересчитанным после правок в админке."""
+        url = '/admin/recipes/shoppingcart/'
+        self.client.post(f'{url}add/', {
+            'user': self.admin.pk, 'recipe': self.recipes[0].pk
+        })
+        cart = ShoppingCart.objects.get()
+        self.assertEqual(shopping_list.find_drift(), {})
+        self.client.post(f'{url}{cart.pk}/change/', {
+            'user': self.admin.pk, 'recipe': self.recipes[1].pk
+        })
+        self.assertEqual(shopping_list.find_drift(), {})
+        self.assertEqual(
+            self.admin.shopping_list_items.get().total_amount, 7
+        )
+        self.client.post(f'{url}{cart.pk}/delete/', {'post': 'yes'})
+        self.assertFalse(ShoppingCart.objects.exists())
+        self.assertEqual(shopping_list.find_drift(), {})
+        self.assertFalse(self.admin.shopping_list_items.exists())
@@ -0,0 +1,33 @@
+"""Тесты фоновых задач приложения recipes."""
+from unittest import mock
+
+from django.test import TestCase
+
+from recipes.tasks import enqueue_missing_variants
+from recipes.tests.factories import create_recipe, create_user
+
+
+class EnqueueMissingVariantsTest(TestCase):
+    """Тесты постановки сборки недостающих вариантов изображений."""
+
+    def test_only_missing_variants_queued(self):
+        """Задачи ставятся только для изображений без вариантов."""
+        author = create_user('author', avatar='users/author.png')
+        create_user('reader')
+        missing = create_recipe(author)
+        create_recipe(author, image_variants={
+            'thumbnail': {'webp': 'recipes/thumbnail.webp'}
+        })
+        with mock.patch(
+            'recipes.tasks.build_image_variants.delay'
+        ) as delay:
+            queued = enqueue_missing_variants()
+        self.assertEqual(queued, {'recipes.Recipe': 1, 'recipes.User': 1})
+        delay.assert_any_call(
+            'recipes.Recipe', missing.pk, 'image', 'image_variants',
+            'recipes/soup.png'
+        )
+        delay.assert_any_call(
+            'recipes.User', author.pk, 'avatar', 'avatar_variants',
+            'users/author.png'
+        )
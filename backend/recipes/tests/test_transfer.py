@@ -0,0 +1,36 @@
+"""Тесты переноса рецептов."""
+from django.test import TestCase
+
+from recipes.models import Recipe
+from recipes.tests.factories import create_recipe, create_user
+from recipes.transfer import RecipeImporter, iter_recipes
+
+
+class RecipeImporterTest(TestCase):
+    """Тесты RecipeImporter."""
+
+    def setUp(self):
+        """Экспортирует два одноименных рецепта одного автора."""
+        author = create_user('author')
+        for text in ('Сварить.', 'Запечь.'):
+            create_recipe(author, text=text)
+        self.records = list(iter_recipes())
+        Recipe.objects.all().delete()
+
+    def test_same_named_recipes_imported(self):
+        """Одноименные рецепты автора загружаются оба."""
+        importer = RecipeImporter()
+        importer.import_batch(self.records)
+        self.assertEqual(importer.stats['recipes'], 2)
+        self.assertEqual(set(Recipe.objects.values_list('text', flat=True)),
+                         {'Сварить.', 'Запечь.'})
+
+    def test_reimport_skips_recipes(self):
+        """Повторный импорт файла пропускает загруженные рецепты."""
+        RecipeImporter().import_batch(self.records)
+        importer = RecipeImporter()
+        importer.import_batch(self.records)
+        self.assertEqual(
+            (importer.stats['recipes'], importer.stats['skipped']), (0, 2)
+        )
+        self.assertEqual(Recipe.objects.count(), 2)
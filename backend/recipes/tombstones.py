@@ -0,0 +1,42 @@
+"""Записи об удалении (Tombstone) для ленты изменений (api.sync).
+
+Записи создаются одним INSERT ... SELECT по удаляемым связям,
+а не сигналом на каждую строку: удаление популярного рецепта
+не должно стоить запроса на каждое избранное.
+"""
+from django.db import connections
+from django.utils import timezone
+
+from recipes.models import Favorite, ShoppingCart, Tombstone
+
+TOMBSTONES = Tombstone._meta.db_table
+
+
+def record_removals(relations):
+    """Запоминает удаление связей пользователей с рецептами.
+
+    relations - queryset избранного или списка покупок,
+    который вызывающий код удаляет следом.
+    """
+    connection = connections[relations.db]
+    sql, params = relations.order_by().values(
+        'user_id', 'recipe_id'
+    ).query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {TOMBSTONES} (kind, user_id, recipe_id, '
+            f'deleted_at) SELECT %s, removed.user_id, removed.recipe_id, '
+            f'%s FROM ({sql}) removed',
+            [
+                relations.model._meta.model_name,
+                connection.ops.adapt_datetimefield_value(timezone.now()),
+                *params,
+            ]
+        )
+
+
+def record_recipe_removal(recipe_id):
+    """Запоминает удаление рецепта и его связей с пользователями."""
+    for model in (Favorite, ShoppingCart):
+        record_removals(model.objects.filter(recipe_id=recipe_id))
+    Tombstone.objects.create(kind='recipe', recipe_id=recipe_id)
@@ -0,0 +1,242 @@
+"""Перенос рецептов между окружениями в формате JSONL.
+
+Каждая строка файла - рецепт с автором, ингредиентами (по названию
+и единице измерения) и путями к изображениям в хранилище; сами
+файлы изображений переносятся отдельно. Экспорт читает рецепты
+и ингредиенты двумя серверными курсорами, а импорт пишет пачками
+через bulk_create, поэтому память не зависит от объема данных,
+а число запросов - от числа строк в пачке.
+"""
+from collections import Counter
+from itertools import groupby
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Max
+from django.utils.dateparse import parse_datetime
+
+from recipes.constants import TRANSFER_CHUNK_SIZE
+from recipes.counters import change_counter
+from recipes.fulltext import index_recipes
+from recipes.models import Ingredient, IngredientInRecipe, Recipe, User
+from recipes.tasks import build_image_variants
+
+AUTHOR_FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+
+def iter_recipes(after_id=0, chunk_size=TRANSFER_CHUNK_SIZE):
+    """Возвращает итератор по рецептам с id больше after_id.
+
+    Оба курсора упорядочены по id рецепта и сливаются за один проход.
+    """
+    recipes = Recipe.objects.filter(id__gt=after_id).order_by('id').values(
+        'id', 'name', 'text', 'cooking_time', 'pub_date', 'image',
+        'image_variants', *(f'author__{field}' for field in AUTHOR_FIELDS)
+    ).iterator(chunk_size=chunk_size)
+    ingredients = groupby(
+        IngredientInRecipe.objects.filter(
+            recipe_id__gt=after_id
+        ).order_by('recipe_id', 'id').values_list(
+            'recipe_id', 'ingredient__name', 'ingredient__measurement_unit',
+            'amount'
+        ).iterator(chunk_size=chunk_size),
+        key=lambda row: row[0]
+    )
+
+    recipe_id, rows = next(ingredients, (None, ()))
+    for recipe in recipes:
+        while recipe_id is not None and recipe_id < recipe['id']:
+            recipe_id, rows = next(ingredients, (None, ()))
+        items = []
+        if recipe_id == recipe['id']:
+            items = [
+                {'name': name, 'measurement_unit': unit, 'amount': amount}
+                for _, name, unit, amount in rows
+            ]
+        yield {
+            'id': recipe['id'],
+            'author': {
+                field: recipe[f'author__{field}'] for field in AUTHOR_FIELDS
+            },
+            'name': recipe['name'],
+            'text': recipe['text'],
+            'cooking_time': recipe['cooking_time'],
+            'pub_date': recipe['pub_date'].isoformat(),
+            'image': recipe['image'],
+            'image_variants': recipe['image_variants'],
+            'ingredients': items,
+        }
+
+
+def import_variants(image, variants):
+    """Возвращает варианты изображения из файла или пустой словарь.
+
+    Варианты принимаются, только если все их файлы уже лежат
+    в хранилище: файлы переносятся отдельно, и ссылки
+    на отсутствующие варианты отдавались бы в API. Иначе варианты
+    собираются заново после импорта.
+    """
+    if not image or not isinstance(variants, dict) or not variants:
+        return {}
+    paths = [
+        path for formats in variants.values()
+        for path in (formats.values() if isinstance(formats, dict) else [])
+    ]
+    if not paths or not all(
+        isinstance(path, str) and default_storage.exists(path)
+        for path in paths
+    ):
+        return {}
+    return variants
+
+
+class RecipeImporter:
+    """Загрузка рецептов пачками с кэшем авторов и ингредиентов.
+
+    Недостающие авторы создаются без пароля, недостающие ингредиенты -
+    добавляются в каталог. Рецепт, у автора которого уже есть рецепт
+    с тем же названием и датой публикации, пропускается, поэтому
+    повторный импорт того же файла не создает дублей, а одноименные
+    рецепты одного автора загружаются все. Записи без даты публикации
+    не сверяются и загружаются каждый раз.
+    """
+
+    def __init__(self):
+        """Загружает каталог ингредиентов в кэш."""
+        self.authors = {}
+        self.ingredients = {
+            (name, unit): pk for pk, name, unit in
+            Ingredient.objects.values_list('id', 'name', 'measurement_unit')
+        }
+        self.stats = Counter()
+
+    def get_author_ids(self, records):
+        """Возвращает id авторов пачки, создавая недостающих."""
+        missing = {
+            record['author']['username']: record['author']
+            for record in records
+            if record['author']['username'] not in self.authors
+        }
+        if missing:
+            self.authors.update(User.objects.filter(
+                username__in=missing
+            ).values_list('username', 'id'))
+            new_authors = [
+                User(**author, password=make_password(None))
+                for username, author in missing.items()
+                if username not in self.authors
+            ]
+            if new_authors:
+                User.objects.bulk_create(new_authors, ignore_conflicts=True)
+                self.authors.update(User.objects.filter(
+                    username__in=[user.username for user in new_authors]
+                ).values_list('username', 'id'))
+                self.stats['authors'] += len(new_authors)
+        return self.authors
+
+    def get_ingredient_ids(self, records):
+        """Возвращает id ингредиентов, добавляя недостающие в каталог."""
+        missing = {
+            (item['name'], item['measurement_unit'])
+            for record in records
+            for item in record['ingredients']
+        } - self.ingredients.keys()
+        if missing:
+            Ingredient.objects.bulk_create([
+                Ingredient(name=name, measurement_unit=unit)
+                for name, unit in missing
+            ], ignore_conflicts=True)
+            self.ingredients.update(
+                ((name, unit), pk) for pk, name, unit in
+                Ingredient.objects.filter(
+                    name__in={name for name, _ in missing}
+                ).values_list('id', 'name', 'measurement_unit')
+            )
+            self.stats['ingredients'] += len(missing)
+        return self.ingredients
+
+    @transaction.atomic
+    def import_batch(self, records):
+        """Загружает пачку рецептов в одной транзакции."""
+        authors = self.get_author_ids(records)
+        ingredients = self.get_ingredient_ids(records)
+        author_ids = {
+            authors[record['author']['username']] for record in records
+            if record['author']['username'] in authors
+        }
+        names = {record['name'] for record in records}
+        seen = set(Recipe.objects.filter(
+            author_id__in=author_ids, name__in=names
+        ).values_list('author_id', 'name', 'pub_date'))
+
+        new_recipes = []
+        for record in records:
+            author_id = authors.get(record['author']['username'])
+            pub_date = parse_datetime(record.get('pub_date') or '')
+            key = (author_id, record['name'], pub_date)
+            if author_id is None or key in seen:
+                self.stats['skipped'] += 1
+                continue
+            if pub_date is not None:
+                seen.add(key)
+            new_recipes.append((record, Recipe(
+                author_id=author_id,
+                name=record['name'],
+                text=record['text'],
+                cooking_time=record['cooking_time'],
+                image=record['image'],
+                image_variants=import_variants(
+                    record['image'], record.get('image_variants')
+                ),
+                search_document=' '.join((
+                    record['name'],
+                    record['text'],
+                    *(item['name'] for item in record['ingredients']),
+                )),
+            )))
+        if not new_recipes:
+            return
+
+        last_id = Recipe.objects.aggregate(last_id=Max('id'))['last_id']
+        Recipe.objects.bulk_create([recipe for _, recipe in new_recipes])
+        if new_recipes[0][1].pk is None:
+            # SQLite не возвращает id из bulk_create: новые строки
+            # вставлены в транзакции подряд, в порядке списка.
+            new_ids = Recipe.objects.filter(
+                pk__gt=last_id or 0
+            ).order_by('pk').values_list('id', flat=True)
+            for (_, recipe), pk in zip(new_recipes, new_ids):
+                recipe.pk = pk
+        links = []
+        for record, recipe in new_recipes:
+            recipe.pub_date = (
+                parse_datetime(record.get('pub_date') or '')
+                or recipe.pub_date
+            )
+            links.extend(
+                IngredientInRecipe(
+                    recipe_id=recipe.pk,
+                    ingredient_id=ingredients[
+                        (item['name'], item['measurement_unit'])
+                    ],
+                    amount=item['amount'],
+                ) for item in record['ingredients']
+            )
+        recipes = [recipe for _, recipe in new_recipes]
+        Recipe.objects.bulk_update(recipes, ['pub_date'])
+        for recipe in recipes:
+            if recipe.image and not recipe.image_variants:
+                build_image_variants.delay(
+                    Recipe._meta.label, recipe.pk, 'image', 'image_variants',
+                    recipe.image.name
+                )
+        IngredientInRecipe.objects.bulk_create(links)
+        index_recipes([
+            (recipe.pk, recipe.search_document) for recipe in recipes
+        ])
+        for author_id, count in Counter(
+            recipe.author_id for recipe in recipes
+        ).items():
+            change_counter(User, author_id, 'recipes_count', count)
+        self.stats['recipes'] += len(recipes)
@@ -1,12 +1,18 @@
 """URLs для приложения recipes."""
+from django.conf import settings
 from django.urls import path
 
-from recipes.views import RecipeShortLinkView
+from recipes.views import RecipeShortLinkView, async_recipe_short_link
+
+short_link_view = (
+    async_recipe_short_link if settings.ASYNC_VIEWS
+    else RecipeShortLinkView.as_view()
+)
 
 urlpatterns = [
     path(
         'recipes/<int:recipe_id>/',
-        RecipeShortLinkView.as_view(),
+        short_link_view,
         name='recipe-short-link'
     ),
 ]
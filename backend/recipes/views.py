@@ -1,8 +1,9 @@
 """Представления для приложения recipes."""
 from django.shortcuts import redirect
 from django.views import View
-from django.http import Http404
+from django.http import Http404, HttpResponseNotAllowed
 
+from foodgram.db import in_db_thread
 from recipes.models import Recipe
 
 
@@ -14,3 +15,19 @@ class RecipeShortLinkView(View):
         if not Recipe.objects.filter(id=recipe_id).exists():
             raise Http404('Рецепт не найден')
         return redirect(f'/recipes/{recipe_id}')
+
+
+async def async_recipe_short_link(request, recipe_id):
+    """Асинхронная версия RecipeShortLinkView для запуска через ASGI.
+
+    В Django 3.2 классовые представления не бывают асинхронными,
+    поэтому это функция.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(('GET', 'HEAD'))
+    exists = await in_db_thread(
+        Recipe.objects.filter(id=recipe_id).exists
+    )()
+    if not exists:
+        raise Http404('Рецепт не найден')
+    return redirect(f'/recipes/{recipe_id}')
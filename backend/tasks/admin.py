@@ -0,0 +1,25 @@
+"""Админ-панель для приложения tasks."""
+from django.contrib import admin
+
+from tasks.models import Task
+from tasks.queue import requeue
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Админка для очереди фоновых задач."""
+
+    list_display = (
+        'id', 'name', 'status', 'attempts', 'max_attempts', 'run_at',
+        'created_at'
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('name',)
+    readonly_fields = ('locked_at', 'last_error', 'created_at')
+    actions = ('requeue_tasks',)
+
+    @admin.action(description='Вернуть в очередь')
+    def requeue_tasks(self, request, queryset):
+        """Возвращает выбранные задачи в очередь."""
+        count = requeue(queryset)
+        self.message_user(request, f'Возвращено в очередь задач: {count}.')
@@ -0,0 +1,15 @@
+"""Конфигурация приложения tasks."""
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TasksConfig(AppConfig):
+    """Конфигурация приложения tasks."""
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'tasks'
+    verbose_name = 'Фоновые задачи'
+
+    def ready(self):
+        """Регистрирует задачи из модулей tasks установленных приложений."""
+        autodiscover_modules('tasks')
@@ -0,0 +1,12 @@
+"""Константы очереди фоновых задач."""
+
+TASK_NAME_MAX_LENGTH = 255
+TASK_STATUS_MAX_LENGTH = 16
+TASK_MAX_ATTEMPTS = 5
+# Задержка перед повтором: TASK_RETRY_DELAY * 2 ** (попытка - 1) секунд.
+TASK_RETRY_DELAY = 10
+# Задача в статусе running дольше этого времени считается брошенной.
+TASK_LOCK_TIMEOUT = 10 * 60
+# Сколько задач просматривается за раз при захвате без SKIP LOCKED.
+TASK_CLAIM_CANDIDATES = 10
+TASK_POLL_INTERVAL = 1.0
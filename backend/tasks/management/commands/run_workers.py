@@ -0,0 +1,74 @@
+"""Скрипт для запуска воркеров очереди фоновых задач."""
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tasks.constants import TASK_POLL_INTERVAL
+from tasks.queue import claim, run_task
+
+
+class Command(BaseCommand):
+    """Команда для выполнения фоновых задач из очереди в БД."""
+
+    help = 'Запустить воркеры очереди фоновых задач'
+
+    def add_arguments(self, parser):
+        """Парсинг аргументов из командной строки."""
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Число потоков-воркеров',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=TASK_POLL_INTERVAL,
+            help='Пауза в секундах, если очередь пуста',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться',
+        )
+
+    def work(self, stop, options):
+        """Забирает и выполняет задачи, пока не получен сигнал остановки."""
+        try:
+            while not stop.is_set():
+                task = claim()
+                if task is None:
+                    if options['once']:
+                        return
+                    stop.wait(options['poll_interval'])
+                    continue
+                if run_task(task):
+                    self.counts['done'] += 1
+                else:
+                    self.counts['failed'] += 1
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        """Запуск воркеров и ожидание их завершения."""
+        stop = threading.Event()
+        self.counts = {'done': 0, 'failed': 0}
+        if not options['once']:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *args: stop.set())
+
+        workers = [
+            threading.Thread(target=self.work, args=(stop, options))
+            for _ in range(options['concurrency'])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Выполнено задач: {self.counts['done']}, "
+            f"с ошибкой: {self.counts['failed']}."
+        ))
@@ -0,0 +1,85 @@
+"""Модели приложения tasks."""
+from django.db import models
+from django.utils import timezone
+
+from tasks.constants import (
+    TASK_NAME_MAX_LENGTH, TASK_STATUS_MAX_LENGTH, TASK_MAX_ATTEMPTS
+)
+
+
+class Task(models.Model):
+    """Фоновая задача в очереди.
+
+    Успешно выполненные задачи удаляются, поэтому в таблице остаются
+    только ожидающие, выполняющиеся и окончательно упавшие задачи.
+    """
+
+    class Status(models.TextChoices):
+        """Статусы задачи."""
+
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DEAD = 'dead', 'Не выполнена'
+
+    name = models.CharField(
+        'Задача',
+        max_length=TASK_NAME_MAX_LENGTH,
+    )
+    args = models.JSONField(
+        'Аргументы',
+        default=list,
+        blank=True,
+    )
+    kwargs = models.JSONField(
+        'Именованные аргументы',
+        default=dict,
+        blank=True,
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=TASK_STATUS_MAX_LENGTH,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток',
+        default=0,
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток',
+        default=TASK_MAX_ATTEMPTS,
+    )
+    run_at = models.DateTimeField(
+        'Запустить не раньше',
+        default=timezone.now,
+    )
+    locked_at = models.DateTimeField(
+        'Взята в работу',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        'Создана',
+        auto_now_add=True,
+    )
+
+    class Meta:
+        """Метаданные модели задачи."""
+
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('run_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'),
+                name='task_status_run_at_idx'
+            ),
+        )
+
+    def __str__(self):
+        """Строковое представление задачи."""
+        return f'{self.name} #{self.pk} ({self.get_status_display()})'
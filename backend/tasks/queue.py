@@ -0,0 +1,165 @@
+"""Очередь фоновых задач в основной БД проекта.
+
+Задачи - обычные функции, помеченные декоратором task. Вызов
+func.delay(...) сохраняет задачу в таблицу в текущей транзакции,
+а воркеры (manage.py run_workers) забирают и выполняют их:
+
+* на PostgreSQL - через SELECT ... FOR UPDATE SKIP LOCKED, поэтому
+  воркеры не ждут друг друга и не берут одну задачу дважды;
+* на SQLite - условным UPDATE по статусу и числу попыток.
+
+Упавшая задача повторяется с экспоненциальной задержкой, а после
+max_attempts попыток остается в статусе dead. Задача, брошенная
+упавшим воркером, снова забирается через TASK_LOCK_TIMEOUT, поэтому
+задачи должны быть идемпотентными. Аргументы задач хранятся в JSON.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from tasks.constants import (
+    TASK_MAX_ATTEMPTS, TASK_RETRY_DELAY, TASK_LOCK_TIMEOUT,
+    TASK_CLAIM_CANDIDATES
+)
+from tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(func=None, *, max_attempts=TASK_MAX_ATTEMPTS):
+    """Регистрирует функцию как фоновую задачу и добавляет ей delay()."""
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts
+        func.delay = lambda *args, **kwargs: enqueue(func, *args, **kwargs)
+        registry[func.task_name] = func
+        return func
+    return register(func) if func is not None else register
+
+
+def enqueue(func, *args, **kwargs):
+    """Ставит задачу в очередь.
+
+    Задача становится видна воркерам после коммита текущей транзакции.
+    При TASKS_EAGER задача выполняется в процессе сразу после коммита.
+    """
+    if settings.TASKS_EAGER:
+        transaction.on_commit(lambda: run_eager(func, args, kwargs))
+        return None
+    return Task.objects.create(
+        name=func.task_name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=func.max_attempts,
+    )
+
+
+def run_eager(func, args, kwargs):
+    """Выполняет задачу в процессе, записывая ошибку в лог.
+
+    Данные запроса к этому моменту уже зафиксированы, поэтому
+    ошибка задачи, как и у воркера, не должна превращаться
+    в ошибку запроса.
+    """
+    try:
+        with transaction.atomic():
+            func(*args, **kwargs)
+    except Exception:
+        logger.error(
+            'Задача %s не выполнена: %s', func.task_name,
+            traceback.format_exc()
+        )
+
+
+def get_claimable(now):
+    """Возвращает задачи, которые можно взять в работу."""
+    stale = now - timedelta(seconds=TASK_LOCK_TIMEOUT)
+    return Task.objects.filter(
+        Q(status=Task.Status.PENDING, run_at__lte=now)
+        | Q(status=Task.Status.RUNNING, locked_at__lt=stale)
+    ).order_by('run_at', 'id')
+
+
+def claim():
+    """Забирает очередную задачу в работу или возвращает None."""
+    now = timezone.now()
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            task = get_claimable(now).select_for_update(
+                skip_locked=True
+            ).first()
+            if task is None:
+                return None
+            task.status = Task.Status.RUNNING
+            task.locked_at = now
+            task.attempts += 1
+            task.save(update_fields=['status', 'locked_at', 'attempts'])
+        return task
+
+    for task in get_claimable(now)[:TASK_CLAIM_CANDIDATES]:
+        claimed = Task.objects.filter(
+            pk=task.pk, status=task.status, attempts=task.attempts
+        ).update(
+            status=Task.Status.RUNNING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            task.status = Task.Status.RUNNING
+            task.locked_at = now
+            task.attempts += 1
+            return task
+    return None
+
+
+def fail(task, error):
+    """Откладывает повтор задачи или переводит ее в статус dead."""
+    task.last_error = error
+    task.locked_at = None
+    if task.attempts >= task.max_attempts:
+        task.status = Task.Status.DEAD
+        logger.error(
+            'Задача %s #%s не выполнена: %s', task.name, task.pk, error
+        )
+    else:
+        task.status = Task.Status.PENDING
+        task.run_at = timezone.now() + timedelta(
+            seconds=TASK_RETRY_DELAY * 2 ** (task.attempts - 1)
+        )
+        logger.warning(
+            'Задача %s #%s будет повторена: %s', task.name, task.pk, error
+        )
+    task.save(update_fields=['status', 'run_at', 'locked_at', 'last_error'])
+
+
+def run_task(task):
+    """Выполняет задачу в транзакции и возвращает признак успеха."""
+    func = registry.get(task.name)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {task.name} не зарегистрирована.')
+        with transaction.atomic():
+            func(*task.args, **task.kwargs)
+    except Exception:
+        fail(task, traceback.format_exc())
+        return False
+    Task.objects.filter(pk=task.pk).delete()
+    return True
+
+
+def requeue(tasks):
+    """Возвращает задачи в очередь со сброшенным счетчиком попыток."""
+    return tasks.update(
+        status=Task.Status.PENDING,
+        attempts=0,
+        run_at=timezone.now(),
+        locked_at=None,
+        last_error='',
+    )
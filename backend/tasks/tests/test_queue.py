@@ -0,0 +1,22 @@
+"""Тесты очереди фоновых задач."""
+from django.test import TestCase, override_settings
+
+from tasks.queue import task
+
+
+@task
+def failing_task():
+    """Задача, которая всегда падает."""
+    raise RuntimeError('ошибка задачи')
+
+
+class EagerTasksTest(TestCase):
+    """Тесты выполнения задач в процессе (TASKS_EAGER)."""
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_failure_is_logged(self):
+        """Ошибка задачи пишется в лог и не выходит за пределы коммита."""
+        with self.assertLogs('tasks.queue', 'ERROR') as logs:
+            with self.captureOnCommitCallbacks(execute=True):
+                failing_task.delay()
+        self.assertIn('ошибка задачи', logs.output[0])